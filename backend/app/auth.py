@@ -0,0 +1,169 @@
+# Authentication: access tokens carrying the caller's role and ID
+import collections
+import datetime
+import hmac
+import os
+import threading
+import time
+from typing import NamedTuple, Optional
+import jwt
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from utils import ALGORITHM, SECRET_KEY, create_access_token
+
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES") or 30)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE") or 10000)
+# Static bearer token for metrics scrapers, which cannot log in; unset, only admins may read /metrics
+METRICS_TOKEN = os.getenv("METRICS_TOKEN") or ""
+
+ROLES = ("student", "company", "admin")
+
+
+class Principal(NamedTuple):
+    """
+    The authenticated caller, as stated by the claims of their access token.
+    """
+    id: int
+    role: str
+
+    def owns(self, user_id):
+        """
+        True if `user_id` is missing (nothing to check) or is the caller's own ID.
+        """
+        return user_id is None or user_id == self.id
+
+
+def issue_access_token(user_id, role):
+    """
+    Access token whose claims identify the caller without a database lookup.
+    """
+    return create_access_token(
+        data={"sub": str(user_id), "role": role},
+        expires_delta=datetime.timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+    )
+
+
+class DecodedTokenCache:
+    """
+    Bounded LRU of decoded access tokens -> (expiry, Principal).
+
+    Verifying the signature on every request is cheap but not free; a token is reused for
+    its whole lifetime, so its claims are decoded once. Entries are dropped when they
+    expire (on read, and from the cold end on insert) or when the cache is full.
+    """
+
+    def __init__(self, max_entries=10000, clock=time.time):
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries = collections.OrderedDict()
+        # authenticate() may also be called from sync code running on the threadpool
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, token):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, principal = entry
+            if expires_at <= self.clock():
+                del self._entries[token]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self._hits += 1
+            return principal
+
+    def set(self, token, expires_at, principal):
+        with self._lock:
+            now = self.clock()
+            self._entries[token] = (expires_at, principal)
+            self._entries.move_to_end(token)
+            while self._entries:
+                oldest, (oldest_expiry, _) = next(iter(self._entries.items()))
+                if oldest_expiry > now and len(self._entries) <= self.max_entries:
+                    break
+                del self._entries[oldest]
+
+    def stats(self):
+        return {
+            "name": "access_tokens",
+            "max_entries": self.max_entries,
+            "entries": len(self._entries),
+            "hits_total": self._hits,
+            "misses_total": self._misses,
+        }
+
+
+token_cache = DecodedTokenCache(TOKEN_CACHE_SIZE)
+
+
+def authenticate(token):
+    """
+    Principal of a bearer token; raises a 401 HTTPException if it is invalid or expired.
+    """
+    principal = token_cache.get(token)
+    if principal is not None:
+        return principal
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM], options={"require": ["exp", "sub"]})
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(status_code=401, detail="Token has expired", headers={"WWW-Authenticate": "Bearer"})
+    except jwt.InvalidTokenError:
+        raise HTTPException(status_code=401, detail="Invalid token", headers={"WWW-Authenticate": "Bearer"})
+
+    role = payload.get("role")
+    try:
+        user_id = int(payload["sub"])
+    except (TypeError, ValueError):
+        user_id = None
+    if user_id is None or role not in ROLES:
+        # Tokens issued before roles were added to the claims
+        raise HTTPException(status_code=401, detail="Invalid token, please log in again", headers={"WWW-Authenticate": "Bearer"})
+
+    principal = Principal(user_id, role)
+    token_cache.set(token, payload["exp"], principal)
+    return principal
+
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+async def get_principal(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+) -> Principal:
+    """
+    FastAPI dependency returning the caller identified by the Authorization: Bearer header.
+    """
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    return authenticate(credentials.credentials)
+
+
+def require_role(*roles, detail="Not allowed for this role"):
+    """
+    Dependency factory: the caller's Principal, or 403 unless their role is one of `roles`.
+    """
+    async def dependency(principal: Principal = Depends(get_principal)) -> Principal:
+        if principal.role not in roles:
+            raise HTTPException(status_code=403, detail=detail)
+        return principal
+
+    return dependency
+
+
+async def require_metrics_access(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+):
+    """
+    Dependency guarding the /metrics endpoints: 401 without credentials, 403 unless the
+    bearer token is METRICS_TOKEN or an admin's access token.
+    """
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    if METRICS_TOKEN and hmac.compare_digest(credentials.credentials.encode(), METRICS_TOKEN.encode()):
+        return
+    if authenticate(credentials.credentials).role != "admin":
+        raise HTTPException(status_code=403, detail="Only admins can read metrics")
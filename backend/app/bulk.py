@@ -0,0 +1,140 @@
+# Bulk ingestion: CSV / JSON array uploads, per-row reports and multi-row inserts
+import csv
+import io
+import json
+import os
+from fastapi import HTTPException, Request
+from pydantic import ValidationError
+
+BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS") or 20000)
+# Rows written per transaction; a failing chunk is retried row by row
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE") or 500)
+
+
+async def read_bulk_rows(request: Request):
+    """
+    Rows of a bulk upload as a list of dicts: a JSON array of objects, or CSV with a
+    header line when the Content-Type is text/csv. Empty CSV cells are left out so
+    model defaults apply.
+    """
+    body = await request.body()
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("text/csv"):
+        try:
+            text = body.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="CSV upload must be UTF-8 encoded")
+        rows = [
+            {key.strip(): value for key, value in row.items() if key and value not in (None, "")}
+            for row in csv.DictReader(io.StringIO(text))
+        ]
+    else:
+        try:
+            rows = json.loads(body)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body must be a JSON array or text/csv")
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array of objects")
+
+    if not rows:
+        raise HTTPException(status_code=400, detail="No rows to import")
+    if len(rows) > BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_MAX_ROWS} rows per upload")
+    return rows
+
+
+class BulkReport:
+    """
+    Outcome of every uploaded row, in upload order. Rows are numbered from 1 (the first
+    data line of a CSV file).
+    """
+
+    def __init__(self, total):
+        self.results = [None] * total
+
+    def ok(self, index, **fields):
+        self.results[index] = {"row": index + 1, "status": "ok", **fields}
+
+    def error(self, index, message, **fields):
+        self.results[index] = {"row": index + 1, "status": "error", "error": message, **fields}
+
+    @property
+    def succeeded(self):
+        return sum(1 for result in self.results if result and result["status"] == "ok")
+
+    def as_dict(self):
+        return {
+            "total": len(self.results),
+            "succeeded": self.succeeded,
+            "failed": sum(1 for result in self.results if result and result["status"] == "error"),
+            "results": self.results,
+        }
+
+
+def _describe(error: ValidationError):
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'row'}: {e['msg']}" for e in error.errors()
+    )
+
+
+def validate_rows(model, rows, report, unique=()):
+    """
+    Validate every row against `model` up front. Invalid rows and rows repeating an
+    earlier row's value for one of the `unique` attributes are recorded as errors.
+    Returns [(index, item)] for the rows that passed.
+    """
+    seen = {attr: {} for attr in unique}
+    valid = []
+    for index, row in enumerate(rows):
+        try:
+            item = model.model_validate(row)
+        except ValidationError as e:
+            report.error(index, _describe(e))
+            continue
+        duplicate = None
+        for attr in unique:
+            value = getattr(item, attr)
+            if value in seen[attr]:
+                duplicate = f"{attr} duplicates row {seen[attr][value] + 1}"
+                break
+        if duplicate:
+            report.error(index, duplicate)
+            continue
+        for attr in unique:
+            seen[attr][getattr(item, attr)] = index
+        valid.append((index, item))
+    return valid
+
+
+def chunked(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def placeholders(count):
+    return ", ".join(["%s"] * count)
+
+
+async def insert_rows(cursor, table, columns, rows):
+    """
+    Insert `rows` (tuples in `columns` order) with a single multi-row INSERT.
+    Returns the AUTO_INCREMENT value generated for the first row, if any.
+    """
+    if not rows:
+        return None
+    row_placeholder = f"({placeholders(len(columns))})"
+    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES " + ", ".join([row_placeholder] * len(rows))
+    await cursor.execute(query, [value for row in rows for value in row])
+    return cursor.lastrowid
+
+
+async def existing_keys(cursor, table, column, keys, batch=1000):
+    """
+    The subset of `keys` already present in `table`.`column`.
+    """
+    found = set()
+    keys = list(keys)
+    for part in chunked(keys, batch):
+        await cursor.execute(f"SELECT {column} FROM {table} WHERE {column} IN ({placeholders(len(part))})", part)
+        found.update(row[0] for row in await cursor.fetchall())
+    return found
@@ -0,0 +1,133 @@
+# In-process caches
+import asyncio
+import datetime
+import os
+import time
+
+ADMIN_STATS_TTL = float(os.getenv("ADMIN_STATS_TTL") or 60)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Small in-process cache with per-entry expiry and single-flight loading.
+
+    Concurrent misses for the same key share one loader call. Writes that invalidate or
+    adjust a key bump its generation, so a load that started before the write does not
+    overwrite the newer value. Every worker process has its own copy: the TTL bounds how
+    long a write made through another worker can go unseen.
+    """
+
+    def __init__(self, ttl, name="cache", max_entries=None, clock=time.monotonic):
+        self.ttl = ttl
+        self.name = name
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries = {}
+        self._loading = {}
+        self._generations = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            return default
+        return value
+
+    def set(self, key, value):
+        now = self.clock()
+        # Entries are kept in expiry order (every entry gets the same TTL), so expired keys
+        # that are never read again are dropped from the front in amortised O(1)
+        self._entries.pop(key, None)
+        while self._entries:
+            oldest = next(iter(self._entries))
+            if self._entries[oldest][0] > now and (
+                self.max_entries is None or len(self._entries) < self.max_entries
+            ):
+                break
+            del self._entries[oldest]
+        self._entries[key] = (now + self.ttl, value)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def _bump(self, key):
+        self._generations[key] = self._generations.get(key, 0) + 1
+        # Later readers must not join a load that may miss this write
+        self._loading.pop(key, None)
+
+    def invalidate(self, key=_MISSING):
+        """
+        Forget `key`, or every entry when no key is given.
+        """
+        keys = list(self._entries) + list(self._loading) if key is _MISSING else [key]
+        for k in keys:
+            self._entries.pop(k, None)
+            self._bump(k)
+
+    def adjust(self, key, update):
+        """
+        Replace a cached value with update(value) in place, keeping its expiry.
+        Does nothing if the key is not cached; the next read loads it fresh.
+        """
+        self._bump(key)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            self._entries[key] = (expires_at, update(value))
+
+    async def get_or_load(self, key, loader):
+        """
+        Return the cached value for `key`, calling `await loader()` on a miss.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            self._hits += 1
+            return value
+        self._misses += 1
+        task = self._loading.get(key)
+        if task is None:
+            generation = self._generations.get(key, 0)
+            task = asyncio.ensure_future(loader())
+            self._loading[key] = task
+            task.add_done_callback(lambda done: self._loaded(key, generation, done))
+        # A caller that disconnects must not cancel the load the others are waiting for
+        return await asyncio.shield(task)
+
+    def _loaded(self, key, generation, task):
+        if self._loading.get(key) is task:
+            del self._loading[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        if self._generations.get(key, 0) == generation:
+            self.set(key, task.result())
+
+    def stats(self):
+        return {
+            "name": self.name,
+            "ttl_seconds": self.ttl,
+            "entries": len(self._entries),
+            "hits_total": self._hits,
+            "misses_total": self._misses,
+        }
+
+
+# Admin dashboard counters, keyed by date because "this year" and "active" depend on it
+admin_stats_cache = TTLCache(ADMIN_STATS_TTL, name="admin_stats")
+
+
+def admin_stats_key(today=None):
+    return ("admin_stats", today or datetime.date.today())
+
+
+def bump_admin_stat(field, delta=1):
+    """
+    Adjust one cached dashboard counter after a committed write.
+    """
+    admin_stats_cache.adjust(admin_stats_key(), lambda stats: dict(stats, **{field: stats[field] + delta}))
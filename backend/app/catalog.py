@@ -0,0 +1,86 @@
+# Job catalog builder
+import json
+
+# Column order of GetNotExpiredJobListingsWithCompanyName
+JOB_CATALOG_COLUMNS = (
+    "Job_ID",
+    "Title",
+    "Salary",
+    "Company_Name",
+    "Job_Type",
+    "Application_Deadline",
+    "Job_Description",
+    "Vacancies",
+    "Location_List",
+    "Eligibility_Criteria_List",
+)
+
+# Same shape as the procedure, for callers that need to add filters, ordering or LIMIT
+JOB_CATALOG_SELECT = """
+    SELECT
+        j.Job_ID,
+        j.Job_Title,
+        j.Salary,
+        c.Name AS Company_Name,
+        j.Job_Type,
+        j.Application_Deadline,
+        j.Job_Description,
+        j.Vacancies,
+        (SELECT JSON_ARRAYAGG(jl.Location)
+           FROM Job_Location jl
+          WHERE jl.Job_ID = j.Job_ID) AS Location_List,
+        (SELECT JSON_ARRAYAGG(je.Eligibility_Criterion)
+           FROM Job_Eligibility je
+          WHERE je.Job_ID = j.Job_ID) AS Eligibility_Criteria_List
+"""
+JOB_CATALOG_FROM = "FROM Job j JOIN Company c ON j.Company_ID = c.Company_ID"
+ACTIVE_JOB_CONDITION = "j.Application_Deadline >= CURDATE()"
+
+
+def _json_list(value):
+    """
+    Items of a JSON_ARRAYAGG list column, which comes back from the server as text.
+    NULL (a job without locations or criteria) is an empty list.
+    """
+    if value is None:
+        return []
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode("utf-8")
+    if isinstance(value, str):
+        value = json.loads(value)
+    return [item for item in value if item is not None]
+
+
+def build_job_catalog(rows):
+    """
+    Build exactly one job record per Job_ID in a single pass over `rows`, which have the
+    shape of JOB_CATALOG_SELECT (list columns are JSON arrays). Each job gets its
+    de-duplicated location and eligibility lists in first-seen order.
+    """
+    catalog = {}
+    for row in rows:
+        job_id = row[0]
+        job = catalog.get(job_id)
+        if job is None:
+            job = dict(zip(JOB_CATALOG_COLUMNS[:8], row[:8]))
+            job["Location_List"] = []
+            job["Eligibility_Criteria_List"] = []
+            catalog[job_id] = job
+        for key, value in (("Location_List", row[8]), ("Eligibility_Criteria_List", row[9])):
+            items = job[key]
+            for item in _json_list(value):
+                if item not in items:
+                    items.append(item)
+    return list(catalog.values())
+
+
+async def fetch_job_catalog(db):
+    """
+    Fetch all active jobs as one record per Job_ID.
+    """
+    cursor = db.cursor()
+    try:
+        rows = await cursor.callproc_fetchall("GetNotExpiredJobListingsWithCompanyName")
+        return build_job_catalog(rows)
+    finally:
+        await cursor.close()
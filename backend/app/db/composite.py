@@ -0,0 +1,71 @@
+"""
+Composite reads: run independent sub-queries of one endpoint concurrently, each on its
+own read connection (see acquire_read_db), so the endpoint takes as long as its slowest part instead of the
+sum of all parts.
+
+    results, errors = await run_parts({
+        "report": load_report,          # async def load_report(db): ...
+        "top_industries": load_top_industries,
+    })
+
+Every part has a timeout. A part that fails or times out is left out of `results` and
+its reason is put in `errors`; the other parts are still returned.
+"""
+import asyncio
+import os
+import mysql.connector
+from fastapi import HTTPException
+from db.connections import acquire_read_db
+
+COMPOSITE_PART_TIMEOUT = float(os.getenv("COMPOSITE_PART_TIMEOUT") or 10)
+
+
+async def _run_part(load):
+    db = await acquire_read_db()
+    try:
+        return await load(db)
+    finally:
+        await db.close()
+
+
+def _consume(task):
+    # A part that was given up on (timed out, or the client went away) still finishes and
+    # releases its connection; retrieve its outcome so nothing is logged as unhandled
+    if not task.cancelled():
+        task.exception()
+
+
+async def run_parts(parts, timeout=None):
+    """
+    Run every `load(db)` in `parts` (name -> coroutine function) concurrently.
+    Returns (results, errors): name -> value for the parts that succeeded and
+    name -> reason for those that failed or took longer than `timeout` seconds.
+    """
+    timeout = COMPOSITE_PART_TIMEOUT if timeout is None else timeout
+    tasks = {name: asyncio.ensure_future(_run_part(load)) for name, load in parts.items()}
+    for task in tasks.values():
+        task.add_done_callback(_consume)
+    _, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+
+    results, errors = {}, {}
+    for name, task in tasks.items():
+        if task in pending:
+            # Not cancelled: the blocking call cannot be interrupted, and the part returns
+            # its connection to the pool once the server answers
+            errors[name] = f"Timed out after {timeout:g}s"
+            continue
+        try:
+            results[name] = task.result()
+        except HTTPException as e:
+            errors[name] = e.detail
+        except mysql.connector.Error as e:
+            errors[name] = f"Database error: {e}"
+    return results, errors
+
+
+def raise_if_all_failed(results, errors):
+    """
+    Partial results are returned as they are; with no result at all, fail the request.
+    """
+    if errors and not results:
+        raise HTTPException(status_code=503, detail={"message": "Every part of the request failed", "errors": errors})
@@ -1,6 +1,15 @@
+import asyncio
+import functools
 import mysql.connector
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from fastapi import HTTPException
+from db.instrumentation import count_rows, fingerprint, observe_pool_wait, procedure_label, timed
+from db.pool import ConnectionPool, PoolTimeout
+from db.replicas import RecentWriters, ReplicaSet, use_primary
+from db.statements import PreparedStatements
+from metrics import GaugeCollector, current_route, registry
 
 load_dotenv()
 
@@ -13,27 +22,331 @@ dbconfig = {
     "raise_on_warnings": True
 }
 
-try:
-    pool = mysql.connector.pooling.MySQLConnectionPool(pool_name="mypool",
-                                            pool_size=5,
-                                            **dbconfig)
-    print("Connection pool created successfully")
-except mysql.connector.Error as e:
-    print(f"Error creating connection pool: {e}")
-    pool = None
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE") or 5)
+POOL_MAX_OVERFLOW = int(os.getenv("DB_POOL_MAX_OVERFLOW") or 10)
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT") or 10)
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE") or 3600)
+POOL_PRE_PING = (os.getenv("DB_POOL_PRE_PING") or "true").lower() in ("1", "true", "yes")
+# Statements run once on every new connection, separated by ';'
+SESSION_INIT = [stmt.strip() for stmt in os.getenv("DB_SESSION_INIT", "").split(";") if stmt.strip()]
+
+# Read replicas as host[:port], comma separated; they share the primary's user, password
+# and database. Without any, reads go to the primary.
+REPLICA_HOSTS = [host.strip() for host in os.getenv("DATABASE_REPLICA_HOSTS", "").split(",") if host.strip()]
+# Replicas further behind their source than this many seconds are not read from
+REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG") or 5)
+REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL") or 2)
+# How long a user's reads stay on the primary after they wrote. The default covers the
+# largest lag a replica can reach before a check notices it.
+READ_YOUR_WRITES_WINDOW = float(os.getenv("DB_READ_YOUR_WRITES_WINDOW") or REPLICA_MAX_LAG + REPLICA_CHECK_INTERVAL)
+
+# Bounded executor that runs the blocking mysql.connector calls off the event loop.
+# One worker per connection the pools may open: a thread without a connection has nothing to do.
+executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("DB_EXECUTOR_WORKERS") or (POOL_SIZE + POOL_MAX_OVERFLOW) * (1 + len(REPLICA_HOSTS))),
+    thread_name_prefix="db",
+)
+
+
+async def run_in_db(func, *args, **kwargs):
+    """
+    Run a blocking database call on the database executor and await its result.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
+class AsyncCursor:
+    """
+    Awaitable wrapper around a mysql.connector cursor.
+    Every call that talks to the server is offloaded to the database executor, and
+    timed there per statement and route (see db.instrumentation).
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        # Label and route of the last statement, for the rows fetched from its result
+        self._statement = None
+        self._route = None
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def with_rows(self):
+        return self._cursor.with_rows
+
+    # The route is read on the event loop: the executor threads do not see the request context
+
+    def _timed(self, statement, route, text, func, *args):
+        self._statement, self._route = statement, route
+        return timed(statement, route, text, func, *args)
+
+    def _execute(self, route, operation, params):
+        return self._timed(fingerprint(operation), route, operation, self._cursor.execute, operation, params)
+
+    async def execute(self, operation, params=None):
+        return await run_in_db(self._execute, current_route(), operation, params)
+
+    def _executemany(self, route, operation, seq_params):
+        return self._timed(fingerprint(operation), route, operation, self._cursor.executemany, operation, seq_params)
+
+    async def executemany(self, operation, seq_params):
+        return await run_in_db(self._executemany, current_route(), operation, seq_params)
+
+    def _insert_each(self, route, operation, seq_params):
+        ids = []
+        for params in seq_params:
+            self._execute(route, operation, params)
+            ids.append(self._cursor.lastrowid)
+        return ids
+
+    async def insert_each(self, operation, seq_params):
+        """
+        Run the single-row INSERT `operation` once per parameter tuple, in one executor
+        round trip, and return the AUTO_INCREMENT value generated by each in order.
+        Unlike executemany(), which folds the rows into one multi-row INSERT, every row
+        reports its own id.
+        """
+        return await run_in_db(self._insert_each, current_route(), operation, seq_params)
+
+    def _callproc(self, route, procname, args):
+        return self._timed(procedure_label(procname), route, procname, self._cursor.callproc, procname, args)
+
+    async def callproc(self, procname, args=()):
+        return await run_in_db(self._callproc, current_route(), procname, args)
+
+    def _fetchone(self):
+        row = self._cursor.fetchone()
+        count_rows(self._statement, self._route, row is not None)
+        return row
+
+    async def fetchone(self):
+        return await run_in_db(self._fetchone)
+
+    def _fetchmany(self, size):
+        rows = self._cursor.fetchmany(size)
+        count_rows(self._statement, self._route, len(rows))
+        return rows
+
+    async def fetchmany(self, size=1):
+        return await run_in_db(self._fetchmany, size)
+
+    def _fetchall(self):
+        rows = self._cursor.fetchall()
+        count_rows(self._statement, self._route, len(rows))
+        return rows
+
+    async def fetchall(self):
+        return await run_in_db(self._fetchall)
+
+    def _stored_results(self):
+        results = list(self._cursor.stored_results())
+        count_rows(self._statement, self._route, sum(max(result.rowcount, 0) for result in results))
+        return results
+
+    async def stored_results(self):
+        """
+        Return the result sets of the last callproc.
+        They are buffered by mysql.connector, so fetching from them does not block.
+        """
+        return await run_in_db(self._stored_results)
+
+    def _callproc_fetchall(self, route, procname, args):
+        self._callproc(route, procname, args)
+        rows = []
+        for result in self._cursor.stored_results():
+            rows.extend(result.fetchall())
+        count_rows(self._statement, route, len(rows))
+        return rows
+
+    async def callproc_fetchall(self, procname, args=()):
+        """
+        Call a set-based stored procedure and return the rows of its result set
+        in a single executor round trip.
+        """
+        return await run_in_db(self._callproc_fetchall, current_route(), procname, args)
+
+    async def close(self):
+        return await run_in_db(self._cursor.close)
+
+
+class AsyncConnection:
+    """
+    Awaitable wrapper around a connection checked out of the pool.
+    """
+
+    def __init__(self, entry, pool):
+        self._entry = entry
+        self._connection = entry.connection
+        self._pool = pool
+
+    def cursor(self, *args, **kwargs):
+        # Creating a cursor does not touch the network, so it stays synchronous
+        return AsyncCursor(self._connection.cursor(*args, **kwargs))
+
+    def _fetchall_prepared(self, route, statement, params):
+        entry = self._entry
+        if entry.statements is None:
+            entry.statements = PreparedStatements(entry.connection)
+        rows = timed(statement.name, route, statement.sql, entry.statements.fetchall, statement, params)
+        count_rows(statement.name, route, len(rows))
+        return rows
+
+    async def fetchall_prepared(self, statement, params=()):
+        """
+        Rows of a db.statements.Statement, executed as a server-side prepared statement
+        that stays prepared on this pooled connection for later requests.
+        """
+        return await run_in_db(self._fetchall_prepared, current_route(), statement, params)
+
+    async def fetchone_prepared(self, statement, params=()):
+        """
+        First row of fetchall_prepared(), or None.
+        """
+        rows = await self.fetchall_prepared(statement, params)
+        return rows[0] if rows else None
+
+    async def commit(self):
+        return await run_in_db(self._connection.commit)
+
+    async def rollback(self):
+        return await run_in_db(self._connection.rollback)
+
+    async def close(self):
+        """
+        Return the connection to the pool. Safe to call more than once.
+        """
+        entry, self._entry = self._entry, None
+        if entry is not None:
+            await self._pool.release(entry)
+
+    async def discard(self):
+        """
+        Close the connection instead of returning it, e.g. when a streamed result was abandoned
+        and draining the remaining rows would cost more than reconnecting.
+        """
+        entry, self._entry = self._entry, None
+        if entry is not None:
+            await self._pool.release(entry, discard=True)
+
+
 # Create a ConnectionPool
+# Connections are opened lazily on first use, so importing the app does not need a database
+pool = ConnectionPool(
+    dbconfig,
+    run_in_db,
+    size=POOL_SIZE,
+    max_overflow=POOL_MAX_OVERFLOW,
+    timeout=POOL_TIMEOUT,
+    recycle=POOL_RECYCLE,
+    pre_ping=POOL_PRE_PING,
+    session_init=SESSION_INIT,
+    observe_wait=observe_pool_wait,
+)
+
+
+def _replica_pool(address):
+    host, _, port = address.partition(":")
+    return ConnectionPool(
+        dict(dbconfig, host=host, port=port or dbconfig["port"]),
+        run_in_db,
+        size=POOL_SIZE,
+        max_overflow=POOL_MAX_OVERFLOW,
+        timeout=POOL_TIMEOUT,
+        recycle=POOL_RECYCLE,
+        pre_ping=POOL_PRE_PING,
+        # A write reaching a replica by mistake fails instead of diverging from the primary
+        session_init=SESSION_INIT + ["SET SESSION TRANSACTION READ ONLY"],
+        name=f"replica {address}",
+        observe_wait=observe_pool_wait,
+    )
+
+
+replicas = ReplicaSet(
+    [_replica_pool(address) for address in REPLICA_HOSTS],
+    max_lag=REPLICA_MAX_LAG,
+    check_interval=REPLICA_CHECK_INTERVAL,
+)
+recent_writers = RecentWriters(window=READ_YOUR_WRITES_WINDOW)
+
+
+def _pool_gauge(name, documentation, key, kind="gauge"):
+    def read():
+        pools = [pool] + [replica.pool for replica in replicas.replicas]
+        return [((each.name,), each.stats()[key]) for each in pools]
+    registry.register(GaugeCollector(name, documentation, ("pool",), read, kind))
+
+
+_pool_gauge("db_pool_connections_in_use", "Connections checked out of the pool", "in_use")
+_pool_gauge("db_pool_connections_idle", "Open connections waiting in the pool", "idle")
+_pool_gauge("db_pool_connections_open", "Connections the pool has open", "opened")
+_pool_gauge("db_pool_waiters", "Callers waiting for a free connection", "waiters")
+_pool_gauge("db_pool_timeouts_total", "Acquires that gave up waiting for a connection", "timeouts_total", "counter")
+
+
+async def acquire_db():
+    """
+    Check a connection out of the pool as an AsyncConnection; the caller must close() it.
+    Raises a 503 HTTPException if no connection frees up within DB_POOL_TIMEOUT seconds.
+    """
+    try:
+        entry = await pool.acquire()
+    except PoolTimeout as e:
+        print(f"Error getting connection from pool: {e}")
+        raise HTTPException(status_code=503, detail="Database is busy, please retry", headers={"Retry-After": "1"})
+    except mysql.connector.Error as e:
+        print(f"Error getting connection from pool: {e}")
+        raise HTTPException(status_code=503, detail="Database unavailable")
+    return AsyncConnection(entry, pool)
+
+
+async def acquire_read_db():
+    """
+    Like acquire_db(), for read-only work: a connection to a read replica that is within
+    DB_REPLICA_MAX_LAG, or to the primary when there is none or the request must see the
+    caller's own recent writes (see db.replicas).
+    """
+    if replicas and not use_primary.get():
+        replica = await replicas.acquire()
+        if replica is not None:
+            entry, replica_pool = replica
+            return AsyncConnection(entry, replica_pool)
+    return await acquire_db()
+
+
+async def get_db():
+    """
+    FastAPI dependency yielding an AsyncConnection from the primary's connection pool.
+    Responds with 503 if no connection frees up within DB_POOL_TIMEOUT seconds.
+    The connection is returned to the pool when the request is done.
+    """
+    db = await acquire_db()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+# Routes that write depend on get_write_db, read-only routes on get_read_db
+get_write_db = get_db
+
 
-def get_db():
+async def get_read_db():
     """
-    Get a connection from the connection pool.
+    FastAPI dependency yielding a read-only AsyncConnection (see acquire_read_db).
     """
-    if pool:
-        try:
-            connection = pool.get_connection()
-            return connection
-        except mysql.connector.Error as e:
-            print(f"Error getting connection from pool: {e}")
-            return None
-    else:
-        print("Connection pool is not available")
-        return None
+    db = await acquire_read_db()
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -0,0 +1,144 @@
+"""
+Per-query instrumentation for the AsyncCursor / AsyncConnection wrappers.
+
+Every statement is timed on the executor thread around the driver call itself, so the
+figures exclude time spent queueing for a database thread. Queries are labelled by the
+route handling the request and by statement: "CALL <procedure>" for stored procedures,
+the registered name for prepared statements, and otherwise a fingerprint of the SQL
+with literals and placeholder lists collapsed ("... WHERE Student_ID IN (...)").
+
+Statements slower than DB_SLOW_QUERY_SECONDS are written to the "slow_query" log and
+kept in a small ring buffer served at /metrics/slow_queries.
+"""
+import collections
+import datetime
+import functools
+import logging
+import os
+import re
+import threading
+import time
+import mysql.connector
+from metrics import registry
+
+# 0 turns the slow-query log off
+SLOW_QUERY_SECONDS = float(os.getenv("DB_SLOW_QUERY_SECONDS") or 1)
+SLOW_QUERY_LOG_SIZE = int(os.getenv("DB_SLOW_QUERY_LOG_SIZE") or 100)
+# Distinct SQL fingerprints labelled individually; any further ones count as "other"
+MAX_FINGERPRINTS = 500
+FINGERPRINT_LENGTH = 200
+
+query_duration = registry.histogram(
+    "db_query_duration_seconds",
+    "Time the database took to run a statement, by statement and route",
+    ("statement", "route"),
+)
+query_errors = registry.counter(
+    "db_query_errors_total", "Statements that failed with a database error", ("statement", "route")
+)
+query_rows = registry.counter(
+    "db_query_rows_total", "Rows fetched from statement results", ("statement", "route")
+)
+pool_wait = registry.histogram(
+    "db_pool_wait_seconds", "Time taken to check a connection out of the pool, waits included", ("pool",)
+)
+
+slow_query_log = logging.getLogger("slow_query")
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+_REPEATED_LIST = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+
+_fingerprints = set()
+_fingerprints_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalise(sql):
+    text = _STRING.sub("?", sql)
+    text = _NUMBER.sub("?", text)
+    text = _PLACEHOLDER_LIST.sub("(...)", text)
+    text = _REPEATED_LIST.sub("(...)", text)
+    text = " ".join(text.split())
+    return text[:FINGERPRINT_LENGTH]
+
+
+def fingerprint(sql):
+    """
+    Statement label for `sql`; at most MAX_FINGERPRINTS distinct ones are kept.
+    """
+    if isinstance(sql, (bytes, bytearray)):
+        sql = sql.decode("utf-8", "replace")
+    label = _normalise(sql)
+    if label not in _fingerprints:
+        with _fingerprints_lock:
+            if len(_fingerprints) >= MAX_FINGERPRINTS:
+                return "other"
+            _fingerprints.add(label)
+    return label
+
+
+def procedure_label(procname):
+    return f"CALL {procname}"
+
+
+class SlowQueries:
+    """
+    The most recent slow statements, newest last.
+    """
+
+    def __init__(self, size=SLOW_QUERY_LOG_SIZE):
+        self._entries = collections.deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, entry):
+        with self._lock:
+            self._entries.append(entry)
+
+    def recent(self):
+        with self._lock:
+            return list(self._entries)
+
+
+slow_queries = SlowQueries()
+
+
+def _slow(statement, route, text, seconds):
+    text = " ".join(str(text).split())[:2000]
+    slow_query_log.warning("%.3fs route=%s statement=%s", seconds, route, text)
+    slow_queries.add({
+        "at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="milliseconds"),
+        "seconds": round(seconds, 6),
+        "route": route,
+        "statement": statement,
+        "sql": text,
+    })
+
+
+def timed(statement, route, text, func, *args):
+    """
+    Run the blocking `func(*args)` for `statement` and record its latency and errors.
+    `text` is what the slow-query log shows (the SQL or procedure name, never parameters).
+    Runs on a database executor thread.
+    """
+    started = time.perf_counter()
+    try:
+        return func(*args)
+    except mysql.connector.Error:
+        query_errors.inc((statement, route))
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        query_duration.observe((statement, route), elapsed)
+        if SLOW_QUERY_SECONDS and elapsed >= SLOW_QUERY_SECONDS:
+            _slow(statement, route, text, elapsed)
+
+
+def count_rows(statement, route, rows):
+    if rows:
+        query_rows.inc((statement, route), rows)
+
+
+def observe_pool_wait(pool_name, seconds):
+    pool_wait.observe((pool_name,), seconds)
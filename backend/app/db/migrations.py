@@ -0,0 +1,332 @@
+"""
+Checksum-tracked schema migrations.
+
+Every script is recorded in `schema_migrations` with the SHA-256 of its contents, and a
+startup only executes what is new or changed:
+
+- The base scripts (create_tables, create_procedures, create_indexes) are idempotent and
+  are re-run as a whole whenever their checksum changes.
+- Versioned scripts in scripts/migrations/ (e.g. 0001_refresh_token_families.sql) run once,
+  in name order, between the tables and the procedures. Editing one after it has been
+  applied is an error: add a new migration instead.
+
+Statements are split by a streaming tokenizer that understands quotes, comments,
+BEGIN ... END bodies and DELIMITER, so procedure files need no special formatting.
+
+    python -m db.migrations status      (from backend/app)
+    python -m db.migrations migrate
+"""
+import argparse
+import hashlib
+import pathlib
+import time
+import mysql.connector
+
+SCRIPTS_DIR = pathlib.Path(__file__).parent / "scripts"
+MIGRATIONS_DIR = SCRIPTS_DIR / "migrations"
+
+LOCK_NAME = "schema_migrations"
+LOCK_TIMEOUT = 60
+
+CREATE_MIGRATIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        Name VARCHAR(255) PRIMARY KEY,
+        Checksum CHAR(64) NOT NULL,
+        Applied_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        Duration_Ms INT NOT NULL DEFAULT 0
+    )
+"""
+
+_COMPOUND_OBJECTS = {"PROCEDURE", "FUNCTION", "TRIGGER", "EVENT"}
+# END IF / END LOOP / ... close blocks that are not counted as openers
+_BLOCK_ENDINGS = {"IF", "LOOP", "WHILE", "REPEAT"}
+
+
+class MigrationError(Exception):
+    """
+    Raised when a script fails or an applied versioned migration was modified.
+    """
+
+
+class Script:
+    def __init__(self, name, path, repeatable):
+        self.name = name
+        self.path = path
+        self.repeatable = repeatable
+
+    def checksum(self):
+        # Universal newlines: a CRLF checkout does not count as a change
+        digest = hashlib.sha256()
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                digest.update(line.encode("utf-8"))
+        return digest.hexdigest()
+
+
+def discover_scripts():
+    """
+    All scripts in execution order.
+    """
+    versioned = sorted(MIGRATIONS_DIR.glob("*.sql")) if MIGRATIONS_DIR.is_dir() else []
+    return [
+        Script("create_tables.sql", SCRIPTS_DIR / "create_tables.sql", repeatable=True),
+        *(Script(f"migrations/{path.name}", path, repeatable=False) for path in versioned),
+        Script("create_procedures.sql", SCRIPTS_DIR / "create_procedures.sql", repeatable=True),
+        Script("create_indexes.sql", SCRIPTS_DIR / "create_indexes.sql", repeatable=True),
+    ]
+
+
+class _Splitter:
+    """
+    State of one statement being accumulated by iter_statements().
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.parts = []
+        self.started = False
+        self.words = 0
+        self.first_word = None
+        self.compound = None
+        self.depth = 0
+        self.pending_end = False
+
+    def resolve_end(self):
+        if self.pending_end:
+            self.pending_end = False
+            self.depth -= 1
+
+    def word(self, word):
+        word = word.upper()
+        if self.compound is None:
+            self.words += 1
+            if self.first_word is None:
+                self.first_word = word
+            if self.first_word != "CREATE" or self.words > 6:
+                self.compound = False
+            elif word in _COMPOUND_OBJECTS:
+                self.compound = True
+            return
+        if not self.compound:
+            return
+        if self.pending_end:
+            self.pending_end = False
+            if word in _BLOCK_ENDINGS:
+                return
+            self.depth -= 1
+            if word == "CASE":
+                return
+        if word in ("BEGIN", "CASE"):
+            self.depth += 1
+        elif word == "END":
+            self.pending_end = True
+
+
+def iter_statements(lines):
+    """
+    Yield the statements of an SQL script given as an iterable of lines.
+
+    A statement ends at the current delimiter (';' unless changed with DELIMITER) outside
+    quotes and comments; inside a CREATE PROCEDURE/FUNCTION/TRIGGER/EVENT body the ';'
+    only ends the statement once every BEGIN (and CASE) has met its END. Line comments
+    are dropped, block comments are kept. Only the current statement is held in memory.
+    """
+    delimiter = ";"
+    state = _Splitter()
+    word = []
+    quote = None
+    block_comment = False
+
+    for line in lines:
+        if not state.started and not quote and not block_comment:
+            stripped = line.strip()
+            if stripped[:10].upper() == "DELIMITER " or stripped.upper() == "DELIMITER":
+                parts = stripped.split(None, 1)
+                if len(parts) == 2:
+                    delimiter = parts[1]
+                continue
+
+        i, n = 0, len(line)
+        while i < n:
+            ch = line[i]
+            if block_comment:
+                if line.startswith("*/", i):
+                    state.parts.append("*/")
+                    block_comment = False
+                    i += 2
+                else:
+                    state.parts.append(ch)
+                    i += 1
+                continue
+            if quote:
+                state.parts.append(ch)
+                if ch == "\\" and quote != "`" and i + 1 < n:
+                    state.parts.append(line[i + 1])
+                    i += 2
+                    continue
+                if ch == quote:
+                    quote = None
+                i += 1
+                continue
+            # A custom delimiter such as $$ may consist of identifier characters
+            if delimiter != ";" and line.startswith(delimiter, i):
+                word = []
+                statement = "".join(state.parts).strip()
+                if statement:
+                    yield statement
+                state.reset()
+                i += len(delimiter)
+                continue
+            if ch.isalnum() or ch in "_$":
+                word.append(ch)
+                state.parts.append(ch)
+                state.started = True
+                i += 1
+                continue
+            if word:
+                state.word("".join(word))
+                word = []
+            if ch == "#" or (line.startswith("--", i) and (i + 2 == n or line[i + 2] in " \t\r\n")):
+                state.parts.append("\n")
+                break
+            if line.startswith("/*", i):
+                block_comment = True
+                state.parts.append("/*")
+                i += 2
+                continue
+            if ch == ";" and delimiter == ";":
+                state.resolve_end()
+                if not state.compound or state.depth <= 0:
+                    statement = "".join(state.parts).strip()
+                    if statement:
+                        yield statement
+                    state.reset()
+                    i += 1
+                    continue
+            if ch in "'\"`":
+                quote = ch
+            state.parts.append(ch)
+            if not ch.isspace():
+                state.started = True
+            i += 1
+
+    if word:
+        state.word("".join(word))
+    statement = "".join(state.parts).strip()
+    if statement:
+        yield statement
+
+
+def _execute_script(connection, script):
+    cursor = connection.cursor()
+    count = 0
+    try:
+        with open(script.path, encoding="utf-8") as f:
+            for statement in iter_statements(f):
+                try:
+                    cursor.execute(statement)
+                    if cursor.with_rows:
+                        cursor.fetchall()
+                except mysql.connector.Error as e:
+                    raise MigrationError(f"{script.name}: statement {count + 1} failed: {e}\n{statement[:200]}") from e
+                count += 1
+    finally:
+        cursor.close()
+    return count
+
+
+def _applied(cursor):
+    cursor.execute(CREATE_MIGRATIONS_TABLE)
+    cursor.execute("SELECT Name, Checksum FROM schema_migrations")
+    return dict(cursor.fetchall())
+
+
+def pending_scripts(cursor, scripts=None):
+    """
+    (script, checksum) pairs that still have to run; raises MigrationError if an applied
+    versioned migration was changed.
+    """
+    applied = _applied(cursor)
+    pending = []
+    for script in scripts or discover_scripts():
+        checksum = script.checksum()
+        recorded = applied.get(script.name)
+        if recorded == checksum:
+            continue
+        if recorded is not None and not script.repeatable:
+            raise MigrationError(
+                f"{script.name} was modified after it was applied; add a new migration instead"
+            )
+        pending.append((script, checksum))
+    return pending
+
+
+def apply_migrations(connection, scripts=None, log=print):
+    """
+    Run every new or changed script and record its checksum.
+    Holds a server-side lock so concurrently starting workers migrate only once.
+    Returns the names of the scripts that ran.
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT GET_LOCK(%s, %s)", (LOCK_NAME, LOCK_TIMEOUT))
+        (locked,) = cursor.fetchone()
+        if locked != 1:
+            raise MigrationError(f"Could not acquire the '{LOCK_NAME}' lock within {LOCK_TIMEOUT}s")
+        try:
+            ran = []
+            for script, checksum in pending_scripts(cursor, scripts):
+                started = time.perf_counter()
+                count = _execute_script(connection, script)
+                duration_ms = int((time.perf_counter() - started) * 1000)
+                cursor.execute(
+                    """
+                    INSERT INTO schema_migrations (Name, Checksum, Duration_Ms) VALUES (%s, %s, %s)
+                    ON DUPLICATE KEY UPDATE Checksum = %s, Applied_At = CURRENT_TIMESTAMP, Duration_Ms = %s
+                    """,
+                    (script.name, checksum, duration_ms, checksum, duration_ms),
+                )
+                connection.commit()
+                log(f"Applied {script.name}: {count} statements in {duration_ms} ms")
+                ran.append(script.name)
+            return ran
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+            cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def main():
+    from db.connections import dbconfig
+
+    parser = argparse.ArgumentParser(description="Schema migrations")
+    parser.add_argument("command", choices=["status", "migrate"])
+    args = parser.parse_args()
+
+    connection = mysql.connector.connect(**dict(dbconfig, raise_on_warnings=False))
+    try:
+        if args.command == "status":
+            cursor = connection.cursor()
+            try:
+                pending = pending_scripts(cursor)
+            finally:
+                cursor.close()
+            for script, _ in pending:
+                print(f"pending  {script.name}")
+            if not pending:
+                print("Schema is up to date")
+        else:
+            ran = apply_migrations(connection)
+            if not ran:
+                print("Schema is up to date")
+    except MigrationError as e:
+        raise SystemExit(str(e))
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
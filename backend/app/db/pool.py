@@ -0,0 +1,304 @@
+import asyncio
+import collections
+import time
+import mysql.connector
+
+
+class PoolTimeout(Exception):
+    """
+    Raised when no connection became available within the acquire timeout.
+    """
+
+
+class _Entry:
+    """
+    A raw connection plus the bookkeeping the pool needs to recycle it, and the
+    statements prepared on it (db.statements.PreparedStatements, created on first use).
+    """
+    __slots__ = ("connection", "created_at", "released_at", "statements")
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+        self.released_at = self.created_at
+        self.statements = None
+
+
+class ConnectionPool:
+    """
+    Asyncio-aware MySQL connection pool.
+
+    - Keeps up to `size` idle connections and opens up to `max_overflow` extra ones under load.
+    - Callers beyond that wait in a FIFO queue for at most `timeout` seconds.
+    - Idle connections older than `recycle` seconds are replaced; with `pre_ping` a connection
+      that has been idle for longer than `ping_after` seconds is pinged before being handed out.
+    - Every new connection runs the `session_init` statements once.
+    - `observe_wait(name, seconds)`, if given, is told how long each acquire() took.
+
+    Blocking driver calls run through `run_in_db`, waiting for a free slot happens on the event
+    loop, so waiters never occupy executor threads that in-flight queries need.
+    """
+
+    def __init__(
+        self,
+        dbconfig,
+        run_in_db,
+        size=5,
+        max_overflow=10,
+        timeout=30.0,
+        recycle=3600,
+        pre_ping=True,
+        ping_after=5.0,
+        session_init=(),
+        name="primary",
+        observe_wait=None,
+    ):
+        self.dbconfig = dbconfig
+        self.run_in_db = run_in_db
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+        self.ping_after = ping_after
+        self.session_init = list(session_init)
+        self.name = name
+        self.observe_wait = observe_wait
+
+        self._idle = collections.deque()
+        self._waiters = collections.deque()
+        self._opened = 0
+        self._in_use = 0
+
+        # Counters, exposed through stats()
+        self._acquired = 0
+        self._timeouts = 0
+        self._created = 0
+        self._recycled = 0
+        self._ping_failures = 0
+        self._wait_count = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    @property
+    def max_connections(self):
+        return self.size + self.max_overflow
+
+    @property
+    def saturated(self):
+        """
+        True when acquire() would have to wait for a connection to be released.
+        """
+        return bool(self._waiters) or (not self._idle and self._opened >= self.max_connections)
+
+    def _connect(self):
+        connection = mysql.connector.connect(**self.dbconfig)
+        if self.session_init:
+            cursor = connection.cursor()
+            try:
+                for statement in self.session_init:
+                    cursor.execute(statement)
+            finally:
+                cursor.close()
+        return connection
+
+    async def _open(self):
+        """
+        Open a new connection for a slot that has already been reserved in `_opened`.
+        """
+        try:
+            connection = await self.run_in_db(self._connect)
+        except BaseException:
+            self._opened -= 1
+            self._wake_for_new_slot()
+            raise
+        self._created += 1
+        return _Entry(connection)
+
+    def _close(self, entry):
+        try:
+            entry.connection.close()
+        except mysql.connector.Error:
+            pass
+
+    def _ping(self, entry):
+        try:
+            entry.connection.ping(reconnect=False)
+            return True
+        except mysql.connector.Error:
+            return False
+
+    async def _validate(self, entry):
+        """
+        Return a usable entry for `entry`, replacing it if it is stale or dead.
+        """
+        now = time.monotonic()
+        if self.recycle and now - entry.created_at > self.recycle:
+            self._recycled += 1
+            await self.run_in_db(self._close, entry)
+            return await self._reopen()
+        if self.pre_ping and now - entry.released_at > self.ping_after:
+            if not await self.run_in_db(self._ping, entry):
+                self._ping_failures += 1
+                await self.run_in_db(self._close, entry)
+                return await self._reopen()
+        return entry
+
+    async def _reopen(self):
+        # The slot stays reserved while the replacement connection is opened
+        try:
+            connection = await self.run_in_db(self._connect)
+        except BaseException:
+            self._opened -= 1
+            self._in_use -= 1
+            self._wake_for_new_slot()
+            raise
+        self._created += 1
+        return _Entry(connection)
+
+    async def acquire(self):
+        """
+        Check out a connection entry, waiting in FIFO order if the pool is exhausted.
+        The raw mysql.connector connection is `entry.connection`; give the entry back with release().
+        """
+        started = time.monotonic()
+        if self._idle and not self._waiters:
+            entry = self._idle.pop()
+        elif self._opened < self.max_connections and not self._waiters:
+            self._opened += 1
+            entry = await self._open()
+        else:
+            entry = await self._wait()
+
+        self._in_use += 1
+        self._acquired += 1
+        entry = await self._validate(entry)
+        if self.observe_wait is not None:
+            self.observe_wait(self.name, time.monotonic() - started)
+        return entry
+
+    async def _wait(self):
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        started = time.monotonic()
+        try:
+            return await asyncio.wait_for(waiter, self.timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                # A connection was handed over just as we gave up: give it back
+                self._hand_over(waiter.result())
+            if isinstance(e, asyncio.TimeoutError):
+                self._timeouts += 1
+                raise PoolTimeout(
+                    f"Timed out after {self.timeout}s waiting for a '{self.name}' database connection"
+                ) from None
+            raise
+        finally:
+            waited = time.monotonic() - started
+            self._wait_count += 1
+            self._wait_time_total += waited
+            self._wait_time_max = max(self._wait_time_max, waited)
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+
+    def _next_waiter(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                return waiter
+        return None
+
+    def _hand_over(self, entry):
+        """
+        Give a released connection to the longest waiting caller, or park it as idle.
+        """
+        entry.released_at = time.monotonic()
+        waiter = self._next_waiter()
+        if waiter is not None:
+            waiter.set_result(entry)
+        elif len(self._idle) < self.size:
+            self._idle.append(entry)
+        else:
+            # Overflow connection with nobody waiting for it
+            self._opened -= 1
+            asyncio.get_running_loop().create_task(self.run_in_db(self._close, entry))
+
+    def _wake_for_new_slot(self):
+        """
+        A slot was freed without a connection to hand over: open one for the next waiter.
+        """
+        if self._waiters and self._opened < self.max_connections:
+            waiter = self._next_waiter()
+            if waiter is None:
+                return
+            self._opened += 1
+
+            async def open_for_waiter():
+                try:
+                    entry = await self._open()
+                except Exception as e:
+                    if not waiter.done():
+                        waiter.set_exception(e)
+                    return
+                if waiter.done():
+                    self._hand_over(entry)
+                else:
+                    waiter.set_result(entry)
+
+            asyncio.get_running_loop().create_task(open_for_waiter())
+
+    def _reset(self, entry):
+        connection = entry.connection
+        try:
+            if connection.unread_result:
+                connection.consume_results()
+            connection.rollback()
+            return True
+        except mysql.connector.Error:
+            return False
+
+    async def release(self, entry, discard=False):
+        """
+        Return a connection to the pool. Broken or discarded connections are closed.
+        """
+        self._in_use -= 1
+        if not discard and await self.run_in_db(self._reset, entry):
+            self._hand_over(entry)
+            return
+        self._opened -= 1
+        await self.run_in_db(self._close, entry)
+        self._wake_for_new_slot()
+
+    async def dispose(self):
+        """
+        Close every idle connection, e.g. on application shutdown.
+        """
+        while self._idle:
+            entry = self._idle.pop()
+            self._opened -= 1
+            await self.run_in_db(self._close, entry)
+
+    def stats(self):
+        """
+        Snapshot of the pool counters.
+        """
+        return {
+            "name": self.name,
+            "size": self.size,
+            "max_overflow": self.max_overflow,
+            "opened": self._opened,
+            "in_use": self._in_use,
+            "idle": len(self._idle),
+            "waiters": sum(1 for waiter in self._waiters if not waiter.done()),
+            "acquired_total": self._acquired,
+            "timeouts_total": self._timeouts,
+            "created_total": self._created,
+            "recycled_total": self._recycled,
+            "ping_failures_total": self._ping_failures,
+            "wait_count": self._wait_count,
+            "wait_time_total_seconds": round(self._wait_time_total, 6),
+            "wait_time_max_seconds": round(self._wait_time_max, 6),
+        }
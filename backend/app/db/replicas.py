@@ -0,0 +1,230 @@
+"""
+Read replicas: lag-aware choice of a replica pool for read-only work, with fallback to
+the primary and read-your-writes stickiness.
+
+A replica is used while its last lag check (SHOW REPLICA STATUS, every `check_interval`
+seconds in the background) found replication running and no more than `max_lag` seconds
+behind. Unknown, lagging, broken or saturated replicas are skipped; with none left the
+read goes to the primary.
+
+ReadYourWritesMiddleware pins a request to the primary when it is a write, or when the
+same user (access token subject, else client address) made a successful write in the
+last `window` seconds. Other workers learn about the write through a short-lived cookie.
+"""
+import asyncio
+import contextvars
+import itertools
+import math
+import time
+import mysql.connector
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.requests import cookie_parser
+from auth import authenticate
+from db.pool import PoolTimeout
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+STICKY_COOKIE = "db_primary"
+
+# Set per request by ReadYourWritesMiddleware; tasks started by the request inherit it
+use_primary = contextvars.ContextVar("use_primary", default=False)
+
+
+def _replica_status(connection):
+    """
+    Seconds the server is behind its source, or None if it is not replicating.
+    """
+    cursor = connection.cursor(dictionary=True)
+    try:
+        try:
+            cursor.execute("SHOW REPLICA STATUS")
+        except mysql.connector.ProgrammingError:
+            # Servers before 8.0.22
+            cursor.execute("SHOW SLAVE STATUS")
+        row = cursor.fetchone()
+        cursor.fetchall()
+    finally:
+        cursor.close()
+    if row is None:
+        return None
+    io_running = row.get("Replica_IO_Running", row.get("Slave_IO_Running"))
+    sql_running = row.get("Replica_SQL_Running", row.get("Slave_SQL_Running"))
+    if io_running != "Yes" or sql_running != "Yes":
+        return None
+    return row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+
+
+class Replica:
+    __slots__ = ("pool", "lag", "usable", "checked_at", "error", "check")
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.lag = None
+        self.usable = False  # until the first check says otherwise
+        self.checked_at = None
+        self.error = None
+        self.check = None
+
+
+class ReplicaSet:
+    """
+    The replica pools and their replication lag, as last measured.
+    """
+
+    def __init__(self, pools, max_lag=5.0, check_interval=2.0, clock=time.monotonic):
+        self.replicas = [Replica(pool) for pool in pools]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.clock = clock
+        self._next = itertools.count()
+        self._replica_reads = 0
+        self._fallbacks = 0
+
+    def __bool__(self):
+        return bool(self.replicas)
+
+    async def _check(self, replica):
+        pool = replica.pool
+        try:
+            entry = await pool.acquire()
+            try:
+                lag = await pool.run_in_db(_replica_status, entry.connection)
+            finally:
+                await pool.release(entry)
+            replica.lag = lag
+            replica.error = None if lag is not None else "Replication is not running"
+            replica.usable = lag is not None and lag <= self.max_lag
+        except (PoolTimeout, mysql.connector.Error) as e:
+            replica.usable = False
+            replica.error = str(e)
+        finally:
+            replica.checked_at = self.clock()
+            replica.check = None
+
+    def _refresh(self, replica):
+        if replica.check is None and (
+            replica.checked_at is None or self.clock() - replica.checked_at > self.check_interval
+        ):
+            replica.check = asyncio.ensure_future(self._check(replica))
+
+    def _mark_down(self, replica, error):
+        print(f"Replica {replica.pool.name} unavailable, reading from the primary: {error}")
+        replica.usable = False
+        replica.error = str(error)
+        replica.checked_at = self.clock()
+
+    async def acquire(self):
+        """
+        (entry, pool) from a usable replica, round robin, or None to read from the primary.
+        """
+        for replica in self.replicas:
+            self._refresh(replica)
+        candidates = [replica for replica in self.replicas if replica.usable and not replica.pool.saturated]
+        if candidates:
+            start = next(self._next) % len(candidates)
+            for replica in candidates[start:] + candidates[:start]:
+                try:
+                    entry = await replica.pool.acquire()
+                except (PoolTimeout, mysql.connector.Error) as e:
+                    self._mark_down(replica, e)
+                    continue
+                self._replica_reads += 1
+                return entry, replica.pool
+        self._fallbacks += 1
+        return None
+
+    async def dispose(self):
+        for replica in self.replicas:
+            await replica.pool.dispose()
+
+    def stats(self):
+        return {
+            "max_lag_seconds": self.max_lag,
+            "replica_reads_total": self._replica_reads,
+            "primary_fallbacks_total": self._fallbacks,
+            "replicas": [
+                {
+                    "name": replica.pool.name,
+                    "usable": replica.usable,
+                    "lag_seconds": replica.lag,
+                    "error": replica.error,
+                    "pool": replica.pool.stats(),
+                }
+                for replica in self.replicas
+            ],
+        }
+
+
+class RecentWriters:
+    """
+    Users who wrote in the last `window` seconds, whose reads must see their own writes.
+    """
+
+    def __init__(self, window=7.0, clock=time.monotonic):
+        self.window = window
+        self.clock = clock
+        self._until = {}
+        self.sticky_reads = 0
+
+    def mark(self, identity):
+        if identity is None:
+            return
+        now = self.clock()
+        if len(self._until) > 10000:
+            self._until = {key: until for key, until in self._until.items() if until > now}
+        self._until[identity] = now + self.window
+
+    def recent(self, identity):
+        until = self._until.get(identity)
+        return until is not None and until > self.clock()
+
+    def stats(self):
+        return {"window_seconds": self.window, "sticky_reads_total": self.sticky_reads}
+
+
+def _identity(scope, headers):
+    authorization = headers.get("authorization", "")
+    if authorization[:7].lower() == "bearer ":
+        try:
+            principal = authenticate(authorization[7:].strip())
+            return f"{principal.role}:{principal.id}"
+        except HTTPException:
+            pass
+    client = scope.get("client")
+    return f"client:{client[0]}" if client else None
+
+
+class ReadYourWritesMiddleware:
+    """
+    ASGI middleware setting `use_primary` for each request (see the module docstring).
+    """
+
+    def __init__(self, app, writers):
+        self.app = app
+        self.writers = writers
+        self.cookie = f"{STICKY_COOKIE}=1; Max-Age={math.ceil(writers.window)}; Path=/; HttpOnly; SameSite=Lax"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = Headers(scope=scope)
+        identity = _identity(scope, headers)
+        write = scope["method"] not in READ_METHODS
+        sticky = not write and (
+            self.writers.recent(identity) or STICKY_COOKIE in cookie_parser(headers.get("cookie", ""))
+        )
+        if sticky:
+            self.writers.sticky_reads += 1
+
+        async def send_marking_writes(message):
+            if write and message["type"] == "http.response.start" and message["status"] < 400:
+                self.writers.mark(identity)
+                message["headers"] = list(message.get("headers", [])) + [(b"set-cookie", self.cookie.encode("latin-1"))]
+            await send(message)
+
+        token = use_primary.set(write or sticky)
+        try:
+            await self.app(scope, receive, send_marking_writes)
+        finally:
+            use_primary.reset(token)
@@ -0,0 +1,147 @@
+"""
+Maintenance for the placement rollup tables (Placement_Daily_Rollup, Placement_Student_Year)
+and the student count in Student_Total.
+
+AddPlacementRecord keeps the rollups current one placement at a time, and bulk ingestion
+applies a whole batch with apply_placements_to_rollup(); AddStudentWithContact and
+add_students_to_total() do the same for the student count. Rebuild them from
+Placement_Record and Student after loading historical data or deleting rows directly:
+
+    python -m db.rollup rebuild     (from backend/app)
+"""
+import argparse
+import decimal
+import time
+import mysql.connector
+from bulk import chunked, insert_rows
+from db.connections import dbconfig
+
+
+def rebuild_rollup(cursor):
+    """
+    Recompute the rollups from Placement_Record in the current transaction.
+    """
+    cursor.callproc("RebuildPlacementRollup")
+    for result in cursor.stored_results():
+        result.fetchall()
+
+
+def backfill_rollup_if_empty(cursor):
+    """
+    Build the rollups on first deploy, when Placement_Record or Student already has rows
+    but the rollup tables are still empty. Returns True if a rebuild ran.
+    """
+    cursor.execute("SELECT EXISTS (SELECT 1 FROM Placement_Daily_Rollup), EXISTS (SELECT 1 FROM Student_Total)")
+    has_rollup, has_total = cursor.fetchone()
+    cursor.execute(
+        "SELECT EXISTS (SELECT 1 FROM Placement_Record WHERE Placement_Date IS NOT NULL), EXISTS (SELECT 1 FROM Student)"
+    )
+    has_records, has_students = cursor.fetchone()
+    if (has_rollup or not has_records) and (has_total or not has_students):
+        return False
+    print("Placement rollup is empty, rebuilding from Placement_Record")
+    rebuild_rollup(cursor)
+    return True
+
+
+async def add_students_to_total(cursor, count):
+    """
+    Count `count` students inserted in the current transaction in Student_Total.
+    """
+    await cursor.execute(
+        "INSERT INTO Student_Total (Summary_ID, Students) VALUES (1, %s) AS b "
+        "ON DUPLICATE KEY UPDATE Students = Students + b.Students",
+        (count,),
+    )
+
+
+async def apply_placements_to_rollup(cursor, placements):
+    """
+    Set-based equivalent of ApplyPlacementToRollup for a batch of placements inserted in
+    the current transaction, given as (Student_ID, Package, Placement_Date) tuples.
+
+    The batch is aggregated in memory, the affected Placement_Student_Year rows are read
+    (and locked) in one query, and each rollup table gets one multi-row write, so the
+    cost is a handful of statements per batch rather than several per placement.
+    """
+    days = {}  # Placement_Date -> [Placements, Package_Sum, Package_Count, New_Students]
+    firsts = {}  # (year, Student_ID) -> earliest Placement_Date in the batch
+
+    def day(placement_date):
+        return days.setdefault(placement_date, [0, decimal.Decimal(0), 0, 0])
+
+    for student_id, package, placement_date in placements:
+        if placement_date is None:
+            continue
+        totals = day(placement_date)
+        totals[0] += 1
+        if package is not None:
+            totals[1] += decimal.Decimal(str(package))
+            totals[2] += 1
+        if student_id is not None:
+            key = (placement_date.year, student_id)
+            if key not in firsts or placement_date < firsts[key]:
+                firsts[key] = placement_date
+
+    known = {}
+    for part in chunked(list(firsts), 500):
+        await cursor.execute(
+            "SELECT Placement_Year, Student_ID, First_Placement_Date FROM Placement_Student_Year "
+            f"WHERE (Placement_Year, Student_ID) IN ({', '.join(['(%s, %s)'] * len(part))}) FOR UPDATE",
+            [value for key in part for value in key],
+        )
+        known.update(((year, student_id), first) for year, student_id, first in await cursor.fetchall())
+
+    new_students = []
+    for (year, student_id), first in firsts.items():
+        current = known.get((year, student_id))
+        if current is None:
+            new_students.append((year, student_id, first))
+            day(first)[3] += 1
+        elif first < current:
+            # A back-dated placement moves the student's first day of the year
+            await cursor.execute(
+                "UPDATE Placement_Student_Year SET First_Placement_Date = %s WHERE Placement_Year = %s AND Student_ID = %s",
+                (first, year, student_id),
+            )
+            day(current)[3] -= 1
+            day(first)[3] += 1
+
+    for part in chunked(new_students, 500):
+        await insert_rows(cursor, "Placement_Student_Year", ("Placement_Year", "Student_ID", "First_Placement_Date"), part)
+
+    rows = [(placement_date, *totals) for placement_date, totals in sorted(days.items())]
+    for part in chunked(rows, 500):
+        await cursor.execute(
+            "INSERT INTO Placement_Daily_Rollup (Placement_Date, Placements, Package_Sum, Package_Count, New_Students) "
+            f"VALUES {', '.join(['(%s, %s, %s, %s, %s)'] * len(part))} AS b "
+            "ON DUPLICATE KEY UPDATE Placements = Placements + b.Placements, Package_Sum = Package_Sum + b.Package_Sum, "
+            "Package_Count = Package_Count + b.Package_Count, New_Students = New_Students + b.New_Students",
+            [value for row in part for value in row],
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Placement rollup maintenance")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.parse_args()
+
+    connection = mysql.connector.connect(**dbconfig)
+    cursor = connection.cursor()
+    try:
+        started = time.perf_counter()
+        rebuild_rollup(cursor)
+        connection.commit()
+        cursor.execute("SELECT COUNT(*), IFNULL(SUM(Placements), 0) FROM Placement_Daily_Rollup")
+        days, placements = cursor.fetchone()
+        print(f"Rebuilt placement rollup: {placements} placements over {days} days in {time.perf_counter() - started:.2f}s")
+    except mysql.connector.Error as e:
+        connection.rollback()
+        raise SystemExit(f"Rebuild failed: {e}")
+    finally:
+        cursor.close()
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
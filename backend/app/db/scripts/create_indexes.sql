@@ -0,0 +1,65 @@
+-- Secondary indexes
+-- MySQL has no CREATE INDEX IF NOT EXISTS, so every index goes through this helper
+DROP PROCEDURE IF EXISTS CreateIndexIfNotExists;
+CREATE PROCEDURE CreateIndexIfNotExists(
+    IN p_Table VARCHAR(64),
+    IN p_Index VARCHAR(64),
+    IN p_Columns VARCHAR(255)
+)
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = p_Table AND INDEX_NAME = p_Index
+    ) THEN
+        SET @ddl = CONCAT('CREATE INDEX ', p_Index, ' ON ', p_Table, ' (', p_Columns, ')');
+        PREPARE stmt FROM @ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+END;
+
+
+-- Sort keys of the paginated list endpoints
+-- InnoDB secondary indexes carry the primary key, so (col) also serves ORDER BY col, pk
+CALL CreateIndexIfNotExists('Student', 'idx_student_name', 'Name');
+CALL CreateIndexIfNotExists('Student', 'idx_student_cgpa', 'CGPA');
+CALL CreateIndexIfNotExists('Student', 'idx_student_department_year', 'Department, Graduation_Year');
+CALL CreateIndexIfNotExists('Student', 'idx_student_graduation_year', 'Graduation_Year');
+
+CALL CreateIndexIfNotExists('Company', 'idx_company_name', 'Name');
+CALL CreateIndexIfNotExists('Company', 'idx_company_industry', 'Industry_Type');
+
+CALL CreateIndexIfNotExists('Job', 'idx_job_deadline', 'Application_Deadline');
+CALL CreateIndexIfNotExists('Job', 'idx_job_type_deadline', 'Job_Type, Application_Deadline');
+CALL CreateIndexIfNotExists('Job', 'idx_job_salary', 'Salary');
+
+CALL CreateIndexIfNotExists('Placement_Record', 'idx_placement_date', 'Placement_Date');
+CALL CreateIndexIfNotExists('Placement_Record', 'idx_placement_package', 'Package');
+
+CALL CreateIndexIfNotExists('Feedback', 'idx_feedback_rating', 'Rating');
+
+CALL CreateIndexIfNotExists('Training_Program', 'idx_training_start_date', 'Start_Date');
+CALL CreateIndexIfNotExists('Training_Program', 'idx_training_cost', 'Training_Cost');
+CALL CreateIndexIfNotExists('Training_Program', 'idx_training_mode', 'Mode');
+
+
+-- Hot lookup paths
+-- Foreign keys already give each child table a single-column index on the parent key. The composite
+-- indexes below start with that column, so InnoDB drops the implicit one, and they also cover the
+-- column that is checked or read
+CALL CreateIndexIfNotExists('Application', 'idx_application_student_job', 'Student_ID, Job_ID');
+CALL CreateIndexIfNotExists('Training_Enrollment', 'idx_enrollment_student_training', 'Student_ID, Training_ID');
+CALL CreateIndexIfNotExists('Job', 'idx_job_company_deadline', 'Company_ID, Application_Deadline');
+CALL CreateIndexIfNotExists('refresh_tokens', 'idx_refresh_tokens_user_expiry', 'user_id, expiry_date');
+CALL CreateIndexIfNotExists('refresh_tokens', 'idx_refresh_tokens_family', 'family_id');
+CALL CreateIndexIfNotExists('refresh_tokens', 'idx_refresh_tokens_expiry', 'expiry_date');
+
+-- Contact tables are only ever read by owner, e.g. the MIN(Phone_No) per student subqueries
+CALL CreateIndexIfNotExists('Student_Email', 'idx_student_email_student', 'Student_ID, Email_ID');
+CALL CreateIndexIfNotExists('Student_Phone', 'idx_student_phone_student', 'Student_ID, Phone_No');
+CALL CreateIndexIfNotExists('Company_Email', 'idx_company_email_company', 'Company_ID, Email_ID');
+CALL CreateIndexIfNotExists('Company_Phone', 'idx_company_phone_company', 'Company_ID, Phone_No');
+CALL CreateIndexIfNotExists('Trainer_Email', 'idx_trainer_email_trainer', 'Trainer_ID, Email');
+CALL CreateIndexIfNotExists('Trainer_Phone', 'idx_trainer_phone_trainer', 'Trainer_ID, Phone_No');
+CALL CreateIndexIfNotExists('Email', 'idx_admin_email_admin', 'Admin_ID, Email_ID');
+CALL CreateIndexIfNotExists('Phone', 'idx_admin_phone_admin', 'Admin_ID, Phone_No');
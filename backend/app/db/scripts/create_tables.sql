@@ -151,18 +151,29 @@ CREATE TABLE IF NOT EXISTS Placement_Record (
     FOREIGN KEY (Company_ID) REFERENCES Company(Company_ID) ON DELETE CASCADE
 );
 
-
--- Feedback Set
-CREATE TABLE IF NOT EXISTS Feedback (
-    Feedback_ID INT PRIMARY KEY AUTO_INCREMENT,
+-- Placement rollups, maintained by AddPlacementRecord
+-- Rebuild from Placement_Record with: python -m db.rollup rebuild
+CREATE TABLE IF NOT EXISTS Placement_Daily_Rollup (
+    Placement_Date DATE PRIMARY KEY,
+    Placements INT NOT NULL DEFAULT 0,
+    Package_Sum DECIMAL(16,2) NOT NULL DEFAULT 0,
+    Package_Count INT NOT NULL DEFAULT 0,
+    -- Students whose first placement of the year falls on this day
+    New_Students INT NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS Placement_Student_Year (
+    Placement_Year SMALLINT,
     Student_ID INT,
-    Rating INT,
-    Comments TEXT,
-    Trainer_ID INT,
-    Training_ID INT,
-    FOREIGN KEY (Student_ID) REFERENCES Student(Student_ID) ON DELETE CASCADE,
-    FOREIGN KEY (Trainer_ID) REFERENCES Trainer(Trainer_ID) ON DELETE CASCADE,
-    FOREIGN KEY (Training_ID) REFERENCES Training_Program(Training_ID) ON DELETE CASCADE
+    First_Placement_Date DATE NOT NULL,
+    PRIMARY KEY (Placement_Year, Student_ID)
+);
+
+-- Number of registered students (one row, Summary_ID = 1), maintained by AddStudentWithContact
+-- and bulk registration; the placement report divides by it
+CREATE TABLE IF NOT EXISTS Student_Total (
+    Summary_ID TINYINT PRIMARY KEY,
+    Students INT NOT NULL DEFAULT 0
 );
 
 
@@ -194,6 +205,20 @@ CREATE TABLE IF NOT EXISTS Training_Enrollment (
 
 
 
+-- Feedback Set (after Training_Program, which it references)
+CREATE TABLE IF NOT EXISTS Feedback (
+    Feedback_ID INT PRIMARY KEY AUTO_INCREMENT,
+    Student_ID INT,
+    Rating INT,
+    Comments TEXT,
+    Trainer_ID INT,
+    Training_ID INT,
+    FOREIGN KEY (Student_ID) REFERENCES Student(Student_ID) ON DELETE CASCADE,
+    FOREIGN KEY (Trainer_ID) REFERENCES Trainer(Trainer_ID) ON DELETE CASCADE,
+    FOREIGN KEY (Training_ID) REFERENCES Training_Program(Training_ID) ON DELETE CASCADE
+);
+
+
 -- APPLICATION SET (WEAK ENTITY)
 CREATE TABLE IF NOT EXISTS Application (
     Application_ID INT PRIMARY KEY AUTO_INCREMENT,
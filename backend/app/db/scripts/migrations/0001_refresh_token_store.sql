@@ -0,0 +1,21 @@
+-- Refresh tokens keyed by SHA-256 hash instead of the raw token, grouped into rotation families
+-- Live legacy tokens are carried over (each as its own family); expired and revoked ones are dropped
+DROP TABLE IF EXISTS refresh_tokens_v2;
+
+CREATE TABLE refresh_tokens_v2 (
+    token_hash BINARY(32) PRIMARY KEY,
+    family_id BINARY(16) NOT NULL,
+    user_id INT NOT NULL,
+    role VARCHAR(20),
+    expiry_date DATETIME NOT NULL,
+    revoked BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO refresh_tokens_v2 (token_hash, family_id, user_id, expiry_date, revoked)
+SELECT UNHEX(SHA2(refresh_token, 256)), UNHEX(REPLACE(UUID(), '-', '')), user_id, expiry_date, FALSE
+FROM refresh_tokens
+WHERE revoked = FALSE AND expiry_date > UTC_TIMESTAMP();
+
+RENAME TABLE refresh_tokens TO refresh_tokens_legacy, refresh_tokens_v2 TO refresh_tokens;
+DROP TABLE refresh_tokens_legacy;
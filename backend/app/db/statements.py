@@ -0,0 +1,152 @@
+"""
+Server-side prepared statements for hot parameterised SELECTs, cached per pooled connection.
+
+    STUDENT_LOGIN = statement("student_login", "SELECT ... WHERE Student_ID = %s")
+    row = await db.fetchone_prepared(STUDENT_LOGIN, (student_id,))
+
+The first execution on a connection prepares the statement (COM_STMT_PREPARE); later
+executions on that connection only send the parameters (COM_STMT_EXECUTE), so MySQL does
+not parse and plan the query again. Prepared statements belong to the server session: a
+connection the pool replaces (recycled, failed ping) starts with an empty registry, and a
+registry notices when its connection reconnected and drops everything it had prepared.
+"""
+import collections
+import os
+import threading
+from typing import NamedTuple
+import mysql.connector
+
+# Statements kept prepared per connection; the least recently used is closed beyond this.
+# MySQL limits prepared statements server-wide (max_prepared_stmt_count).
+PREPARED_STATEMENTS_PER_CONNECTION = int(os.getenv("DB_PREPARED_STATEMENTS") or 32)
+
+
+class Statement(NamedTuple):
+    name: str
+    sql: str
+
+
+class StatementStats:
+    """
+    Executions per statement across all connections, and how many of them found the
+    statement already prepared.
+    """
+
+    def __init__(self):
+        # Updated from the database executor threads
+        self._lock = threading.Lock()
+        self._executions = collections.Counter()
+        self._prepares = collections.Counter()
+        self._evictions = 0
+        self._invalidations = 0
+
+    def executed(self, name, prepared):
+        with self._lock:
+            self._executions[name] += 1
+            if prepared:
+                self._prepares[name] += 1
+
+    def evicted(self):
+        with self._lock:
+            self._evictions += 1
+
+    def invalidated(self):
+        with self._lock:
+            self._invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            executions = sum(self._executions.values())
+            prepares = sum(self._prepares.values())
+            return {
+                "name": "prepared_statements",
+                "executions_total": executions,
+                "prepares_total": prepares,
+                "hit_rate": round(1 - prepares / executions, 4) if executions else None,
+                "evictions_total": self._evictions,
+                "invalidations_total": self._invalidations,
+                "statements": {
+                    name: {
+                        "executions": count,
+                        "prepares": self._prepares[name],
+                        "hit_rate": round(1 - self._prepares[name] / count, 4),
+                    }
+                    for name, count in self._executions.most_common()
+                },
+            }
+
+
+statement_stats = StatementStats()
+_statements = {}
+
+
+def statement(name, sql):
+    """
+    Register a hot query under a unique `name` (used in the hit-rate report).
+    `sql` must be a single SELECT with %s placeholders.
+    """
+    sql = " ".join(sql.split())
+    if name in _statements and _statements[name].sql != sql:
+        raise ValueError(f"Prepared statement {name!r} is already registered with other SQL")
+    _statements[name] = Statement(name, sql)
+    return _statements[name]
+
+
+class PreparedStatements:
+    """
+    The prepared cursors of one connection, one per statement, least recently used first.
+    Only used from the thread currently running a call for the connection's owner.
+    """
+
+    def __init__(self, connection, max_statements=PREPARED_STATEMENTS_PER_CONNECTION):
+        self.connection = connection
+        self.max_statements = max_statements
+        self.connection_id = connection.connection_id
+        self._cursors = collections.OrderedDict()
+
+    def _close(self, cursor):
+        try:
+            cursor.close()
+        except mysql.connector.Error:
+            pass
+
+    def _cursor(self, name):
+        """
+        (cursor, needs_prepare) for statement `name`.
+        """
+        if self.connection.connection_id != self.connection_id:
+            # A reconnect starts a new server session without our statements
+            self._cursors.clear()
+            self.connection_id = self.connection.connection_id
+            statement_stats.invalidated()
+        cursor = self._cursors.get(name)
+        if cursor is not None:
+            self._cursors.move_to_end(name)
+            return cursor, False
+        while len(self._cursors) >= self.max_statements:
+            _, evicted = self._cursors.popitem(last=False)
+            self._close(evicted)
+            statement_stats.evicted()
+        cursor = self._cursors[name] = self.connection.cursor(prepared=True)
+        return cursor, True
+
+    def fetchall(self, statement, params=()):
+        """
+        Execute `statement` with `params` and return all its rows. Blocking.
+        """
+        cursor, needs_prepare = self._cursor(statement.name)
+        try:
+            # Prepared cursors skip the prepare only when handed the very same str object
+            # as last time (an identity check), which statement.sql always is
+            cursor.execute(statement.sql, tuple(params))
+            rows = cursor.fetchall()
+        except mysql.connector.Error:
+            # Prepare again next time, in case the server no longer has the statement
+            self._cursors.pop(statement.name, None)
+            self._close(cursor)
+            raise
+        statement_stats.executed(statement.name, needs_prepare)
+        return rows
+
+    def __len__(self):
+        return len(self._cursors)
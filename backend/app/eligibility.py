@@ -0,0 +1,433 @@
+# Student-job eligibility matching over columnar NumPy snapshots
+import asyncio
+import datetime
+import math
+import os
+import re
+import time
+from typing import FrozenSet, NamedTuple, Optional, Tuple
+import numpy as np
+from db.connections import acquire_db
+
+# Seconds a snapshot of students and jobs is served before it is rebuilt in the background;
+# writes through this worker (registrations, new jobs) mark it stale right away
+ELIGIBILITY_REFRESH = float(os.getenv("ELIGIBILITY_REFRESH") or 300)
+# Seconds a stale snapshot waits for further writes before the rebuild starts, so a burst
+# of registrations costs one rebuild
+ELIGIBILITY_REBUILD_DELAY = float(os.getenv("ELIGIBILITY_REBUILD_DELAY") or 2)
+
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+_YEAR = re.compile(r"\b(?:19|20)\d{2}\b")
+_YEAR_RANGE = re.compile(r"\b((?:19|20)\d{2})\s*(?:-|–|to)\s*((?:19|20)\d{2})\b")
+_CGPA = re.compile(r"\b(?:c?gpa|cpi|pointer)\b")
+_STRICT = re.compile(r">(?!=)|\b(?:above|more than|greater than|over)\b")
+_INCLUSIVE = re.compile(r">=|=>|≥|\+|\b(?:and|or|&) above\b|\bat least\b|\bmin(?:imum)?\b")
+_BATCH = re.compile(r"\b(?:batch|graduat\w*|pass\s*outs?|passouts?|passing|class of|graduation year)\b")
+_DEPARTMENT_PREFIX = re.compile(r"^(?:departments?|dept\.?|branch(?:es)?|streams?|disciplines?)\s*(?::|-|=|\bin\b)?\s*", re.I)
+_DEPARTMENT_SEPARATOR = re.compile(r"\s*(?:,|/|\||;|\bor\b)\s*", re.I)
+_ONLY = re.compile(r"\s*\b(?:only|students?|branch(?:es)?|departments?)\b\s*$", re.I)
+_ACRONYM_SKIP = {"and", "of", "the", "in", "&"}
+
+
+def department_key(name):
+    return re.sub(r"[^0-9a-z]", "", name.lower())
+
+
+def department_aliases(name):
+    """
+    Keys a criterion may use for a department: its name without punctuation or spaces
+    and the initials of its words ("Computer Science and Engineering" -> "cse").
+    """
+    words = [w for w in re.findall(r"[0-9a-z&]+", name.lower()) if w not in _ACRONYM_SKIP]
+    keys = {department_key(name)}
+    if len(words) > 1:
+        keys.add("".join(w[0] for w in words))
+    return keys
+
+
+class Requirements(NamedTuple):
+    """
+    Constraints parsed from a job's eligibility criteria. None means unconstrained.
+    `unchecked` are criteria that cannot be evaluated from student data (e.g. "No backlogs")
+    and are left for the company to check.
+    """
+    min_cgpa: Optional[float] = None
+    departments: Optional[FrozenSet[str]] = None  # department names
+    years: Optional[FrozenSet[int]] = None
+    unchecked: Tuple[str, ...] = ()
+
+    def as_dict(self):
+        return {
+            "min_cgpa": self.min_cgpa,
+            "departments": None if self.departments is None else sorted(self.departments),
+            "graduation_years": None if self.years is None else sorted(self.years),
+            "unchecked": list(self.unchecked),
+        }
+
+
+def _parse_cgpa(text):
+    numbers = [float(n) for n in _NUMBER.findall(text) if float(n) <= 10]
+    if not numbers:
+        return None
+    minimum = numbers[0]
+    if _STRICT.search(text) and not _INCLUSIVE.search(text):
+        # CGPA is stored with two decimals, so "> 7" is ">= 7.01"
+        minimum = math.floor(minimum * 100 + 1) / 100
+    return minimum
+
+
+def _parse_years(text):
+    years = set()
+    for start, end in _YEAR_RANGE.findall(text):
+        years.update(range(int(start), int(end) + 1))
+    years.update(int(year) for year in _YEAR.findall(text))
+    return years
+
+
+def _parse_departments(text, aliases):
+    """
+    Department names listed in `text`, or None if it does not list departments. Without a
+    "Department:"-style prefix every listed item must be a known department.
+    """
+    prefixed = _DEPARTMENT_PREFIX.match(text)
+    body = _ONLY.sub("", text[prefixed.end():] if prefixed else text)
+    items = [item for item in _DEPARTMENT_SEPARATOR.split(body) if department_key(item)]
+    if not items:
+        return None
+    matched = [aliases.get(department_key(item)) for item in items]
+    if not prefixed and not all(matched):
+        return None
+    # Departments no student belongs to are kept as written and simply match nobody
+    return {name for item, names in zip(items, matched) for name in (names or {item})}
+
+
+def parse_requirements(criteria, aliases=None):
+    """
+    Parse free-text eligibility criteria into Requirements. `aliases` maps department
+    aliases (see department_aliases) to department names, so criteria like "CSE/IT only"
+    are recognised. Separate criteria all apply: the highest minimum CGPA wins and
+    department and year lists are intersected.
+    """
+    aliases = aliases or {}
+    min_cgpa, departments, years, unchecked = None, None, None, []
+
+    def narrow(current, values):
+        return frozenset(values) if current is None else current & frozenset(values)
+
+    for criterion in criteria:
+        text = criterion.strip().lower()
+        if not text:
+            continue
+        if _CGPA.search(text):
+            value = _parse_cgpa(text)
+            if value is not None:
+                min_cgpa = value if min_cgpa is None else max(min_cgpa, value)
+                continue
+        found_years = _parse_years(text)
+        if found_years and (_BATCH.search(text) or not _YEAR.sub("", _YEAR_RANGE.sub("", text)).strip(" ,/-&")):
+            years = narrow(years, found_years)
+            continue
+        found_departments = _parse_departments(criterion.strip(), aliases)
+        if found_departments is not None:
+            departments = narrow(departments, found_departments)
+            continue
+        unchecked.append(criterion.strip())
+    return Requirements(min_cgpa, departments, years, tuple(unchecked))
+
+
+class StudentTable:
+    """
+    Students as columns, sorted by (department, graduation year) cell and then by CGPA, so
+    every cell is a contiguous slice whose CGPA column is ascending. A minimum CGPA then
+    selects a suffix of each allowed cell with one binary search.
+    """
+
+    def __init__(self, rows):
+        # rows: (Student_ID, CGPA, Graduation_Year, Department)
+        names = {}
+        for row in rows:
+            if row[3]:
+                names.setdefault(department_key(row[3]), row[3].strip())
+        self.departments = sorted(names)
+        self.years = sorted({row[2] for row in rows if row[2] is not None})
+        self.department_codes = {key: code for code, key in enumerate(self.departments)}
+        self.year_codes = {year: code for code, year in enumerate(self.years)}
+        # The last code of each axis stands for NULL
+        self.shape = (len(self.departments) + 1, len(self.years) + 1)
+
+        count = len(rows)
+        ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=count)
+        cgpa = np.fromiter(
+            (-np.inf if row[1] is None else float(row[1]) for row in rows), dtype=np.float64, count=count
+        )
+        cells = np.fromiter((self.cell(row[3], row[2]) for row in rows), dtype=np.int64, count=count)
+
+        order = np.lexsort((cgpa, cells))
+        self.ids, self.cgpa, cells = ids[order], cgpa[order], cells[order]
+        self.cell_starts = np.searchsorted(cells, np.arange(self.shape[0] * self.shape[1] + 1))
+        self.id_order = np.argsort(self.ids)
+
+        # Criterion alias -> department names, e.g. "cse" -> {"Computer Science and Engineering"}
+        self.aliases = {}
+        for name in names.values():
+            for alias in department_aliases(name):
+                self.aliases.setdefault(alias, set()).add(name)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def cell(self, department, year):
+        department_code = self.department_codes.get(department_key(department) if department else None, self.shape[0] - 1)
+        year_code = self.year_codes.get(year, self.shape[1] - 1)
+        return department_code * self.shape[1] + year_code
+
+    def locate(self, student_id):
+        """
+        Position of a student in the table, or None.
+        """
+        i = np.searchsorted(self.ids, student_id, sorter=self.id_order)
+        if i < len(self.ids) and self.ids[self.id_order[i]] == student_id:
+            return int(self.id_order[i])
+        return None
+
+    def allowed_cells(self, requirements):
+        """
+        Boolean mask over cells for a job's department and year constraints.
+        """
+        departments = np.ones(self.shape[0], dtype=bool)
+        if requirements.departments is not None:
+            departments[:] = False
+            codes = (self.department_codes.get(department_key(name)) for name in requirements.departments)
+            departments[[code for code in codes if code is not None]] = True
+        years = np.ones(self.shape[1], dtype=bool)
+        if requirements.years is not None:
+            years[:] = False
+            years[[self.year_codes[year] for year in requirements.years if year in self.year_codes]] = True
+        return np.outer(departments, years).ravel()
+
+    def eligible(self, requirements):
+        """
+        Positions of the students meeting `requirements`.
+        """
+        cells = np.flatnonzero(self.allowed_cells(requirements))
+        if not len(cells):
+            return np.empty(0, dtype=np.int64)
+        starts, ends = self.cell_starts[cells], self.cell_starts[cells + 1]
+        if requirements.min_cgpa is not None:
+            starts = np.array([
+                start + np.searchsorted(self.cgpa[start:end], requirements.min_cgpa)
+                for start, end in zip(starts, ends)
+            ], dtype=np.int64)
+        return np.concatenate([np.arange(start, end) for start, end in zip(starts, ends)])
+
+
+class JobTable:
+    """
+    Parsed requirements of every job as columns aligned with a StudentTable's cells:
+    minimum CGPA per job and a jobs x cells mask of allowed (department, year) cells.
+    """
+
+    def __init__(self, jobs, students):
+        # jobs: {Job_ID: (Company_ID, Application_Deadline, [criteria])}
+        self.ids = np.fromiter(jobs, dtype=np.int64, count=len(jobs))
+        self.company_ids = {}
+        self.requirements = {}
+        count = len(jobs)
+        self.min_cgpa = np.full(count, -np.inf)
+        self.deadlines = np.empty(count, dtype="datetime64[D]")
+        self.allowed = np.empty((count, students.shape[0] * students.shape[1]), dtype=bool)
+        self.positions = {}
+
+        compiled = {}  # jobs with the same criteria share their parse and cell mask
+        for i, (job_id, (company_id, deadline, criteria)) in enumerate(jobs.items()):
+            key = tuple(sorted(criteria))
+            if key not in compiled:
+                requirements = parse_requirements(criteria, students.aliases)
+                compiled[key] = (requirements, students.allowed_cells(requirements))
+            requirements, allowed = compiled[key]
+            self.positions[job_id] = i
+            self.company_ids[job_id] = company_id
+            self.requirements[job_id] = requirements
+            if requirements.min_cgpa is not None:
+                self.min_cgpa[i] = requirements.min_cgpa
+            self.deadlines[i] = deadline
+            self.allowed[i] = allowed
+
+    def __len__(self):
+        return len(self.ids)
+
+    def eligible_for(self, cgpa, cell, today):
+        """
+        IDs of the jobs open on `today` that a student with `cgpa` in `cell` qualifies for,
+        in one pass over all jobs.
+        """
+        mask = self.allowed[:, cell] & (self.min_cgpa <= cgpa) & (self.deadlines >= np.datetime64(today))
+        return self.ids[mask]
+
+    def pool_sizes(self, students):
+        """
+        Number of eligible students for every job: per (department, year) cell, one
+        vectorised binary search of all jobs' minimum CGPA into the cell's sorted CGPAs.
+        """
+        sizes = np.zeros(len(self.ids), dtype=np.int64)
+        for cell in np.flatnonzero(self.allowed.any(axis=0)):
+            start, end = students.cell_starts[cell], students.cell_starts[cell + 1]
+            if start == end:
+                continue
+            below = np.searchsorted(students.cgpa[start:end], self.min_cgpa)
+            sizes += np.where(self.allowed[:, cell], (end - start) - below, 0)
+        return sizes
+
+
+class EligibilityEngine:
+    """
+    Snapshot of all students and jobs, loaded on first use and rebuilt in the background
+    once it is older than `refresh` seconds, or `rebuild_delay` seconds after invalidate().
+    Lookups keep using the current snapshot while a rebuild runs.
+    """
+
+    def __init__(self, refresh=300, rebuild_delay=2, clock=time.monotonic):
+        self.refresh = refresh
+        self.rebuild_delay = rebuild_delay
+        self.clock = clock
+        self.students = None
+        self.jobs = None
+        self.loaded_at = None
+        self.stale = False
+        self._lock = asyncio.Lock()
+        self._rebuild = None
+        self._pending = None  # TimerHandle of the debounced rebuild
+
+    @staticmethod
+    def build(student_rows, job_rows):
+        """
+        (StudentTable, JobTable) from Student rows and (Job_ID, Company_ID,
+        Application_Deadline, Eligibility_Criterion) rows, one per criterion.
+        """
+        students = StudentTable(student_rows)
+        jobs = {}
+        for job_id, company_id, deadline, criterion in job_rows:
+            job = jobs.setdefault(job_id, (company_id, deadline, []))
+            if criterion is not None:
+                job[2].append(criterion)
+        return students, JobTable(jobs, students)
+
+    async def _reload(self):
+        db = await acquire_db()
+        cursor = db.cursor()
+        try:
+            await cursor.execute("SELECT Student_ID, CGPA, Graduation_Year, Department FROM Student")
+            student_rows = await cursor.fetchall()
+            await cursor.execute("""
+                SELECT j.Job_ID, j.Company_ID, j.Application_Deadline, je.Eligibility_Criterion
+                FROM Job j
+                LEFT JOIN Job_Eligibility je ON je.Job_ID = j.Job_ID
+            """)
+            job_rows = await cursor.fetchall()
+        finally:
+            await cursor.close()
+            await db.close()
+        # Parsing and array building are CPU work; keep them off the event loop
+        self.students, self.jobs = await asyncio.get_running_loop().run_in_executor(
+            None, self.build, student_rows, job_rows
+        )
+        self.loaded_at = self.clock()
+
+    def _start_rebuild(self):
+        # Writes from here on may be missed by this rebuild and mark the snapshot stale again
+        self.stale = False
+        self._rebuild = asyncio.ensure_future(self._reload())
+        self._rebuild.add_done_callback(self._rebuild_done)
+
+    def _rebuild_done(self, task):
+        self._rebuild = None
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Eligibility snapshot rebuild failed: {task.exception()}")
+            self.stale = True
+        if self.stale:
+            self._schedule()
+
+    def _schedule(self):
+        if self._pending is None:
+            self._pending = asyncio.get_running_loop().call_later(self.rebuild_delay, self._debounced)
+
+    def _debounced(self):
+        self._pending = None
+        # A running rebuild schedules the next one when it finishes
+        if self._rebuild is None:
+            self._start_rebuild()
+
+    def invalidate(self):
+        """
+        Rebuild in the background shortly, e.g. after students or jobs were added.
+        Lookups are served from the current snapshot until then.
+        """
+        self.stale = True
+        if self.loaded_at is not None:
+            self._schedule()
+
+    async def ensure_ready(self):
+        if self.loaded_at is None:
+            async with self._lock:
+                if self.loaded_at is None:
+                    self.stale = False
+                    await self._reload()
+                    if self.stale:
+                        self._schedule()
+        elif self.clock() - self.loaded_at > self.refresh and self._rebuild is None:
+            self._start_rebuild()
+
+    async def catch_up(self):
+        """
+        Wait until the snapshot includes the writes made so far, starting a pending rebuild
+        right away. Used before reporting an id missing that may be newer than the snapshot.
+        Returns whether a rebuild was waited for.
+        """
+        waited = False
+        # At most the running rebuild, which may predate the writes, and one after it
+        for _ in range(2):
+            if self._pending is not None:
+                self._pending.cancel()
+                self._pending = None
+                if self._rebuild is None:
+                    self._start_rebuild()
+            if self._rebuild is None:
+                break
+            await asyncio.shield(self._rebuild)
+            waited = True
+        return waited
+
+    def eligible_jobs(self, student_id, today=None):
+        """
+        IDs of open jobs the student qualifies for, or None for an unknown student.
+        """
+        students = self.students
+        position = students.locate(student_id)
+        if position is None:
+            return None
+        cell = int(np.searchsorted(students.cell_starts, position, side="right") - 1)
+        return self.jobs.eligible_for(students.cgpa[position], cell, today or datetime.date.today()).tolist()
+
+    def eligible_students(self, job_id):
+        """
+        (Requirements, Student_IDs best CGPA first) for a job, or None for an unknown job.
+        """
+        requirements = self.jobs.requirements.get(job_id)
+        if requirements is None:
+            return None
+        students = self.students
+        positions = students.eligible(requirements)
+        # Stable sort keeps equal CGPAs in cell order
+        positions = positions[np.argsort(-students.cgpa[positions], kind="stable")]
+        return requirements, students.ids[positions].tolist()
+
+    def stats(self):
+        return {
+            "name": "eligibility",
+            "students": 0 if self.students is None else len(self.students),
+            "jobs": 0 if self.jobs is None else len(self.jobs),
+            "age_seconds": None if self.loaded_at is None else round(self.clock() - self.loaded_at, 1),
+        }
+
+
+eligibility_engine = EligibilityEngine(refresh=ELIGIBILITY_REFRESH, rebuild_delay=ELIGIBILITY_REBUILD_DELAY)
@@ -0,0 +1,85 @@
+# Streaming NDJSON / CSV exports
+import csv
+import io
+import os
+from typing import Literal
+from fastapi import Query
+from fastapi.responses import StreamingResponse
+from db.connections import acquire_read_db
+from serialization import dumps
+
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE") or 1000)
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def encode_ndjson(columns, rows):
+    return b"".join(dumps(dict(zip(columns, row))) + b"\n" for row in rows)
+
+
+def encode_csv(rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def export_format(fmt: ExportFormat = Query("ndjson", alias="format", description="ndjson or csv")):
+    return fmt
+
+
+def build_export_query(paginator, select, from_clause, filter_values):
+    """
+    The unpaginated version of a list endpoint's query: same columns and whitelisted
+    filters, ordered by the paginator's tiebreaker.
+    """
+    conditions, args = paginator.filter_conditions(filter_values)
+    query = f"{select} {from_clause}"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += f" ORDER BY {paginator.tiebreaker}"
+    return query, args
+
+
+async def stream_export(query, fmt, filename, args=()):
+    """
+    Stream the result of `query` as NDJSON or CSV, keyed by the query's column names.
+
+    Rows are read from an unbuffered (server-side) cursor EXPORT_CHUNK_SIZE at a time and
+    encoded chunk by chunk, so memory stays flat regardless of table size. The connection
+    is owned by the response body: it is checked out here, so a busy pool still answers 503,
+    and returned once the last chunk is sent. An abandoned download discards it instead of
+    draining the remaining rows.
+    """
+    db = await acquire_read_db()
+
+    async def body():
+        cursor = db.cursor()
+        completed = False
+        try:
+            await cursor.execute(query, args)
+            columns = [column[0] for column in cursor.description]
+            if fmt == "csv":
+                yield encode_csv([columns])
+            while True:
+                rows = await cursor.fetchmany(EXPORT_CHUNK_SIZE)
+                if not rows:
+                    break
+                yield encode_ndjson(columns, rows) if fmt == "ndjson" else encode_csv(rows)
+            completed = True
+        finally:
+            if completed:
+                await cursor.close()
+                await db.close()
+            else:
+                await db.discard()
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
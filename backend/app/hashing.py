@@ -0,0 +1,172 @@
+# Password hashing service
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+import bcrypt
+from fastapi import HTTPException
+
+# bcrypt cost factor for new hashes; existing hashes with another cost are upgraded on login
+PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS") or 12)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS") or os.cpu_count() or 1)
+# Hash/verify calls allowed in flight (running or queued) before callers get a 503
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE") or PASSWORD_HASH_WORKERS * 8)
+# Cost factor for bulk onboarding; a lower value is upgraded to PASSWORD_HASH_ROUNDS on first login
+PASSWORD_HASH_BULK_ROUNDS = int(os.getenv("PASSWORD_HASH_BULK_ROUNDS") or PASSWORD_HASH_ROUNDS)
+# Passwords hashed per worker round trip by hash_many()
+PASSWORD_HASH_BULK_CHUNK = int(os.getenv("PASSWORD_HASH_BULK_CHUNK") or 8)
+
+
+def _to_bytes(value):
+    if isinstance(value, str):
+        return value.encode("utf-8")
+    return bytes(value)
+
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+
+
+def _hash_many(passwords, rounds):
+    return [_hash(password, rounds) for password in passwords]
+
+
+def _verify(password, password_hash):
+    try:
+        return bcrypt.checkpw(password, password_hash)
+    except ValueError:
+        # Not a bcrypt hash
+        return False
+
+
+def _verify_and_rehash(password, password_hash, rounds):
+    if not _verify(password, password_hash):
+        return False, None
+    if hash_rounds(password_hash) != rounds:
+        return True, _hash(password, rounds)
+    return True, None
+
+
+def hash_rounds(password_hash):
+    """
+    Cost factor of a bcrypt hash ($2b$<rounds>$...), or None if it cannot be read.
+    """
+    try:
+        return int(_to_bytes(password_hash).split(b"$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a bounded process pool so hashing uses every core and never blocks the event loop.
+
+    At most `max_queue` calls may be running or waiting for a worker; beyond that callers get a
+    503 straight away instead of queueing behind seconds of CPU work.
+    """
+
+    def __init__(self, rounds=12, workers=1, max_queue=8, bulk_rounds=None, bulk_chunk=8):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_queue = max_queue
+        self.bulk_rounds = bulk_rounds or rounds
+        self.bulk_chunk = bulk_chunk
+        self._executor = None
+        self._pending = 0
+        self._rejected = 0
+
+    def _get_executor(self):
+        # Started on first use; spawned workers do not inherit the server's threads or sockets
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def _submit(self, func, *args):
+        if self._pending >= self.max_queue:
+            self._rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Too many password checks in progress, please retry",
+                headers={"Retry-After": "1"},
+            )
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password):
+        """
+        Hash `password` with the configured cost factor.
+        """
+        return await self._submit(_hash, _to_bytes(password), self.rounds)
+
+    async def hash_many(self, passwords):
+        """
+        Hash a batch of passwords with the bulk cost factor, in order, on every worker.
+
+        Passwords go to the workers in small chunks with at most one chunk per worker in
+        flight, so a login arriving mid-batch waits for one chunk rather than the whole
+        batch. Bulk work does not count against `max_queue`.
+        """
+        chunks = [
+            [_to_bytes(password) for password in passwords[i:i + self.bulk_chunk]]
+            for i in range(0, len(passwords), self.bulk_chunk)
+        ]
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        slots = asyncio.Semaphore(self.workers)
+
+        async def run(chunk):
+            async with slots:
+                return await loop.run_in_executor(executor, _hash_many, chunk, self.bulk_rounds)
+
+        results = await asyncio.gather(*(run(chunk) for chunk in chunks))
+        return [password_hash for chunk in results for password_hash in chunk]
+
+    async def verify(self, password, password_hash):
+        """
+        Check `password` against a stored bcrypt hash.
+        """
+        return await self._submit(_verify, _to_bytes(password), _to_bytes(password_hash))
+
+    def needs_rehash(self, password_hash):
+        return hash_rounds(password_hash) != self.rounds
+
+    async def verify_and_update(self, password, password_hash):
+        """
+        Check `password` and, if it matches a hash made with a different cost factor,
+        rehash it in the same worker round trip.
+        Returns (valid, new_hash); new_hash is None when the stored hash is current.
+        """
+        return await self._submit(
+            _verify_and_rehash, _to_bytes(password), _to_bytes(password_hash), self.rounds
+        )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self):
+        return {
+            "rounds": self.rounds,
+            "bulk_rounds": self.bulk_rounds,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "pending": self._pending,
+            "rejected_total": self._rejected,
+        }
+
+
+hasher = PasswordHasher(
+    rounds=PASSWORD_HASH_ROUNDS,
+    workers=PASSWORD_HASH_WORKERS,
+    max_queue=PASSWORD_HASH_MAX_QUEUE,
+    bulk_rounds=PASSWORD_HASH_BULK_ROUNDS,
+    bulk_chunk=PASSWORD_HASH_BULK_CHUNK,
+)
@@ -1,11 +1,22 @@
+import asyncio
 from fastapi import FastAPI, HTTPException, Depends, Body
 from pydantic import BaseModel, Field
 import mysql.connector
-import datetime
-from utils import create_access_token, generate_refresh_token
 from fastapi.middleware.cors import CORSMiddleware
-
-from db.connections import get_db
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from auth import issue_access_token, require_metrics_access, token_cache
+from db.connections import AsyncConnection, acquire_db, get_db, pool, recent_writers, replicas
+from db.instrumentation import slow_queries
+from db.replicas import ReadYourWritesMiddleware
+from db.statements import statement_stats
+from hashing import hasher
+from metrics import MetricsMiddleware, registry
+from cache import admin_stats_cache
+from token_store import token_store
+from search import job_index
+from eligibility import eligibility_engine
+from pagination import NEXT_CURSOR_HEADER
 from models.student import StudentLogin
 from models.admin import AdminLogin
 from models.company import CompanyLogin
@@ -28,8 +39,12 @@ async def lifespan(app: FastAPI):
         setup_database()
     except Exception as e:
         print(f"Warning: Database setup failed: {e}")    
+    purger = asyncio.create_task(token_store.run_purger())
     yield
-    pass
+    purger.cancel()
+    await pool.dispose()
+    await replicas.dispose()
+    hasher.shutdown()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -41,8 +56,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Keeps a user's reads on the primary right after they wrote; only needed with replicas
+if replicas:
+    app.add_middleware(ReadYourWritesMiddleware, writers=recent_writers)
+
+# Added last so it is outermost and times the other middleware too
+app.add_middleware(MetricsMiddleware)
+
 
 app.include_router(students_router, prefix="/students")
 app.include_router(company_router, prefix="/companies")
@@ -57,122 +80,173 @@ def read_root():
     return {"message": "Welcome to the FastAPI application!"}
 
 
+@app.get("/health")
+async def health():
+    """
+    Liveness check: 200 if the primary database answers a ping, 503 otherwise.
+    """
+    try:
+        db = await acquire_db()
+    except HTTPException:
+        return JSONResponse({"status": "unavailable"}, status_code=503)
+    cursor = db.cursor()
+    try:
+        await cursor.execute("SELECT 1")
+        await cursor.fetchall()
+    except mysql.connector.Error:
+        return JSONResponse({"status": "unavailable"}, status_code=503)
+    finally:
+        await cursor.close()
+        await db.close()
+    return {"status": "ok"}
+
+
+@app.get("/health/details", dependencies=[Depends(require_metrics_access)])
+async def health_details():
+    """
+    Report the live connection pool counters (in use, idle, waiters, wait time),
+    read replica lag, the password hashing queue and the in-process caches.
+    Needs METRICS_TOKEN or an admin's token.
+    """
+    return {
+        "status": "ok",
+        "pool": pool.stats(),
+        "read_replicas": dict(replicas.stats(), read_your_writes=recent_writers.stats()),
+        "prepared_statements": statement_stats.stats(),
+        "hashing": hasher.stats(),
+        "caches": [admin_stats_cache.stats(), token_cache.stats()],
+        "refresh_tokens": token_store.stats(),
+        "job_search": job_index.stats(),
+        "eligibility": eligibility_engine.stats(),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse, dependencies=[Depends(require_metrics_access)])
+async def metrics():
+    """
+    HTTP request and per-query database latencies, rows and errors, and connection pool
+    gauges, in the Prometheus text format. Needs METRICS_TOKEN or an admin's token.
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/metrics/slow_queries", dependencies=[Depends(require_metrics_access)])
+async def recent_slow_queries():
+    """
+    The latest statements slower than DB_SLOW_QUERY_SECONDS, newest last (SQL only, no parameters).
+    Needs METRICS_TOKEN or an admin's token.
+    """
+    return {"slow_queries": slow_queries.recent()}
+
+
 class GenericLogin(BaseModel):
     role: str = Field(..., description="Role of the user (e.g., 'student', 'company', 'admin')")
     id: int = Field(..., gt=0, alias="user_id")
     password: str
 
 @app.post("/login")
-async def login_user(user_data: GenericLogin, db: mysql.connector.MySQLConnection = Depends(get_db)):
+async def login_user(user_data: GenericLogin, db: AsyncConnection = Depends(get_db)):
     """
     Login a user (student, company, or admin) using their email and password.
+    Returns an access token and a refresh token that starts a new token family.
     """
     role = user_data.role.lower()
     if role == "student":
         # Call the student login function
         student_login_data = StudentLogin(user_id=user_data.id, password=user_data.password)
-        return await login_student(student_login_data, db)
+        result = await login_student(student_login_data, db)
     elif role == "company":
         # Call the company login function
         company_login_data = CompanyLogin(user_id=user_data.id, password=user_data.password)
-        return await login_company(company_login_data, db)
+        result = await login_company(company_login_data, db)
     elif role == "admin":
         # Call the admin login function
         admin_login_data = AdminLogin(user_id=user_data.id, password=user_data.password)
-        return await login_admin(admin_login_data, db)
+        result = await login_admin(admin_login_data, db)
     else:
         raise HTTPException(
             status_code=400,
             detail="Invalid role. Please specify 'student', 'company', or 'admin'."
         )
 
+    # The login functions return their connection to the pool, so issue on a fresh one
+    token_db = await acquire_db()
+    try:
+        result["refresh_token"] = await token_store.issue(token_db, user_data.id, role)
+        await token_db.commit()
+    except mysql.connector.Error as e:
+        await token_db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error: {e}")
+    finally:
+        await token_db.close()
+    return result
+
 
 @app.post("/refresh")  # Use POST request
 async def refresh_token(
     refresh_token: str = Body(...),  # Get the refresh token from the request body
-    db: mysql.connector.MySQLConnection = Depends(get_db),
+    db: AsyncConnection = Depends(get_db),
 ):
     """
     Refresh an access token using a refresh token.
+    The refresh token is rotated: the old one is revoked and a new one in the same family is returned.
     """
     try:
-        cursor = db.cursor()
-
-        # Verify the refresh token (check if it exists, is valid, and hasn't been revoked)
-        query = """
-            SELECT user_id FROM refresh_tokens
-            WHERE refresh_token = %s AND expiry_date > NOW() AND revoked = FALSE
-        """
-        cursor.execute(query, (refresh_token,))
-        result = cursor.fetchone()
-
-        if not result:
-            raise HTTPException(status_code=401, detail="Invalid refresh token")
-
-        user_id = result[0]
-
-        # Generate a new access token
-        access_token_expires = datetime.timedelta(minutes=30)
-        access_token = create_access_token(data={"sub": str(user_id)}, expires_delta=access_token_expires)
+        new_refresh_token, user_id, role = await token_store.rotate(db, refresh_token)
 
-        # (Optional) Generate a new refresh token and revoke the old one (refresh token rotation)
-        new_refresh_token = generate_refresh_token()
-
-        # Revoke the old refresh token
-        query_revoke = """
-            UPDATE refresh_tokens SET revoked = TRUE WHERE refresh_token = %s
-        """
-        cursor.execute(query_revoke, (refresh_token,))
-
-        # Store the new refresh token
-        expiry_date = datetime.datetime.utcnow() + datetime.timedelta(days=30)  # Example expiry date
-        query_insert = """
-            INSERT INTO refresh_tokens (refresh_token, user_id, expiry_date, revoked)
-            VALUES (%s, %s, %s, FALSE)
-        """
-        cursor.execute(query_insert, (new_refresh_token, user_id, expiry_date))
-
-        db.commit()
+        # Generate a new access token carrying the same role as the login that started the family
+        access_token = issue_access_token(user_id, role)
 
         return {"access_token": access_token, "token_type": "bearer", "refresh_token": new_refresh_token}
 
     except mysql.connector.Error as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
-        if cursor:
-            cursor.close()
         if db:
-            db.close()
+            await db.close()
 
 
 @app.post("/logout")  # Use POST request
 async def logout(
     refresh_token: str = Body(...),  # Get the refresh token from the request body
-    db: mysql.connector.MySQLConnection = Depends(get_db),
+    db: AsyncConnection = Depends(get_db),
 ):
     """
     Logout the user by revoking the refresh token.
     """
     try:
-        cursor = db.cursor()
-        query = """
-            UPDATE refresh_tokens SET revoked = TRUE WHERE refresh_token = %s
-        """
-        cursor.execute(query, (refresh_token,))
-
-        if cursor.rowcount == 0:
+        if not await token_store.revoke(db, refresh_token):
             raise HTTPException(status_code=404, detail="Refresh token not found")
 
-        db.commit()
-
         return {"message": "Logged out successfully"}
 
     except mysql.connector.Error as e:
-        db.rollback()
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error: {e}")
+    finally:
+        if db:
+            await db.close()
+
+
+@app.post("/logout_all")  # Use POST request
+async def logout_all(
+    refresh_token: str = Body(...),  # Any live refresh token of the user
+    db: AsyncConnection = Depends(get_db),
+):
+    """
+    Logout the user everywhere by revoking every refresh token they hold.
+    """
+    try:
+        revoked = await token_store.revoke_user(db, refresh_token)
+        if revoked is None:
+            raise HTTPException(status_code=401, detail="Invalid refresh token")
+
+        return {"message": "Logged out of all sessions", "sessions_revoked": revoked}
+
+    except mysql.connector.Error as e:
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
-        if cursor:
-            cursor.close()
         if db:
-            db.close()
\ No newline at end of file
+            await db.close()
@@ -1,7 +1,7 @@
 # Models for Job
 from pydantic import BaseModel, Field
 from datetime import date
-from typing import List
+from typing import List, Optional
 
 class JobResponse(BaseModel):
     Job_ID: int
@@ -18,6 +18,32 @@ class JobResponse(BaseModel):
 class JobListResponse(BaseModel):
     jobs: List[JobResponse]
 
+class JobSearchResult(JobResponse):
+    score: float
+
+class JobSearchResponse(BaseModel):
+    query: str
+    jobs: List[JobSearchResult]
+
+class EligibilityRequirements(BaseModel):
+    min_cgpa: Optional[float] = None
+    departments: Optional[List[str]] = None
+    graduation_years: Optional[List[int]] = None
+    unchecked: List[str]
+
+class EligibleStudent(BaseModel):
+    Student_ID: int
+    Name: str
+    CGPA: Optional[float] = None
+    Department: Optional[str] = None
+    Graduation_Year: Optional[int] = None
+
+class EligibleStudentsResponse(BaseModel):
+    job_id: int
+    requirements: EligibilityRequirements
+    total: int
+    students: List[EligibleStudent]
+
 class JobByCompanyResponse(BaseModel):
     Job_ID: int
     Job_Title: str
@@ -38,4 +64,4 @@ class JobCreate(BaseModel):
     Salary: float = Field(..., alias="salary")
     Job_Description: str = Field(..., alias="description")
     Eligibility_Criteria_List: List[str] = Field(..., alias="eligibility")
-    Company_ID: int = Field(..., alias="company_id")
\ No newline at end of file
+    Company_ID: Optional[int] = Field(None, alias="company_id")
\ No newline at end of file
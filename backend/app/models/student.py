@@ -31,7 +31,7 @@ class StudentListResponse(BaseModel):
 
 class JobApplication(BaseModel):
     job_id: int = Field(..., alias="jobId")
-    student_id: int = Field(..., alias="universalId")
+    student_id: Optional[int] = Field(None, alias="universalId")
 
 class StudentApplicationResponse(BaseModel):
     application_id: int = Field(..., alias="applicationId")
@@ -47,7 +47,7 @@ class StudentApplicationListResponse(BaseModel):
 class EnrollStudent(BaseModel):
     trainingId: int
     studentName: str
-    studentId: int
+    studentId: Optional[int] = None
     studentEmail: EmailStr
     paymentMethod: str
     department: str
\ No newline at end of file
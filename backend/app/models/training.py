@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, EmailStr
 from datetime import date
+from typing import Optional
 
 class TrainerRegistration(BaseModel):
     trainer_id: int = Field(..., gt=0, alias="trainerId")
@@ -29,4 +30,4 @@ class CreateTrainingProgram(BaseModel):
     mode: str = Field(..., alias="mode")
     certification_provided: bool = Field(..., alias="certificationProvided")
     cost: float = Field(..., alias="cost")
-    admin_id: int = Field(..., alias="universal_id")
\ No newline at end of file
+    admin_id: Optional[int] = Field(None, alias="universal_id")
\ No newline at end of file
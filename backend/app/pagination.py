@@ -0,0 +1,222 @@
+# Keyset pagination shared by the list endpoints
+import base64
+import datetime
+import decimal
+import hashlib
+import json
+from typing import Literal, Optional
+from fastapi import HTTPException, Query, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageParams:
+    """
+    Query parameters common to every paginated list endpoint.
+    """
+
+    def __init__(
+        self,
+        limit: int = Query(100, ge=1, le=1000, description="Maximum number of items to return"),
+        cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+        sort: Optional[str] = Query(None, description="Sort key"),
+        order: Literal["asc", "desc"] = Query("asc", description="Sort direction"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.sort = sort
+        self.order = order
+
+
+class Filter:
+    """
+    A whitelisted filter: the SQL expression it applies to and the comparison used.
+    """
+
+    def __init__(self, column, op="="):
+        self.column = column
+        self.op = op
+
+
+def _encode_value(value):
+    # Keep Decimal and date sort keys typed so keyset comparisons stay index-friendly
+    if isinstance(value, decimal.Decimal):
+        return {"$dec": str(value)}
+    if isinstance(value, datetime.datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"$date": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if "$dec" in value:
+            return decimal.Decimal(value["$dec"])
+        if "$dt" in value:
+            return datetime.datetime.fromisoformat(value["$dt"])
+        if "$date" in value:
+            return datetime.date.fromisoformat(value["$date"])
+        raise ValueError("unknown cursor value")
+    return value
+
+
+def encode_cursor(payload):
+    payload = dict(payload, k=[_encode_value(value) for value in payload["k"]])
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token):
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, dict) or len(payload.get("k", ())) != 2:
+            raise ValueError("malformed cursor")
+        payload["k"] = [_decode_value(value) for value in payload["k"]]
+        return payload
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+class PageQuery:
+    """
+    One page's SQL and arguments, plus what is needed to build the next cursor.
+    """
+
+    def __init__(self, sql, args, sort, order, fingerprint, limit):
+        self.sql = sql
+        self.args = args
+        self.sort = sort
+        self.order = order
+        self.fingerprint = fingerprint
+        self.limit = limit
+
+    def paginate(self, rows, response: Response = None):
+        """
+        Trim the extra look-ahead row, strip the helper columns and, if there is a next
+        page, set its cursor on the X-Next-Cursor response header.
+        Returns (rows, next_cursor).
+        """
+        next_cursor = None
+        if len(rows) > self.limit:
+            rows = rows[:self.limit]
+            last = rows[-1]
+            if isinstance(last, dict):
+                key = [last["_sort_key"], last["_tiebreak"]]
+            else:
+                key = [last[-2], last[-1]]
+            next_cursor = encode_cursor({"s": self.sort, "o": self.order, "f": self.fingerprint, "k": key})
+
+        stripped = []
+        for row in rows:
+            if isinstance(row, dict):
+                row = {k: v for k, v in row.items() if k not in ("_sort_key", "_tiebreak")}
+            else:
+                row = row[:-2]
+            stripped.append(row)
+
+        if response is not None and next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return stripped, next_cursor
+
+    @staticmethod
+    def description(description):
+        """
+        The cursor description of the rows paginate() returns, without the helper columns.
+        """
+        return description[:-2]
+
+
+class KeysetPaginator:
+    """
+    Builds keyset-paginated queries for one list endpoint.
+
+    `sorts` maps public sort keys to SQL expressions, `tiebreaker` is a unique column
+    (usually the primary key) appended to every ordering so pages are stable, and
+    `filters` maps public filter names to Filter objects. Anything not listed is rejected.
+    """
+
+    def __init__(self, sorts, tiebreaker, filters=None, default_sort=None):
+        self.sorts = sorts
+        self.tiebreaker = tiebreaker
+        self.filters = filters or {}
+        self.default_sort = default_sort or next(iter(sorts))
+
+    def _fingerprint(self, filter_values):
+        active = sorted((name, str(value)) for name, value in filter_values.items() if value is not None)
+        return hashlib.sha1(json.dumps(active).encode("utf-8")).hexdigest()[:12]
+
+    def _keyset_condition(self, column, descending, last_value, last_tiebreak):
+        """
+        Rows strictly after (last_value, last_tiebreak) in the requested order.
+        MySQL sorts NULLs first ascending and last descending, so NULL sort values are handled explicitly.
+        """
+        cmp = "<" if descending else ">"
+        tb = self.tiebreaker
+        if last_value is None:
+            condition = f"({column} IS NULL AND {tb} {cmp} %s)"
+            args = [last_tiebreak]
+            if not descending:
+                condition = f"({condition} OR {column} IS NOT NULL)"
+            return condition, args
+        condition = f"({column} {cmp} %s OR ({column} = %s AND {tb} {cmp} %s)"
+        if descending:
+            condition += f" OR {column} IS NULL"
+        condition += ")"
+        return condition, [last_value, last_value, last_tiebreak]
+
+    def filter_conditions(self, filter_values, where=None):
+        """
+        WHERE conditions and arguments for the active (non-None) filters, after `where`.
+        """
+        conditions = list(where or [])
+        args = []
+        for name, value in filter_values.items():
+            if value is None:
+                continue
+            if name not in self.filters:
+                raise ValueError(f"Filter '{name}' is not whitelisted")
+            flt = self.filters[name]
+            conditions.append(f"{flt.column} {flt.op} %s")
+            args.append(value)
+        return conditions, args
+
+    def build(self, select, from_clause, page, filter_values=None, where=None):
+        """
+        Return the PageQuery for one page.
+
+        `select` is the SELECT list, `from_clause` the FROM/JOIN part, `where` optional fixed
+        conditions. Two helper columns carrying the sort key are appended to every row;
+        PageQuery.paginate() strips them again.
+        """
+        filter_values = filter_values or {}
+        sort, order = page.sort or self.default_sort, page.order
+        last = None
+        if page.cursor:
+            payload = decode_cursor(page.cursor)
+            if payload.get("f") != self._fingerprint(filter_values):
+                raise HTTPException(status_code=400, detail="Pagination cursor does not match the current filters")
+            sort, order, last = payload.get("s"), payload.get("o"), payload["k"]
+        if sort not in self.sorts:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid sort key '{sort}'. Allowed: {', '.join(self.sorts)}",
+            )
+        column = self.sorts[sort]
+        descending = order == "desc"
+
+        conditions, args = self.filter_conditions(filter_values, where)
+        if last is not None:
+            condition, keyset_args = self._keyset_condition(column, descending, last[0], last[1])
+            conditions.append(condition)
+            args.extend(keyset_args)
+
+        direction = "DESC" if descending else "ASC"
+        sql = f"{select}, {column} AS _sort_key, {self.tiebreaker} AS _tiebreak {from_clause}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY {column} {direction}, {self.tiebreaker} {direction} LIMIT %s"
+        args.append(page.limit + 1)
+
+        return PageQuery(sql, args, sort, order, self._fingerprint(filter_values), page.limit)
@@ -1,27 +1,65 @@
 # Routes for Admin
-import bcrypt
-from fastapi import APIRouter, Body, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
 import mysql.connector
-from db.connections import get_db
-from mysql.connector import MySQLConnection
+from auth import Principal, issue_access_token, require_role
+from cache import admin_stats_cache, admin_stats_key
+from db.connections import AsyncConnection, acquire_db, get_db, get_read_db
+from db.statements import statement
+from hashing import hasher
+from export import ExportFormat, build_export_query, export_format, stream_export
 from models.admin import AdminLogin, AdminResponse, AdminRegistration, AdminTrainingProgram, FeedbackResponse
-from typing import List
-import datetime
-from utils import create_access_token
+from pagination import Filter, KeysetPaginator, PageParams
+from typing import List, Optional
 
 router = APIRouter()
 
+ADMIN_LOGIN = statement("admin_login", """
+    SELECT a.Admin_ID, a.Password
+    FROM Admin a
+    WHERE a.Admin_ID = %s
+""")
+
+feedback_paginator = KeysetPaginator(
+    sorts={"feedback_id": "f.Feedback_ID", "rating": "f.Rating"},
+    tiebreaker="f.Feedback_ID",
+    filters={
+        "training_id": Filter("f.Training_ID"),
+        "trainer_id": Filter("f.Trainer_ID"),
+        "min_rating": Filter("f.Rating", ">="),
+    },
+)
+
+FEEDBACK_SELECT = """
+    SELECT
+        f.Feedback_ID,
+        s.Name AS Student_Name,
+        tp.Training_Name,
+        t.Name AS Trainer_Name,
+        f.Rating,
+        f.Comments
+"""
+FEEDBACK_FROM = """
+    FROM
+        Feedback f
+    JOIN
+        Student s ON f.Student_ID = s.Student_ID
+    JOIN
+        Training_Program tp ON f.Training_ID = tp.Training_ID
+    JOIN
+        Trainer t ON f.Trainer_ID = t.Trainer_ID
+"""
+
 @router.get("/profile", response_model=List[AdminResponse])
-async def get_admin(db: mysql.connector.MySQLConnection = Depends(get_db)):
+async def get_admin(db: AsyncConnection = Depends(get_read_db)):
     """
     Retrieve admin data using the GetAdminData stored procedure.
     """
     cursor = db.cursor()
     try:
-        cursor.callproc("GetAdminData")
+        await cursor.callproc("GetAdminData")
 
         results = []
-        for result in cursor.stored_results():
+        for result in await cursor.stored_results():
             admins = result.fetchall()
 
             if not admins:
@@ -49,40 +87,42 @@ async def get_admin(db: mysql.connector.MySQLConnection = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
 
-@router.get("/stats")
-async def get_admin_stats(db: MySQLConnection = Depends(get_db)):
+async def load_admin_stats():
     """
-    Retrieve admin stats data using the stored procedures:
+    Compute admin stats data using the stored procedures:
     GetTotalPlacementsThisYear, GetActiveTrainingPrograms, GetTotalCompanies, GetTotalStudents.
+    Read from the primary: the cached result is adjusted in place by bump_admin_stat after
+    each committed write, so it must already include every earlier one.
     """
+    db = await acquire_db()
     cursor = db.cursor()
     try:
         # Call the GetTotalPlacementsThisYear procedure
-        cursor.callproc("GetTotalPlacementsThisYear")
+        await cursor.callproc("GetTotalPlacementsThisYear")
         total_placements = 0
-        for result in cursor.stored_results():
+        for result in await cursor.stored_results():
             total_placements = result.fetchone()[0]
 
         # Call the GetActiveTrainingPrograms procedure
-        cursor.callproc("GetActiveTrainingPrograms")
+        await cursor.callproc("GetActiveTrainingPrograms")
         active_training_programs = 0
-        for result in cursor.stored_results():
+        for result in await cursor.stored_results():
             active_training_programs = result.fetchone()[0]
 
         # Call the GetTotalCompanies procedure
-        cursor.callproc("GetTotalCompanies")
+        await cursor.callproc("GetTotalCompanies")
         total_companies = 0
-        for result in cursor.stored_results():
+        for result in await cursor.stored_results():
             total_companies = result.fetchone()[0]
 
         # Call the GetTotalStudents procedure
-        cursor.callproc("GetTotalStudents")
+        await cursor.callproc("GetTotalStudents")
         total_students = 0
-        for result in cursor.stored_results():
+        for result in await cursor.stored_results():
             total_students = result.fetchone()[0]
 
         # Return the aggregated stats
@@ -97,20 +137,30 @@ async def get_admin_stats(db: MySQLConnection = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
+
+@router.get("/stats")
+async def get_admin_stats():
+    """
+    Retrieve admin stats data from the dashboard cache.
+    The counters are recomputed at most once per ADMIN_STATS_TTL seconds and are kept
+    current in between by the registration, training program and placement routes.
+    A connection is only checked out when the cache has to be refilled.
+    """
+    return await admin_stats_cache.get_or_load(admin_stats_key(), load_admin_stats)
 
 @router.get("/companies")
-async def get_companies(db: MySQLConnection = Depends(get_db)):
+async def get_companies(db: AsyncConnection = Depends(get_read_db)):
     """
     Retrieve all companies using the GetDistinctCompanies stored procedure.
     """
     cursor = db.cursor()
     try:
-        cursor.callproc("GetDistinctCompanies")
+        await cursor.callproc("GetDistinctCompanies")
         companies = []
-        for result in cursor.stored_results():
+        for result in await cursor.stored_results():
             companies = result.fetchall()
 
         if not companies:
@@ -131,12 +181,12 @@ async def get_companies(db: MySQLConnection = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
 
 @router.get("/training_programs", response_model=List[AdminTrainingProgram])
-async def get_admin_training_programs(db: mysql.connector.MySQLConnection = Depends(get_db)):
+async def get_admin_training_programs(db: AsyncConnection = Depends(get_read_db)):
     """
     Retrieve all training programs with trainer information.
     """
@@ -155,8 +205,8 @@ async def get_admin_training_programs(db: mysql.connector.MySQLConnection = Depe
     """
     cursor = db.cursor()
     try:
-        cursor.execute(query)
-        training_programs = cursor.fetchall()
+        await cursor.execute(query)
+        training_programs = await cursor.fetchall()
 
         # Convert the list of tuples to a list of dictionaries
         training_program_list = []
@@ -177,24 +227,24 @@ async def get_admin_training_programs(db: mysql.connector.MySQLConnection = Depe
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()   
+            await db.close()   
 
 @router.post("/register")
 async def register_admin(
     admin_data: AdminRegistration = Body(...),
-    db: mysql.connector.MySQLConnection = Depends(get_db)
+    db: AsyncConnection = Depends(get_db)
 ):
     """
     Register a new admin using the AddAdminWithContact stored procedure.
     """
     # Hash the password
-    hashed_password = bcrypt.hashpw(admin_data.password.encode('utf-8'), bcrypt.gensalt())
+    hashed_password = await hasher.hash(admin_data.password)
     cursor = db.cursor()
     try:
         # Call the AddAdminWithContact stored procedure
-        cursor.callproc("AddAdminWithContact", [
+        await cursor.callproc("AddAdminWithContact", [
             admin_data.id,
             admin_data.name,
             admin_data.role,
@@ -203,36 +253,29 @@ async def register_admin(
             admin_data.phone_number
         ])
 
-        db.commit()
+        await db.commit()
         return {"message": "Admin registered successfully"}
 
     except mysql.connector.Error as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
 
 async def login_admin(
     admin_data: AdminLogin = Body(...),
-    db: MySQLConnection = Depends(get_db),
+    db: AsyncConnection = Depends(get_db),
 ):
     """
     Login an admin using their email and password with raw SQL.
     """
-    # Construct the raw SQL query to fetch admin credentials
-    query = """
-        SELECT a.Admin_ID, a.Password
-        FROM Admin a
-        WHERE a.Admin_ID = %s
-    """
-
     cursor = db.cursor()
     try:
-        cursor.execute(query, (admin_data.id,))
-        admin_credentials = cursor.fetchone()
+        # Fetch the admin credentials (prepared once per pooled connection)
+        admin_credentials = await db.fetchone_prepared(ADMIN_LOGIN, (admin_data.id,))
 
         if not admin_credentials:
             raise HTTPException(status_code=401, detail="Invalid credentials")
@@ -240,13 +283,16 @@ async def login_admin(
         admin_id, password_hash = admin_credentials
 
         # Verify the password
-        if not bcrypt.checkpw(admin_data.password.encode('utf-8'), password_hash):
+        valid, new_hash = await hasher.verify_and_update(admin_data.password, password_hash)
+        if not valid:
             raise HTTPException(status_code=401, detail="Invalid credentials")
+
+        # Upgrade hashes made with an older cost factor
+        if new_hash:
+            await cursor.execute("UPDATE Admin SET Password = %s WHERE Admin_ID = %s", (new_hash, admin_id))
+            await db.commit()
         
-        access_token_expires = datetime.timedelta(minutes=30)  # Token expiration time
-        access_token = create_access_token(
-            data={"sub": str(admin_id)}, expires_delta=access_token_expires
-        )
+        access_token = issue_access_token(admin_id, "admin")
 
         return {"access_token": access_token, "token_type": "bearer"}
 
@@ -254,38 +300,33 @@ async def login_admin(
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
 
 @router.get("/feedback", response_model=List[FeedbackResponse])
 async def get_all_feedback(
-    db: mysql.connector.MySQLConnection = Depends(get_db)
+    response: Response,
+    page: PageParams = Depends(),
+    training_id: Optional[int] = Query(None),
+    trainer_id: Optional[int] = Query(None),
+    min_rating: Optional[int] = Query(None),
+    db: AsyncConnection = Depends(get_read_db)
 ):
     """
-    Retrieve all feedback records with student name and training program details including trainer name.
-    """
-    query = """
-        SELECT
-            f.Feedback_ID,
-            s.Name AS Student_Name,
-            tp.Training_Name,
-            t.Name AS Trainer_Name,
-            f.Rating,
-            f.Comments
-        FROM
-            Feedback f
-        JOIN
-            Student s ON f.Student_ID = s.Student_ID
-        JOIN
-            Training_Program tp ON f.Training_ID = tp.Training_ID
-        JOIN
-            Trainer t ON f.Trainer_ID = t.Trainer_ID
+    Retrieve one page of feedback records with student name and training program details including trainer name.
+    The cursor for the next page is returned in the X-Next-Cursor header.
     """
+    page_query = feedback_paginator.build(
+        FEEDBACK_SELECT,
+        FEEDBACK_FROM,
+        page,
+        {"training_id": training_id, "trainer_id": trainer_id, "min_rating": min_rating},
+    )
     cursor = db.cursor()
     try:
-        cursor.execute(query)
-        results = cursor.fetchall()
+        await cursor.execute(page_query.sql, page_query.args)
+        results, _ = page_query.paginate(await cursor.fetchall(), response)
 
         if not results:
             return []
@@ -308,6 +349,25 @@ async def get_all_feedback(
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
\ No newline at end of file
+            await db.close()
+
+@router.get("/feedback/export")
+async def export_feedback(
+    fmt: ExportFormat = Depends(export_format),
+    training_id: Optional[int] = Query(None),
+    trainer_id: Optional[int] = Query(None),
+    min_rating: Optional[int] = Query(None),
+    admin: Principal = Depends(require_role("admin", detail="Only admins can export feedback")),
+):
+    """
+    Stream every feedback record matching the filters as NDJSON or CSV.
+    """
+    query, args = build_export_query(
+        feedback_paginator,
+        FEEDBACK_SELECT,
+        FEEDBACK_FROM,
+        {"training_id": training_id, "trainer_id": trainer_id, "min_rating": min_rating},
+    )
+    return await stream_export(query, fmt, "feedback", args)
@@ -1,30 +1,43 @@
 # Routes for Companies
-from fastapi import APIRouter, Body, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
 import mysql.connector
-from db.connections import get_db
+from auth import issue_access_token
+from cache import bump_admin_stat
+from db.connections import AsyncConnection, get_db, get_read_db
+from db.statements import statement
+from hashing import hasher
+from pagination import Filter, KeysetPaginator, PageParams
 from models.company import CompanyLogin, CompanyResponse, CompanyRegistration
-import bcrypt
-import datetime
-from main import create_access_token
 
 router = APIRouter()
 
-
-async def get_company_by_id(company_id: int, db: mysql.connector.MySQLConnection = Depends(get_db)):
+COMPANY_BY_ID = statement("company_by_id", """
+    SELECT c.Company_ID, c.Name, c.Industry_Type, c.Contact_Person, c.Website, cp.Phone_No, cl.Location, ce.Email_ID
+    FROM Company c LEFT JOIN Company_Phone cp ON c.Company_ID = cp.Company_ID
+    LEFT JOIN Company_Location cl ON c.Company_ID = cl.Company_ID
+    LEFT JOIN Company_Email ce ON c.Company_ID = ce.Company_ID
+    WHERE c.Company_ID = %s
+""")
+COMPANY_LOGIN = statement("company_login", """
+    SELECT c.Company_ID, c.Password
+    FROM Company c
+    WHERE c.Company_ID = %s
+""")
+
+company_paginator = KeysetPaginator(
+    sorts={"company_id": "c.Company_ID", "name": "c.Name"},
+    tiebreaker="c.Company_ID",
+    filters={"industry_type": Filter("c.Industry_Type")},
+)
+
+
+async def get_company_by_id(company_id: int, db: AsyncConnection = Depends(get_read_db)):
     """
     Helper function to retrieve a company from the database by Company_ID, including phone number.
     """
-    query = """
-        SELECT c.Company_ID, c.Name, c.Industry_Type, c.Contact_Person, c.Website, cp.Phone_No, cl.Location, ce.Email_ID
-        FROM Company c LEFT JOIN Company_Phone cp ON c.Company_ID = cp.Company_ID
-        LEFT JOIN Company_Location cl ON c.Company_ID = cl.Company_ID
-        LEFT JOIN Company_Email ce ON c.Company_ID = ce.Company_ID
-        WHERE c.Company_ID = %s
-    """
-    cursor = db.cursor()
     try:
-        cursor.execute(query, (company_id,))
-        company = cursor.fetchone()
+        company = await db.fetchone_prepared(COMPANY_BY_ID, (company_id,))
 
         if not company:
             raise HTTPException(status_code=404, detail="Company not found")
@@ -46,16 +59,14 @@ async def get_company_by_id(company_id: int, db: mysql.connector.MySQLConnection
     except mysql.connector.Error as e:
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
-        if cursor:
-            cursor.close()
         if db:
-            db.close()
+            await db.close()
 
 
 @router.get("/{company_id}", response_model=CompanyResponse)
 async def get_company(
     company_id: int,
-    db: mysql.connector.MySQLConnection = Depends(get_db),
+    db: AsyncConnection = Depends(get_read_db),
 ):
     """
     Retrieve a company from the database by Company_ID.
@@ -64,16 +75,25 @@ async def get_company(
 
 @router.get("/")
 async def get_all_companies(
-    db: mysql.connector.MySQLConnection = Depends(get_db),
+    response: Response,
+    page: PageParams = Depends(),
+    industry_type: Optional[str] = Query(None),
+    db: AsyncConnection = Depends(get_read_db),
 ):
     """
-    Retrieve all companies from the database.
+    Retrieve one page of companies from the database.
+    The cursor for the next page is returned in the X-Next-Cursor header.
     """
-    query = "SELECT * FROM Company"
+    page_query = company_paginator.build(
+        "SELECT c.Company_ID, c.Name, c.Industry_Type, c.Contact_Person, c.Website",
+        "FROM Company c",
+        page,
+        {"industry_type": industry_type},
+    )
     cursor = db.cursor()
     try:
-        cursor.execute(query)
-        companies = cursor.fetchall()
+        await cursor.execute(page_query.sql, page_query.args)
+        companies, _ = page_query.paginate(await cursor.fetchall(), response)
 
         if not companies:
             raise HTTPException(status_code=404, detail="No companies found")
@@ -86,7 +106,6 @@ async def get_all_companies(
                 "Industry_Type": company[2],
                 "Contact_Person": company[3],
                 "Website": company[4],
-                "Password": company[5],
             }
             for company in companies
         ]
@@ -97,14 +116,14 @@ async def get_all_companies(
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
 
 @router.post("/register")
 async def register_company(
     company_data: CompanyRegistration = Body(...),  # Use CompanyResponse model
-    db: mysql.connector.MySQLConnection = Depends(get_db),
+    db: AsyncConnection = Depends(get_db),
 ):
     """
     Register a new company.
@@ -113,10 +132,10 @@ async def register_company(
     try:
 
         # Hash the password
-        hashed_password = bcrypt.hashpw(company_data.password.encode("utf-8"), bcrypt.gensalt())
+        hashed_password = await hasher.hash(company_data.password)
 
         # Call the stored procedure
-        cursor.callproc("AddCompanyWithDetails", (
+        await cursor.callproc("AddCompanyWithDetails", (
             company_data.company_id,
             company_data.name,
             company_data.industry_type,
@@ -128,36 +147,32 @@ async def register_company(
             company_data.location,
         ))
 
-        db.commit()
+        await db.commit()
+        bump_admin_stat("total_companies")
 
         return {"message": "Company registered successfully"}
 
     except mysql.connector.Error as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Registration failed: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
 
 
 async def login_company(
     company_data: CompanyLogin,  # Use CompanyLogin model
-    db: mysql.connector.MySQLConnection = Depends(get_db),
+    db: AsyncConnection = Depends(get_db),
 ):
     """
     Login a company using their email and password with raw SQL and return a JWT token.
     """
-    query = """
-        SELECT c.Company_ID, c.Password
-        FROM Company c
-        WHERE c.Company_ID = %s
-    """
     cursor = db.cursor()
     try:
-        cursor.execute(query, (company_data.id,))
-        company_credentials = cursor.fetchone()
+        # Fetch the company credentials (prepared once per pooled connection)
+        company_credentials = await db.fetchone_prepared(COMPANY_LOGIN, (company_data.id,))
 
         if not company_credentials:
             raise HTTPException(status_code=401, detail="Invalid credentials")
@@ -165,14 +180,17 @@ async def login_company(
         company_id, password_hash = company_credentials
 
         # Verify the password
-        if not bcrypt.checkpw(company_data.password.encode('utf-8'), password_hash):
+        valid, new_hash = await hasher.verify_and_update(company_data.password, password_hash)
+        if not valid:
             raise HTTPException(status_code=401, detail="Invalid credentials")
 
+        # Upgrade hashes made with an older cost factor
+        if new_hash:
+            await cursor.execute("UPDATE Company SET Password = %s WHERE Company_ID = %s", (new_hash, company_id))
+            await db.commit()
+
         # Generate JWT token
-        access_token_expires = datetime.timedelta(minutes=30)  # Token expiration time
-        access_token = create_access_token(
-            data={"sub": str(company_id)}, expires_delta=access_token_expires
-        )
+        access_token = issue_access_token(company_id, "company")
 
         # Return the token
         return {"access_token": access_token, "token_type": "bearer"}
@@ -181,24 +199,24 @@ async def login_company(
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
 
 
 @router.get("/hiring_history/{company_id}")
 async def get_hiring_history(
     company_id: int,
-    db: mysql.connector.MySQLConnection = Depends(get_db),
+    db: AsyncConnection = Depends(get_read_db),
 ):
     """
     Retrieve the hiring history of a company using the GetHiringHistoryDetails stored procedure.
     """
     cursor = db.cursor()
     try:
-        cursor.callproc("GetHiringHistoryDetails", (company_id,))
+        await cursor.callproc("GetHiringHistoryDetails", (company_id,))
 
-        for result in cursor.stored_results():
+        for result in await cursor.stored_results():
             hiring_history = result.fetchall()
 
             if not hiring_history:
@@ -222,8 +240,8 @@ async def get_hiring_history(
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
 
 
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Body
 import mysql.connector
-from db.connections import get_db
+from db.composite import raise_if_all_failed, run_parts
+from db.connections import AsyncConnection, get_db
 from models.feedback import FeedbackCreate  # Assuming you have a FeedbackCreate model
 
 router = APIRouter()
@@ -8,14 +9,14 @@ router = APIRouter()
 @router.post("/")
 async def create_feedback(
     feedback_data: FeedbackCreate = Body(...),
-    db: mysql.connector.MySQLConnection = Depends(get_db),
+    db: AsyncConnection = Depends(get_db),
 ):
     """
     Create a new feedback using the AddFeedback stored procedure.
     """
     cursor = db.cursor()
     try:
-        cursor.callproc(
+        await cursor.callproc(
             "AddFeedback",
             (
                 feedback_data.Student_ID,
@@ -25,59 +26,54 @@ async def create_feedback(
                 feedback_data.Training_Program_ID
             ),
         )
-        db.commit()
+        await db.commit()
         return {"message": "Feedback created successfully"}
 
     except mysql.connector.Error as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
 
 
-@router.get("/feedback_form")
-async def get_feedback_form(
-    db: mysql.connector.MySQLConnection = Depends(get_db)
-):
-    """
-    Retrieve all data for the feedback form, including trainers and training programs.
-    """
+async def _load_trainers(db):
     cursor = db.cursor()
     try:
+        trainers = await cursor.callproc_fetchall("GetAllTrainersRowByRow")
+    finally:
+        await cursor.close()
+    # Row layout: Trainer_ID, Expertise, Name, Organisation, Email, Phone_No
+    return [{"Trainer_ID": row[0], "Name": row[2]} for row in trainers]
 
-        # Fetch all trainers
-        cursor.callproc("GetAllTrainersRowByRow")
-        trainers = []
-        for result in cursor.stored_results():
-            trainers = result.fetchall()
-
-        trainer_list = [
-            {"Trainer_ID": row[0], "Name": row[1]} for row in trainers
-        ]
-
-        # Fetch all training programs
-        cursor.callproc("GetTrainingProgramsRowByRow")
-        training_programs = []
-        for result in cursor.stored_results():
-            training_programs = result.fetchall()
 
-        training_program_list = [
-            {"Training_Program_ID": row[0], "Name": row[1]} for row in training_programs
-        ]
+async def _load_training_programs(db):
+    cursor = db.cursor()
+    try:
+        training_programs = await cursor.callproc_fetchall("GetTrainingProgramsRowByRow")
+    finally:
+        await cursor.close()
+    return [{"Training_Program_ID": row[0], "Name": row[1]} for row in training_programs]
 
-        return {
-            "trainers": trainer_list,
-            "training_programs": training_program_list
-        }
 
-    except mysql.connector.Error as e:
-        raise HTTPException(status_code=500, detail=f"Database error: {e}")
-    finally:
-        if cursor:
-            cursor.close()
-        if db:
-            db.close()
+@router.get("/feedback_form")
+async def get_feedback_form():
+    """
+    Retrieve all data for the feedback form, including trainers and training programs.
+    Both lists are fetched concurrently; one that fails is returned empty and named in "errors".
+    """
+    results, errors = await run_parts({
+        "trainers": _load_trainers,
+        "training_programs": _load_training_programs,
+    })
+    raise_if_all_failed(results, errors)
 
+    response = {
+        "trainers": results.get("trainers", []),
+        "training_programs": results.get("training_programs", []),
+    }
+    if errors:
+        response["errors"] = errors
+    return response
@@ -1,39 +1,78 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
+import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, Response
 import mysql.connector
-from db.connections import get_db
-from models.jobs import JobListResponse, JobResponse, JobCreate, JobByCompanyResponse, JobByCompanyListResponse
+from auth import Principal, require_role
+from bulk import BULK_CHUNK_SIZE, BULK_MAX_ROWS, chunked, insert_rows, placeholders
+from db.connections import AsyncConnection, acquire_read_db, get_db, get_read_db
+from eligibility import eligibility_engine
+from catalog import ACTIVE_JOB_CONDITION, JOB_CATALOG_FROM, JOB_CATALOG_SELECT, build_job_catalog
+from pagination import Filter, KeysetPaginator, PageParams
+from search import job_index
+from serialization import fast_response, row_mapper
+from models.jobs import (
+    JobListResponse,
+    JobResponse,
+    JobCreate,
+    JobByCompanyResponse,
+    JobByCompanyListResponse,
+    JobSearchResponse,
+    EligibleStudentsResponse,
+)
 
 router = APIRouter()
 
+job_paginator = KeysetPaginator(
+    sorts={"job_id": "j.Job_ID", "deadline": "j.Application_Deadline", "salary": "j.Salary"},
+    tiebreaker="j.Job_ID",
+    filters={
+        "job_type": Filter("j.Job_Type"),
+        "company_id": Filter("j.Company_ID"),
+        "deadline_from": Filter("j.Application_Deadline", ">="),
+        "deadline_to": Filter("j.Application_Deadline", "<="),
+        "min_salary": Filter("j.Salary", ">="),
+    },
+)
+
 @router.get("/", response_model=JobListResponse)
-async def get_all_jobs(db: mysql.connector.MySQLConnection = Depends(get_db)):
+async def get_all_jobs(
+    response: Response,
+    page: PageParams = Depends(),
+    job_type: Optional[str] = Query(None),
+    company_id: Optional[int] = Query(None),
+    deadline_from: Optional[datetime.date] = Query(None),
+    deadline_to: Optional[datetime.date] = Query(None),
+    min_salary: Optional[float] = Query(None),
+    db: AsyncConnection = Depends(get_read_db),
+):
     """
-    Retrieve all active jobs with company name from the database using a stored procedure.
+    Retrieve one page of active jobs with company name, locations and eligibility criteria.
+    The cursor for the next page is returned in the X-Next-Cursor header.
     """
+    page_query = job_paginator.build(
+        JOB_CATALOG_SELECT,
+        JOB_CATALOG_FROM,
+        page,
+        {
+            "job_type": job_type,
+            "company_id": company_id,
+            "deadline_from": deadline_from,
+            "deadline_to": deadline_to,
+            "min_salary": min_salary,
+        },
+        where=[ACTIVE_JOB_CONDITION],
+    )
     cursor = db.cursor()
     try:
-        cursor.callproc("GetNotExpiredJobListingsWithCompanyName")
-
-        all_jobs = []
-        for result in cursor.stored_results():
-            jobs = result.fetchall()
-            for job in jobs:
-                job_data = {
-                    "Job_ID": job[0],
-                    "Title": job[1],
-                    "Salary": job[2],
-                    "Company_Name": job[3],
-                    "Job_Type": job[4],
-                    "Application_Deadline": job[5],
-                    "Job_Description": job[6],
-                    "Vacancies": job[7],
-                    "Location_List": job[8].split(",") if job[8] else [],
-                    "Eligibility_Criteria_List": job[9].split(",") if job[9] else [],
-                }
-                all_jobs.append(JobResponse(**job_data))
+        await cursor.execute(page_query.sql, page_query.args)
+        jobs, _ = page_query.paginate(await cursor.fetchall(), response)
+
+        # One record per job with complete location and eligibility lists, already in
+        # JobResponse's shape
+        all_jobs = build_job_catalog(jobs)
 
         if all_jobs:
-            return JobListResponse(jobs=all_jobs)
+            return fast_response({"jobs": all_jobs}, response)
         else:
             raise HTTPException(status_code=404, detail="Jobs not found")
 
@@ -41,88 +80,226 @@ async def get_all_jobs(db: mysql.connector.MySQLConnection = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
+
+@router.get("/search", response_model=JobSearchResponse)
+async def search_jobs(
+    q: str = Query(..., min_length=1, max_length=200, description="Words or word prefixes to search for"),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """
+    Full-text search over active jobs: title, description, locations, eligibility criteria
+    and company name, ranked by BM25. The last letters of a word may be left out
+    ("pyth" finds "Python"). Served from the in-process search index.
+    """
+    try:
+        await job_index.ensure_ready()
+    except mysql.connector.Error as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {e}")
+    results = job_index.search(q, limit)
+    return fast_response({
+        "query": q,
+        "jobs": [dict(job, score=round(score, 4)) for score, job in results],
+    })
+
+
+JOB_COLUMNS = ("Job_Title", "Job_Description", "Salary", "Company_ID", "Job_Type", "Vacancies", "Application_Deadline")
+
+
+def _distinct(values):
+    """
+    Trimmed, non-empty values in their original order without repeats (the list tables
+    are keyed on (Job_ID, value)).
+    """
+    return list(dict.fromkeys(v.strip() for v in values if v.strip()))
+
+
+async def insert_jobs(cursor, company_id, jobs):
+    """
+    Insert `jobs` (JobCreate) for `company_id` into Job, Job_Location and Job_Eligibility.
+    Job rows are inserted one statement each so every row reports its own Job_ID; the
+    list tables get set-based multi-row INSERTs, BULK_CHUNK_SIZE rows per statement.
+    Lists are written item by item, so values may contain commas. Does not commit.
+    Returns the new Job_IDs in input order.
+    """
+    # Ids are not derived from the first id of a multi-row INSERT: with
+    # innodb_autoinc_lock_mode=2 concurrent inserts may interleave and leave gaps
+    job_ids = []
+    for chunk in chunked(jobs, BULK_CHUNK_SIZE):
+        job_ids.extend(await cursor.insert_each(
+            f"INSERT INTO Job ({', '.join(JOB_COLUMNS)}) VALUES ({placeholders(len(JOB_COLUMNS))})",
+            [
+                (job.Job_Title, job.Job_Description, job.Salary, company_id,
+                 job.Job_Type, job.Vacancies, job.Application_Deadline)
+                for job in chunk
+            ],
+        ))
+
+    locations = [
+        (job_id, location)
+        for job_id, job in zip(job_ids, jobs)
+        for location in _distinct(job.Location_List)
+    ]
+    criteria = [
+        (job_id, criterion)
+        for job_id, job in zip(job_ids, jobs)
+        for criterion in _distinct(job.Eligibility_Criteria_List)
+    ]
+    for chunk in chunked(locations, BULK_CHUNK_SIZE):
+        await insert_rows(cursor, "Job_Location", ("Job_ID", "Location"), chunk)
+    for chunk in chunked(criteria, BULK_CHUNK_SIZE):
+        await insert_rows(cursor, "Job_Eligibility", ("Job_ID", "Eligibility_Criterion"), chunk)
+    return job_ids
+
+
+async def _index_new_jobs(cursor, job_ids):
+    # The jobs are committed either way; a failure here only delays them until the next rebuild
+    try:
+        await job_index.add_jobs(cursor, job_ids)
+    except mysql.connector.Error as e:
+        print(f"Could not add jobs {job_ids} to the search index: {e}")
+
 
 @router.post("/")
 async def create_job(
     job_data: JobCreate = Body(...),
-    db: mysql.connector.MySQLConnection = Depends(get_db)
+    company: Principal = Depends(require_role("company", detail="Only companies are allowed to create jobs")),
+    db: AsyncConnection = Depends(get_db)
 ):
     """
-    Create a new job listing using the AddJobWithMultipleDetails stored procedure.
-    Only companies are allowed to create jobs.
+    Create a new job listing with its locations and eligibility criteria.
+    Only companies are allowed to create jobs, and only for themselves.
     """
     cursor = db.cursor()
     try:
-        company_id = job_data.Company_ID
-
-        # Check if the user is a company
-        company_id = job_data.Company_ID
-        query = """
-            SELECT 1 FROM Company WHERE Company_ID = %s
-        """
-        cursor.execute(query, (company_id,))
-        company = cursor.fetchone()
-        if not company:
+        if not company.owns(job_data.Company_ID):
             raise HTTPException(
-                status_code=403, detail="Only companies are allowed to create jobs"
+                status_code=403, detail="Cannot create jobs for another company"
             )
 
-        locations = ",".join(job_data.Location_List)
-        eligibility_criteria = ",".join(job_data.Eligibility_Criteria_List)
-
-        # Call the stored procedure
-        cursor.callproc(
-            "AddJobWithMultipleDetails",
-            (
-                job_data.Job_Title,
-                job_data.Job_Description,
-                job_data.Salary,
-                job_data.Company_ID,
-                job_data.Job_Type,
-                job_data.Vacancies,
-                job_data.Application_Deadline,
-                eligibility_criteria,
-                locations,
-            ),
-        )
-        db.commit()
-        return {"message": "Job created successfully"}
+        (job_id,) = await insert_jobs(cursor, company.id, [job_data])
+        await db.commit()
+        eligibility_engine.invalidate()
+        await _index_new_jobs(cursor, [job_id])
+        return {"message": "Job created successfully", "job_id": job_id}
 
     except mysql.connector.Error as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
+
+
+@router.post("/bulk")
+async def create_jobs_bulk(
+    jobs: List[JobCreate] = Body(..., min_length=1, max_length=BULK_MAX_ROWS),
+    company: Principal = Depends(require_role("company", detail="Only companies are allowed to create jobs")),
+    db: AsyncConnection = Depends(get_db)
+):
+    """
+    Create many job listings in one transaction: either every job is created or none is.
+    Each job carries its own location and eligibility lists.
+    """
+    cursor = db.cursor()
+    try:
+        for index, job in enumerate(jobs):
+            if not company.owns(job.Company_ID):
+                raise HTTPException(
+                    status_code=403, detail=f"Job {index + 1}: cannot create jobs for another company"
+                )
+
+        job_ids = await insert_jobs(cursor, company.id, jobs)
+        await db.commit()
+        eligibility_engine.invalidate()
+        await _index_new_jobs(cursor, job_ids)
+        return {"message": f"{len(job_ids)} jobs created successfully", "job_ids": job_ids}
+
+    except mysql.connector.Error as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error: {e}")
+    finally:
+        if cursor:
+            await cursor.close()
+        if db:
+            await db.close()
+
+
+@router.get("/{job_id}/eligible_students", response_model=EligibleStudentsResponse)
+async def get_eligible_students(
+    job_id: int,
+    limit: int = Query(100, ge=1, le=1000, description="How many of the eligible students to list"),
+    principal: Principal = Depends(require_role("company", "admin", detail="Only companies and admins can view eligible students")),
+):
+    """
+    Students meeting a job's eligibility criteria (minimum CGPA, departments, graduation
+    year), best CGPA first, with the total size of the pool. Criteria that cannot be
+    checked against student records are returned under requirements.unchecked.
+    """
+    try:
+        await eligibility_engine.ensure_ready()
+        match = eligibility_engine.eligible_students(job_id)
+        if match is None and await eligibility_engine.catch_up():
+            match = eligibility_engine.eligible_students(job_id)
+        if match is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        if principal.role == "company" and not principal.owns(eligibility_engine.jobs.company_ids[job_id]):
+            raise HTTPException(status_code=403, detail="Cannot view eligible students for another company's job")
+        requirements, student_ids = match
+
+        students = []
+        if student_ids:
+            shown = student_ids[:limit]
+            db = await acquire_read_db()
+            cursor = db.cursor()
+            try:
+                await cursor.execute(
+                    "SELECT Student_ID, Name, CGPA, Department, Graduation_Year FROM Student "
+                    f"WHERE Student_ID IN ({placeholders(len(shown))})",
+                    shown,
+                )
+                to_student = row_mapper(cursor.description)
+                found = {row[0]: to_student(row) for row in await cursor.fetchall()}
+            finally:
+                await cursor.close()
+                await db.close()
+            # Keep the ranking; students deleted since the snapshot are left out
+            students = [found[student_id] for student_id in shown if student_id in found]
+
+        return fast_response({
+            "job_id": job_id,
+            "requirements": requirements.as_dict(),
+            "total": len(student_ids),
+            "students": students,
+        })
+    except mysql.connector.Error as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {e}")
 
 
 @router.get("/active/{company_id}", response_model=JobByCompanyListResponse)
-async def get_active_jobs_by_company(company_id: int, db: mysql.connector.MySQLConnection = Depends(get_db)):
+async def get_active_jobs_by_company(company_id: int, db: AsyncConnection = Depends(get_read_db)):
     """
     Retrieve all active jobs for a specific company from the database using a stored procedure.
     """
     cursor = db.cursor()
     try:
-        cursor.callproc("GetActiveJobListingsByCompany", (company_id,))
+        jobs = await cursor.callproc_fetchall("GetActiveJobListingsByCompany", (company_id,))
 
         job_list = []
-        for result in cursor.stored_results():
-            jobs = result.fetchall()
-            for job in jobs:
-                job_data = {
-                    "Job_ID": job[0],
-                    "Job_Title": job[1],
-                    "Salary": job[2],
-                    "Company_Name": job[3],
-                    "Job_Type": job[4],
-                    "Application_Deadline": job[5],
-                }
-                job_list.append(JobByCompanyResponse(**job_data))
+        for job in jobs:
+            job_data = {
+                "Job_ID": job[0],
+                "Job_Title": job[1],
+                "Salary": job[2],
+                "Company_Name": job[3],
+                "Job_Type": job[4],
+                "Application_Deadline": job[5],
+            }
+            job_list.append(JobByCompanyResponse(**job_data))
 
         if job_list:
             return JobByCompanyListResponse(jobs=job_list)
@@ -133,50 +310,42 @@ async def get_active_jobs_by_company(company_id: int, db: mysql.connector.MySQLC
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
 
 
 @router.get("/expired/{company_id}", response_model=JobListResponse)
-async def get_expired_jobs_by_company(company_id: int, db: mysql.connector.MySQLConnection = Depends(get_db)):
+async def get_expired_jobs_by_company(company_id: int, db: AsyncConnection = Depends(get_read_db)):
     """
     Retrieve all expired jobs for a specific company from the database using a stored procedure.
     """
     cursor = db.cursor()
     try:
-        cursor.callproc("GetExpiredJobListingsByCompany", (company_id,))
-
-        results = []
-        for result in cursor.stored_results():
-            jobs = result.fetchall()
-
-            if not jobs:
-                raise HTTPException(status_code=404, detail="Jobs not found")
-
-            # Convert the tuple to a dictionary or a Job object
-            job_list = []
-            for job in jobs:
-                job_data = {
-                    "Job_ID": job[0],
-                    "Company_Name": job[3],
-                    "Title": job[1],
-                    "Salary": job[2],
-                    "Job_Type": job[4],
-                    "Application_Deadline": job[5],
-                }
-                job_list.append(JobResponse(**job_data))
-            results.append(job_list)
-
-        if results:
-            return JobListResponse(jobs=results[0])
-        else:
+        jobs = await cursor.callproc_fetchall("GetExpiredJobListingsByCompany", (company_id,))
+
+        if not jobs:
             raise HTTPException(status_code=404, detail="Jobs not found")
 
+        # Convert the tuple to a dictionary or a Job object
+        job_list = []
+        for job in jobs:
+            job_data = {
+                "Job_ID": job[0],
+                "Company_Name": job[3],
+                "Title": job[1],
+                "Salary": job[2],
+                "Job_Type": job[4],
+                "Application_Deadline": job[5],
+            }
+            job_list.append(JobResponse(**job_data))
+
+        return JobListResponse(jobs=job_list)
+
     except mysql.connector.Error as e:
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
\ No newline at end of file
+            await db.close()
\ No newline at end of file
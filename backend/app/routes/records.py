@@ -1,66 +1,114 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
+import datetime
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, Request, Response
 import mysql.connector
-from db.connections import get_db
+from auth import Principal, require_role
+from bulk import BULK_CHUNK_SIZE, BulkReport, chunked, existing_keys, insert_rows, read_bulk_rows, validate_rows
+from cache import bump_admin_stat
+from db.composite import raise_if_all_failed, run_parts
+from db.connections import AsyncConnection, acquire_db, get_db, get_read_db
+from db.rollup import apply_placements_to_rollup
+from export import ExportFormat, build_export_query, export_format, stream_export
 from models.records import PlacementReport, PlacementRecord, TopIndustry, PlacementRecordCreate
-from typing import List, Dict, Any
+from pagination import Filter, KeysetPaginator, PageParams
+from serialization import fast_response, row_mapper
+from typing import List, Dict, Any, Optional
 
 router = APIRouter()
 
+record_paginator = KeysetPaginator(
+    sorts={"placement_id": "pr.Placement_ID", "date": "pr.Placement_Date", "package": "pr.Package"},
+    tiebreaker="pr.Placement_ID",
+    filters={
+        "company_id": Filter("pr.Company_ID"),
+        "date_from": Filter("pr.Placement_Date", ">="),
+        "date_to": Filter("pr.Placement_Date", "<="),
+        "min_package": Filter("pr.Package", ">="),
+    },
+)
+
+RECORD_SELECT = """
+    SELECT pr.Placement_ID, s.Name AS Student_Name, c.Name AS Company_Name, j.Job_Title,
+        pr.Package, pr.Placement_Date, pr.Placement_Location
+"""
+RECORD_FROM = """
+    FROM Placement_Record pr
+    JOIN Student s ON pr.Student_ID = s.Student_ID
+    JOIN Company c ON pr.Company_ID = c.Company_ID
+    JOIN Job j ON pr.Job_ID = j.Job_ID
+"""
+
 @router.get("/", response_model=List[PlacementRecord])
-async def get_placement_records(db: mysql.connector.MySQLConnection = Depends(get_db)):
+async def get_placement_records(
+    response: Response,
+    page: PageParams = Depends(),
+    company_id: Optional[int] = Query(None),
+    date_from: Optional[datetime.date] = Query(None),
+    date_to: Optional[datetime.date] = Query(None),
+    min_package: Optional[float] = Query(None),
+    db: AsyncConnection = Depends(get_read_db),
+):
     """
-    Retrieve all placement records from the database using the GetPlacementRecordsRowByRow stored procedure.
+    Retrieve one page of placement records from the database.
+    The cursor for the next page is returned in the X-Next-Cursor header.
     """
+    page_query = record_paginator.build(
+        RECORD_SELECT,
+        RECORD_FROM,
+        page,
+        {"company_id": company_id, "date_from": date_from, "date_to": date_to, "min_package": min_package},
+    )
     cursor = db.cursor()
     try:
-        cursor.callproc("GetPlacementRecordsRowByRow")
-
-        results = []
-        for result in cursor.stored_results():
-            placement_records = result.fetchall()
-
-            if not placement_records:
-                raise HTTPException(status_code=404, detail="No placement records found")
-
-            # Convert the list of tuples to a list of dictionaries
-            placement_list = []
-            for record in placement_records:
-                record_data = {
-                    "Placement_ID": record[0],
-                    "Student_Name": record[1],
-                    "Company_Name": record[2],
-                    "Job_Title": record[3],
-                    "Package": record[4],
-                    "Placement_Location": record[6],
-                    "Placement_Date": record[5],
-                }
-                placement_list.append(PlacementRecord(**record_data))
-            results.append(placement_list)
+        await cursor.execute(page_query.sql, page_query.args)
+        placement_records, _ = page_query.paginate(await cursor.fetchall(), response)
 
-        if results:
-            return results[0]
-        else:
+        if not placement_records:
             raise HTTPException(status_code=404, detail="No placement records found")
 
+        # RECORD_SELECT's columns are named after PlacementRecord's fields, so rows map
+        # straight to the response shape without a model per row
+        to_record = row_mapper(page_query.description(cursor.description))
+        return fast_response([to_record(record) for record in placement_records], response)
+
     except mysql.connector.Error as e:
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
+
 
+@router.get("/export")
+async def export_placement_records(
+    fmt: ExportFormat = Depends(export_format),
+    company_id: Optional[int] = Query(None),
+    date_from: Optional[datetime.date] = Query(None),
+    date_to: Optional[datetime.date] = Query(None),
+    min_package: Optional[float] = Query(None),
+    admin: Principal = Depends(require_role("admin", detail="Only admins can export placement records")),
+):
+    """
+    Stream every placement record matching the filters as NDJSON or CSV.
+    """
+    query, args = build_export_query(
+        record_paginator,
+        RECORD_SELECT,
+        RECORD_FROM,
+        {"company_id": company_id, "date_from": date_from, "date_to": date_to, "min_package": min_package},
+    )
+    return await stream_export(query, fmt, "placement_records", args)
 
 @router.get("/report", response_model=PlacementReport)
-async def get_placement_report(db: mysql.connector.MySQLConnection = Depends(get_db)):
+async def get_placement_report(db: AsyncConnection = Depends(get_read_db)):
     """
     Retrieve the placement report from the database using the GetPlacementReport stored procedure.
     """
     cursor = db.cursor()
     try:
-        cursor.callproc("GetPlacementReport")
+        await cursor.callproc("GetPlacementReport")
         results = None
-        for result in cursor.stored_results():
+        for result in await cursor.stored_results():
             results = result.fetchall()
             break
 
@@ -82,21 +130,21 @@ async def get_placement_report(db: mysql.connector.MySQLConnection = Depends(get
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
 
 @router.get("/top_industries", response_model=List[TopIndustry])
-async def get_top_5_industries(db: mysql.connector.MySQLConnection = Depends(get_db)):
+async def get_top_5_industries(db: AsyncConnection = Depends(get_read_db)):
     """
     Retrieve the top 5 industries by placement count from the database using the GetTop5IndustriesByPlacement stored procedure.
     """
     cursor = db.cursor()
     try:
-        cursor.callproc("GetTop5IndustriesByPlacement")
+        await cursor.callproc("GetTop5IndustriesByPlacement")
 
         results = []
-        for result in cursor.stored_results():
+        for result in await cursor.stored_results():
             industry_data = result.fetchall()
 
             if not industry_data:
@@ -121,88 +169,96 @@ async def get_top_5_industries(db: mysql.connector.MySQLConnection = Depends(get
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
 
-@router.get("/all_records", response_model=Dict[str, Any])
-async def get_all_records(db: mysql.connector.MySQLConnection = Depends(get_db)):
-    """
-    Retrieve all placement records, placement report, and top 5 industries from the database.
-    """
+async def _load_placement_records(db):
     cursor = db.cursor()
     try:
+        records = await cursor.callproc_fetchall("GetPlacementRecordsRowByRow")
+    finally:
+        await cursor.close()
+    return [
+        PlacementRecord(
+            Placement_ID=record[0],
+            Student_Name=record[1],
+            Company_Name=record[2],
+            Job_Title=record[3],
+            Package=record[4],
+            Placement_Date=record[5],
+            Placement_Location=record[6],
+        )
+        for record in records
+    ]
 
-        # Get placement records
-        cursor.callproc("GetPlacementRecordsRowByRow")
-        placement_records = []
-        for result in cursor.stored_results():
-            records = result.fetchall()
-            placement_records = [
-                PlacementRecord(
-                    Placement_ID=record[0],
-                    Student_Name=record[1],
-                    Company_Name=record[2],
-                    Job_Title=record[3],
-                    Package=record[4],
-                    Placement_Date=record[5],
-                    Placement_Location=record[6],
-                )
-                for record in records
-            ]
-
-        # Get placement report
-        cursor.callproc("GetPlacementReport")
-        placement_report = None
-        for result in cursor.stored_results():
-            report_data = result.fetchall()
-            if report_data:
-                report = report_data[0]
-                placement_report = PlacementReport(
-                    Total_Placement_Current_Year=report[0],
-                    Percentage_Change_in_Total_Placement=report[1],
-                    Average_Package_Current_Year=report[2],
-                    Percentage_Change_in_Package=report[3],
-                    Placement_Rate_Current_Year=report[4],
-                    Percentage_Change_in_Placement_Rate=report[5],
-                )
-
-        # Get top industries
-        cursor.callproc("GetTop5IndustriesByPlacement")
-        top_industries = []
-        for result in cursor.stored_results():
-            industry_data = result.fetchall()
-            top_industries = [
-                TopIndustry(Industry_Type=industry[0], No_of_Placements=industry[1])
-                for industry in industry_data
-            ]
 
-        return {
-            "placement_records": placement_records,
-            "placement_report": placement_report,
-            "top_industries": top_industries,
-        }
+async def _load_placement_report(db):
+    cursor = db.cursor()
+    try:
+        report_data = await cursor.callproc_fetchall("GetPlacementReport")
+    finally:
+        await cursor.close()
+    if not report_data:
+        return None
+    report = report_data[0]
+    return PlacementReport(
+        Total_Placement_Current_Year=report[0],
+        Percentage_Change_in_Total_Placement=report[1],
+        Average_Package_Current_Year=report[2],
+        Percentage_Change_in_Package=report[3],
+        Placement_Rate_Current_Year=report[4],
+        Percentage_Change_in_Placement_Rate=report[5],
+    )
 
-    except mysql.connector.Error as e:
-        raise HTTPException(status_code=500, detail=f"Database error: {e}")
+
+async def _load_top_industries(db):
+    cursor = db.cursor()
+    try:
+        industry_data = await cursor.callproc_fetchall("GetTop5IndustriesByPlacement")
     finally:
-        if cursor:
-            cursor.close()
-        if db:
-            db.close()
+        await cursor.close()
+    return [
+        TopIndustry(Industry_Type=industry[0], No_of_Placements=industry[1])
+        for industry in industry_data
+    ]
+
+
+@router.get("/all_records", response_model=Dict[str, Any])
+async def get_all_records():
+    """
+    Retrieve all placement records, placement report, and top 5 industries from the database.
+    The three parts run concurrently on separate connections; a part that fails or times out
+    is returned empty and named in "errors".
+    """
+    results, errors = await run_parts({
+        "placement_records": _load_placement_records,
+        "placement_report": _load_placement_report,
+        "top_industries": _load_top_industries,
+    })
+    raise_if_all_failed(results, errors)
+
+    response = {
+        "placement_records": results.get("placement_records", []),
+        "placement_report": results.get("placement_report"),
+        "top_industries": results.get("top_industries", []),
+    }
+    if errors:
+        response["errors"] = errors
+    return response
 
 
 @router.post("/")
 async def create_placement_record(
     placement_data: PlacementRecordCreate = Body(...),
-    db: mysql.connector.MySQLConnection = Depends(get_db),
+    db: AsyncConnection = Depends(get_db),
 ):
     """
     Create a new placement record using the AddPlacementRecord stored procedure.
     """
     cursor = db.cursor()
     try:
-        cursor.callproc(
+        await cursor.callproc(
             "AddPlacementRecord",
             (
                 placement_data.Placement_ID,
@@ -214,14 +270,119 @@ async def create_placement_record(
                 placement_data.Placement_Location,
             ),
         )
-        db.commit()
+        await db.commit()
+        if placement_data.Placement_Date.year == datetime.date.today().year:
+            bump_admin_stat("total_placements_this_year")
         return {"message": "Placement record created successfully"}
 
     except mysql.connector.Error as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
\ No newline at end of file
+            await db.close()
+
+
+PLACEMENT_COLUMNS = ("Placement_ID", "Student_ID", "Job_ID", "Company_ID", "Package", "Placement_Date", "Placement_Location")
+
+# (table, key column, PlacementRecordCreate attribute) checked for every uploaded row
+PLACEMENT_REFERENCES = (
+    ("Student", "Student_ID", "Student_ID"),
+    ("Job", "Job_ID", "Job_ID"),
+    ("Company", "Company_ID", "Company_ID"),
+)
+
+
+async def _insert_placement_chunk(db, chunk, report):
+    """
+    Insert one chunk of (index, PlacementRecordCreate) with a multi-row INSERT and apply it
+    to the rollups in the same transaction. If the chunk fails, retry its rows one by one
+    through AddPlacementRecord so only the offending rows are rejected.
+    Returns the records inserted, as PlacementRecordCreate.
+    """
+    cursor = db.cursor()
+    try:
+        try:
+            await insert_rows(cursor, "Placement_Record", PLACEMENT_COLUMNS, [
+                tuple(getattr(record, column) for column in PLACEMENT_COLUMNS) for _, record in chunk
+            ])
+            await apply_placements_to_rollup(cursor, [
+                (record.Student_ID, record.Package, record.Placement_Date) for _, record in chunk
+            ])
+            await db.commit()
+            for index, record in chunk:
+                report.ok(index, placement_id=record.Placement_ID)
+            return [record for _, record in chunk]
+        except mysql.connector.Error:
+            await db.rollback()
+
+        inserted = []
+        for index, record in chunk:
+            try:
+                await cursor.callproc("AddPlacementRecord", tuple(getattr(record, column) for column in PLACEMENT_COLUMNS))
+                await db.commit()
+                report.ok(index, placement_id=record.Placement_ID)
+                inserted.append(record)
+            except mysql.connector.Error as e:
+                await db.rollback()
+                report.error(index, f"Database error: {e.msg}", placement_id=record.Placement_ID)
+        return inserted
+    finally:
+        await cursor.close()
+
+
+@router.post("/bulk")
+async def create_placement_records_bulk(
+    request: Request,
+    admin: Principal = Depends(require_role("admin", detail="Only admins can import placement records")),
+):
+    """
+    Import placement records from a JSON array or a CSV upload (Content-Type: text/csv)
+    with the fields of POST /record/. Student, Job and Company references and existing
+    Placement_IDs are checked with one query per table for the whole upload; valid rows
+    are inserted BULK_CHUNK_SIZE at a time and the placement rollups are updated once per
+    chunk. Returns a per-row report of accepted and rejected rows.
+    """
+    rows = await read_bulk_rows(request)
+    report = BulkReport(len(rows))
+    records = validate_rows(PlacementRecordCreate, rows, report, unique=("Placement_ID",))
+    if not records:
+        return report.as_dict()
+
+    db = await acquire_db()
+    try:
+        cursor = db.cursor()
+        try:
+            taken = await existing_keys(cursor, "Placement_Record", "Placement_ID", {r.Placement_ID for _, r in records})
+            found = {
+                attr: await existing_keys(cursor, table, column, {getattr(r, attr) for _, r in records})
+                for table, column, attr in PLACEMENT_REFERENCES
+            }
+        except mysql.connector.Error as e:
+            raise HTTPException(status_code=500, detail=f"Database error: {e}")
+        finally:
+            await cursor.close()
+
+        valid = []
+        for index, record in records:
+            if record.Placement_ID in taken:
+                report.error(index, "Placement record with this ID already exists", placement_id=record.Placement_ID)
+                continue
+            missing = [attr for _, _, attr in PLACEMENT_REFERENCES if getattr(record, attr) not in found[attr]]
+            if missing:
+                report.error(index, f"Invalid {', '.join(missing)}", placement_id=record.Placement_ID)
+                continue
+            valid.append((index, record))
+
+        inserted = []
+        for chunk in chunked(valid, BULK_CHUNK_SIZE):
+            inserted.extend(await _insert_placement_chunk(db, chunk, report))
+    finally:
+        await db.close()
+
+    this_year = sum(1 for record in inserted if record.Placement_Date.year == datetime.date.today().year)
+    if this_year:
+        bump_admin_stat("total_placements_this_year", this_year)
+    return report.as_dict()
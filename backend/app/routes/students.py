@@ -1,9 +1,20 @@
 # Routes for Students
 import datetime
-import bcrypt
 import mysql.connector
-from fastapi import APIRouter, Body, Depends, HTTPException
-from db.connections import get_db
+from typing import Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from auth import Principal, issue_access_token, require_role
+from bulk import BULK_CHUNK_SIZE, BulkReport, chunked, existing_keys, insert_rows, placeholders, read_bulk_rows, validate_rows
+from cache import bump_admin_stat
+from catalog import JOB_CATALOG_FROM, JOB_CATALOG_SELECT, build_job_catalog
+from db.connections import AsyncConnection, acquire_db, acquire_read_db, get_db, get_read_db
+from db.rollup import add_students_to_total
+from db.statements import statement
+from eligibility import eligibility_engine
+from hashing import hasher
+from export import ExportFormat, build_export_query, export_format, stream_export
+from serialization import fast_response
+from pagination import Filter, KeysetPaginator, PageParams
 from models.student import (
     StudentListResponse,
     StudentLogin,
@@ -14,25 +25,52 @@ from models.student import (
     StudentApplicationResponse,
     StudentApplicationListResponse,
 )
-from main import create_access_token
+from models.jobs import JobListResponse
 
 router = APIRouter()
 
-async def get_student_by_id(student_id: int, db: mysql.connector.MySQLConnection = Depends(get_db)):
+student_paginator = KeysetPaginator(
+    sorts={
+        "student_id": "s.Student_ID",
+        "name": "s.Name",
+        "cgpa": "s.CGPA",
+        "graduation_year": "s.Graduation_Year",
+    },
+    tiebreaker="s.Student_ID",
+    filters={
+        "department": Filter("s.Department"),
+        "graduation_year": Filter("s.Graduation_Year"),
+        "min_cgpa": Filter("s.CGPA", ">="),
+    },
+)
+
+STUDENT_BY_ID = statement("student_by_id", """
+    SELECT s.Student_ID, s.Name, s.CGPA, s.Graduation_Year, s.Department, sp.Phone_No, se.Email_ID
+    FROM Student s
+    LEFT JOIN Student_Phone sp ON s.Student_ID = sp.Student_ID
+    LEFT JOIN Student_Email se ON s.Student_ID = se.Student_ID
+    WHERE s.Student_ID = %s
+""")
+STUDENT_EXISTS = statement("student_exists", "SELECT 1 FROM Student WHERE Student_ID = %s")
+STUDENT_LOGIN = statement("student_login", """
+    SELECT sc.Student_ID, sc.Password
+    FROM Student sc
+    WHERE sc.Student_ID = %s
+""")
+
+# Contacts come from correlated subqueries so each student is exactly one row
+STUDENT_SELECT = """
+    SELECT s.Student_ID, s.Name, s.CGPA, s.Graduation_Year, s.Department,
+        (SELECT MIN(sp.Phone_No) FROM Student_Phone sp WHERE sp.Student_ID = s.Student_ID) AS Phone_No,
+        (SELECT MIN(se.Email_ID) FROM Student_Email se WHERE se.Student_ID = s.Student_ID) AS Email_ID
+"""
+
+async def get_student_by_id(student_id: int, db: AsyncConnection = Depends(get_read_db)):
     """
     Helper function to retrieve a student from the database by Student ID, including phone number.
     """
-    query = """
-        SELECT s.Student_ID, s.Name, s.CGPA, s.Graduation_Year, s.Department, sp.Phone_No, se.Email_ID
-        FROM Student s
-        LEFT JOIN Student_Phone sp ON s.Student_ID = sp.Student_ID
-        LEFT JOIN Student_Email se ON s.Student_ID = se.Student_ID
-        WHERE s.Student_ID = %s
-    """
-    cursor = db.cursor()
     try:
-        cursor.execute(query, (student_id,))
-        student = cursor.fetchone()
+        student = await db.fetchone_prepared(STUDENT_BY_ID, (student_id,))
 
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
@@ -53,25 +91,32 @@ async def get_student_by_id(student_id: int, db: mysql.connector.MySQLConnection
     except mysql.connector.Error as e:
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
-        if cursor:
-            cursor.close()
         if db:
-            db.close()
+            await db.close()
 
 @router.get("/", response_model=StudentListResponse)
-async def get_all_students(db: mysql.connector.MySQLConnection = Depends(get_db)):
-    """
-    Retrieve all students from the database.
+async def get_all_students(
+    response: Response,
+    page: PageParams = Depends(),
+    department: Optional[str] = Query(None),
+    graduation_year: Optional[int] = Query(None),
+    min_cgpa: Optional[float] = Query(None),
+    db: AsyncConnection = Depends(get_read_db),
+):
     """
-    query = """
-        SELECT s.Student_ID, s.Name, s.CGPA, s.Graduation_Year, s.Department, sp.Phone_No
-        FROM Student s
-        LEFT JOIN Student_Phone sp ON s.Student_ID = sp.Student_ID
+    Retrieve one page of students from the database.
+    The cursor for the next page is returned in the X-Next-Cursor header.
     """
+    page_query = student_paginator.build(
+        STUDENT_SELECT,
+        "FROM Student s",
+        page,
+        {"department": department, "graduation_year": graduation_year, "min_cgpa": min_cgpa},
+    )
     cursor = db.cursor()
     try:
-        cursor.execute(query)
-        students = cursor.fetchall()
+        await cursor.execute(page_query.sql, page_query.args)
+        students, _ = page_query.paginate(await cursor.fetchall(), response)
 
         if not students:
             raise HTTPException(status_code=404, detail="Students not found")
@@ -85,7 +130,8 @@ async def get_all_students(db: mysql.connector.MySQLConnection = Depends(get_db)
                 "CGPA": student[2],
                 "Graduation_Year": student[3],
                 "Department": student[4],
-                "Phone_Number": student[5]  # Add phone number
+                "Phone_No": student[5],  # Add phone number
+                "Email_ID": student[6],
             }
             student_list.append(StudentResponse(**student_data))
         return StudentListResponse(students=student_list)
@@ -94,12 +140,32 @@ async def get_all_students(db: mysql.connector.MySQLConnection = Depends(get_db)
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
+
+# Declared before /{student_id} so "export" is not parsed as an ID
+@router.get("/export")
+async def export_students(
+    fmt: ExportFormat = Depends(export_format),
+    department: Optional[str] = Query(None),
+    graduation_year: Optional[int] = Query(None),
+    min_cgpa: Optional[float] = Query(None),
+    admin: Principal = Depends(require_role("admin", detail="Only admins can export students")),
+):
+    """
+    Stream every student matching the filters as NDJSON or CSV.
+    """
+    query, args = build_export_query(
+        student_paginator,
+        STUDENT_SELECT,
+        "FROM Student s",
+        {"department": department, "graduation_year": graduation_year, "min_cgpa": min_cgpa},
+    )
+    return await stream_export(query, fmt, "students", args)
 
 @router.get("/{student_id}", response_model=StudentResponse)
-async def get_student(student_id: int, db: mysql.connector.MySQLConnection = Depends(get_db)):
+async def get_student(student_id: int, db: AsyncConnection = Depends(get_read_db)):
     """
     Retrieve a student from the database by Student ID.
     """
@@ -108,7 +174,7 @@ async def get_student(student_id: int, db: mysql.connector.MySQLConnection = Dep
 @router.post("/register")
 async def register_student(
     student_data: StudentRegistration = Body(...),  # Use StudentRegistration model
-    db: mysql.connector.MySQLConnection = Depends(get_db),
+    db: AsyncConnection = Depends(get_db),
 ):
     """
     Register a new student using a stored procedure.
@@ -117,20 +183,16 @@ async def register_student(
     try:
 
         # Check if the student already exists
-        query_check = """
-            SELECT 1 FROM Student WHERE Student_ID = %s
-        """
-        cursor.execute(query_check, (student_data.student_id,))
-        existing_student = cursor.fetchone()
+        existing_student = await db.fetchone_prepared(STUDENT_EXISTS, (student_data.student_id,))
 
         if existing_student:
             raise HTTPException(status_code=400, detail="Student with this ID already exists")
 
         # Hash the password
-        hashed_password = bcrypt.hashpw(student_data.password.encode("utf-8"), bcrypt.gensalt())
+        hashed_password = await hasher.hash(student_data.password)
 
         # Call the stored procedure
-        cursor.callproc("AddStudentWithContact", (
+        await cursor.callproc("AddStudentWithContact", (
             student_data.student_id,  # Assuming student_id is provided in the request
             student_data.name,
             student_data.cgpa,
@@ -142,38 +204,128 @@ async def register_student(
         ))
 
         # Commit the changes
-        db.commit()
+        await db.commit()
+        bump_admin_stat("total_students")
+        eligibility_engine.invalidate()
 
         return {"message": "Student registered successfully"}
 
     except mysql.connector.Error as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Registration failed: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
+
+
+async def _insert_student_chunk(db, chunk, report):
+    """
+    Insert one chunk of (index, StudentRegistration, password hash) in a single transaction
+    of three multi-row INSERTs and a Student_Total update. If the chunk fails, retry its
+    rows one by one so only the offending rows are reported. Returns the number of
+    students inserted.
+    """
+    cursor = db.cursor()
+    try:
+        try:
+            await insert_rows(cursor, "Student", ("Student_ID", "Name", "CGPA", "Graduation_Year", "Department", "Password"), [
+                (s.student_id, s.name, s.cgpa, s.graduation_year, s.department, password_hash)
+                for _, s, password_hash in chunk
+            ])
+            await insert_rows(cursor, "Student_Email", ("Email_ID", "Student_ID"), [
+                (s.email, s.student_id) for _, s, _ in chunk
+            ])
+            await insert_rows(cursor, "Student_Phone", ("Phone_No", "Student_ID"), [
+                (s.phone_number, s.student_id) for _, s, _ in chunk
+            ])
+            await add_students_to_total(cursor, len(chunk))
+            await db.commit()
+            for index, s, _ in chunk:
+                report.ok(index, student_id=s.student_id)
+            return len(chunk)
+        except mysql.connector.Error:
+            await db.rollback()
+
+        inserted = 0
+        for index, s, password_hash in chunk:
+            try:
+                await cursor.callproc("AddStudentWithContact", (
+                    s.student_id, s.name, s.cgpa, s.graduation_year, s.department,
+                    password_hash, s.email, s.phone_number,
+                ))
+                await db.commit()
+                report.ok(index, student_id=s.student_id)
+                inserted += 1
+            except mysql.connector.Error as e:
+                await db.rollback()
+                report.error(index, f"Registration failed: {e.msg}", student_id=s.student_id)
+        return inserted
+    finally:
+        await cursor.close()
+
+
+@router.post("/bulk_register")
+async def bulk_register_students(
+    request: Request,
+    admin: Principal = Depends(require_role("admin", detail="Only admins can register students in bulk")),
+):
+    """
+    Register many students from a JSON array or a CSV upload (Content-Type: text/csv) whose
+    fields/columns are those of /register. Every row is validated first, passwords are
+    hashed in parallel on the hashing workers, and valid rows are inserted BULK_CHUNK_SIZE
+    at a time. Returns a per-row report; one bad row does not fail the upload.
+    """
+    rows = await read_bulk_rows(request)
+    report = BulkReport(len(rows))
+    students = validate_rows(StudentRegistration, rows, report, unique=("student_id",))
+
+    # Connections are not held while the passwords are being hashed
+    if students:
+        db = await acquire_db()
+        cursor = db.cursor()
+        try:
+            taken = await existing_keys(cursor, "Student", "Student_ID", [s.student_id for _, s in students])
+        except mysql.connector.Error as e:
+            raise HTTPException(status_code=500, detail=f"Database error: {e}")
+        finally:
+            await cursor.close()
+            await db.close()
+        for index, s in students:
+            if s.student_id in taken:
+                report.error(index, "Student with this ID already exists", student_id=s.student_id)
+        students = [(index, s) for index, s in students if s.student_id not in taken]
+
+    if students:
+        password_hashes = await hasher.hash_many([s.password for _, s in students])
+        pending = [(index, s, password_hash) for (index, s), password_hash in zip(students, password_hashes)]
+
+        inserted = 0
+        db = await acquire_db()
+        try:
+            for chunk in chunked(pending, BULK_CHUNK_SIZE):
+                inserted += await _insert_student_chunk(db, chunk, report)
+        finally:
+            await db.close()
+        if inserted:
+            bump_admin_stat("total_students", inserted)
+            eligibility_engine.invalidate()
+
+    return report.as_dict()
 
 
 async def login_student(
     student_data: StudentLogin = Body(...),  # Use StudentLogin model
-    db: mysql.connector.MySQLConnection = Depends(get_db),
+    db: AsyncConnection = Depends(get_db),
 ):
     """
     Login a student using their email and password with raw SQL and return a JWT token.
     """
-    # Construct the raw SQL query to fetch student credentials
-    query = """
-        SELECT sc.Student_ID, sc.Password
-        FROM Student sc
-        WHERE sc.Student_ID = %s
-    """
-
     cursor = db.cursor()
     try:
-        cursor.execute(query, (student_data.id,))
-        student_credentials = cursor.fetchone()
+        # Fetch the student credentials (prepared once per pooled connection)
+        student_credentials = await db.fetchone_prepared(STUDENT_LOGIN, (student_data.id,))
 
         if not student_credentials:
             raise HTTPException(status_code=401, detail="Invalid credentials")
@@ -181,14 +333,17 @@ async def login_student(
         student_id, password_hash = student_credentials
 
         # Verify the password
-        if not bcrypt.checkpw(student_data.password.encode('utf-8'), password_hash):
+        valid, new_hash = await hasher.verify_and_update(student_data.password, password_hash)
+        if not valid:
             raise HTTPException(status_code=401, detail="Invalid credentials")
 
+        # Upgrade hashes made with an older cost factor
+        if new_hash:
+            await cursor.execute("UPDATE Student SET Password = %s WHERE Student_ID = %s", (new_hash, student_id))
+            await db.commit()
+
         # Generate JWT token
-        access_token_expires = datetime.timedelta(minutes=30)  # Token expiration time
-        access_token = create_access_token(
-            data={"sub": str(student_id)}, expires_delta=access_token_expires
-        )
+        access_token = issue_access_token(student_id, "student")
 
         # Return the token
         return {"access_token": access_token, "token_type": "bearer"}
@@ -197,55 +352,53 @@ async def login_student(
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
 
 
 @router.post("/apply")
 async def apply_to_job(
     application_data: JobApplication = Body(...),
-    db: mysql.connector.MySQLConnection = Depends(get_db)
+    student: Principal = Depends(require_role("student", detail="Only Students can apply for jobs")),
+    db: AsyncConnection = Depends(get_db)
 ):
     """
-    Apply to a job using the Application table.
+    Apply to a job using the Application table, as the student in the access token.
     """
     cursor = db.cursor()
     try:
 
-        # Extract student_id from the access token
-        student_id = application_data.student_id
-        query = "SELECT 1 FROM Student WHERE Student_ID = %s"
-        cursor.execute(query, (student_id,))
-        student_exists = cursor.fetchone()
-        if not student_exists:
-            raise HTTPException(status_code=403, detail="Only Students can apply for jobs")
+        # The access token identifies the student; a body ID may only repeat it
+        if not student.owns(application_data.student_id):
+            raise HTTPException(status_code=403, detail="Cannot apply on behalf of another student")
+        student_id = student.id
 
         # Call the stored procedure
         application_date = datetime.date.today()
         status = "Pending"
-        cursor.callproc("ApplyToJob", (student_id, application_data.job_id, application_date, status))
+        await cursor.callproc("ApplyToJob", (student_id, application_data.job_id, application_date, status))
 
         # Commit the changes
-        db.commit()
+        await db.commit()
         return {"message": "Application submitted successfully"}
 
     except mysql.connector.Error as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Application failed: {e}")
     except HTTPException as e:
-        db.rollback()
+        await db.rollback()
         raise e
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
 
 @router.get("/applications/{student_id}", response_model=StudentApplicationListResponse)
 async def get_applications(
     student_id: int,
-    db: mysql.connector.MySQLConnection = Depends(get_db),
+    db: AsyncConnection = Depends(get_read_db),
 ):
     """
     Retrieve all job applications for a student using the stored procedure.
@@ -254,17 +407,15 @@ async def get_applications(
     try:
 
         # Check if the student exists
-        query_check = "SELECT 1 FROM Student WHERE Student_ID = %s"
-        cursor.execute(query_check, (student_id,))
-        student_exists = cursor.fetchone()
+        student_exists = await db.fetchone_prepared(STUDENT_EXISTS, (student_id,))
         if not student_exists:
             raise HTTPException(status_code=403, detail="Only Students can view applications")
 
         # Call the stored procedure
-        cursor.callproc("GetJobApplicationsByStudent", (student_id,))
+        await cursor.callproc("GetJobApplicationsByStudent", (student_id,))
 
         # Fetch results from the procedure
-        for result in cursor.stored_results():
+        for result in await cursor.stored_results():
             applications = result.fetchall()
 
         if not applications:
@@ -288,14 +439,47 @@ async def get_applications(
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
+
+@router.get("/{student_id}/eligible_jobs", response_model=JobListResponse)
+async def get_eligible_jobs(student_id: int):
+    """
+    Open jobs whose eligibility criteria (minimum CGPA, departments, graduation year) the
+    student meets. Criteria that cannot be checked against student records do not exclude
+    a job.
+    """
+    try:
+        await eligibility_engine.ensure_ready()
+        job_ids = eligibility_engine.eligible_jobs(student_id)
+        if job_ids is None and await eligibility_engine.catch_up():
+            job_ids = eligibility_engine.eligible_jobs(student_id)
+        if job_ids is None:
+            raise HTTPException(status_code=404, detail="Student not found")
+        if not job_ids:
+            return fast_response({"jobs": []})
+
+        db = await acquire_read_db()
+        cursor = db.cursor()
+        try:
+            await cursor.execute(
+                f"{JOB_CATALOG_SELECT} {JOB_CATALOG_FROM} WHERE j.Job_ID IN ({placeholders(len(job_ids))}) "
+                "ORDER BY j.Application_Deadline, j.Job_ID",
+                job_ids,
+            )
+            jobs = build_job_catalog(await cursor.fetchall())
+        finally:
+            await cursor.close()
+            await db.close()
+        return fast_response({"jobs": jobs})
+    except mysql.connector.Error as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {e}")
 
 @router.get("/enrolled_courses/{student_id}")
 async def get_enrolled_courses(
     student_id: int,
-    db: mysql.connector.MySQLConnection = Depends(get_db),
+    db: AsyncConnection = Depends(get_read_db),
 ):
     """
     Retrieve all training programs a student is enrolled in using the stored procedure.
@@ -303,19 +487,17 @@ async def get_enrolled_courses(
     cursor = db.cursor()
     try:
         # Call the stored procedure
-        cursor.callproc("GetTrainingEnrollmentsByStudent", (student_id,))
+        enrollments = await cursor.callproc_fetchall("GetTrainingEnrollmentsByStudent", (student_id,))
 
         enrollment_list = []
-        for result in cursor.stored_results():
-            enrollments = result.fetchall()
-            for enrollment in enrollments:
-                enrollment_data = {
-                    "Enrollment_ID": enrollment[0],
-                    "Duration": enrollment[1],
-                    "Training_Name": enrollment[2],
-                    "Start_Date": enrollment[3]
-                }
-                enrollment_list.append(enrollment_data)
+        for enrollment in enrollments:
+            enrollment_data = {
+                "Enrollment_ID": enrollment[0],
+                "Duration": enrollment[1],
+                "Training_Name": enrollment[2],
+                "Start_Date": enrollment[3]
+            }
+            enrollment_list.append(enrollment_data)
 
         if not enrollment_list:
             raise HTTPException(status_code=404, detail="No training enrollments found for this student")
@@ -326,15 +508,16 @@ async def get_enrolled_courses(
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
 
 
 @router.post("/enroll")
 async def enroll_student(
     enrollment_data: EnrollStudent,
-    db: mysql.connector.MySQLConnection = Depends(get_db),
+    student: Principal = Depends(require_role("student", detail="Only Students can enroll in training programs")),
+    db: AsyncConnection = Depends(get_db),
 ):
     """
     Enroll a student in a training program using their access token and a stored procedure.
@@ -342,31 +525,27 @@ async def enroll_student(
     cursor = db.cursor()
     try:
 
-        # Extract student_id from the access token
-        student_id = enrollment_data.studentId
-        query = "SELECT 1 FROM student WHERE student_id = %s"
-        cursor.execute(query, (student_id,))
-        is_student = cursor.fetchone()
-
-        if not is_student:
-            raise HTTPException(status_code=401, detail="Invalid access token")
+        # The access token identifies the student; a body ID may only repeat it
+        if not student.owns(enrollment_data.studentId):
+            raise HTTPException(status_code=403, detail="Cannot enroll another student")
+        student_id = student.id
 
         # Call the stored procedure
-        cursor.callproc("EnrollStudentInTraining", (enrollment_data.trainingId, student_id))
+        await cursor.callproc("EnrollStudentInTraining", (enrollment_data.trainingId, student_id))
 
         # Commit the changes
-        db.commit()
+        await db.commit()
 
         return {"message": "Student enrolled successfully"}
 
     except mysql.connector.Error as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Enrollment failed: {e}")
     except HTTPException as e:
-        db.rollback()
+        await db.rollback()
         raise e
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
\ No newline at end of file
+            await db.close()
\ No newline at end of file
@@ -1,15 +1,31 @@
 # Routes for Jobs
-from fastapi import APIRouter, Body, Depends, HTTPException
+import datetime
+from typing import Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
 import mysql.connector
-from db.connections import get_db
+from auth import Principal, require_role
+from cache import bump_admin_stat
+from db.connections import AsyncConnection, get_db, get_read_db
 from models.training import TrainerRegistration, TrainerProgram, CreateTrainingProgram
+from pagination import Filter, KeysetPaginator, PageParams
 
 router = APIRouter()
 
+program_paginator = KeysetPaginator(
+    sorts={"training_id": "tp.Training_ID", "start_date": "tp.Start_Date", "cost": "tp.Training_Cost"},
+    tiebreaker="tp.Training_ID",
+    filters={
+        "mode": Filter("tp.Mode"),
+        "trainer_id": Filter("tp.Trainer_ID"),
+        "start_from": Filter("tp.Start_Date", ">="),
+        "start_to": Filter("tp.Start_Date", "<="),
+    },
+)
+
 @router.post("/register")
 async def register_trainer(
     trainer_data: TrainerRegistration = Body(...),
-    db: mysql.connector.MySQLConnection = Depends(get_db),
+    db: AsyncConnection = Depends(get_db),
 ):
     """
     Register a new trainer using a stored procedure.
@@ -18,7 +34,7 @@ async def register_trainer(
     try:
 
         # Call the stored procedure
-        cursor.callproc("AddTrainerWithDetails", (
+        await cursor.callproc("AddTrainerWithDetails", (
             trainer_data.trainer_id,
             trainer_data.expertise,
             trainer_data.name,
@@ -28,23 +44,23 @@ async def register_trainer(
         ))
 
         # Commit the changes
-        db.commit()
+        await db.commit()
 
         return {"message": "Trainer registered successfully"}
 
     except mysql.connector.Error as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Registration failed: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
 
     
 @router.get("/trainers")
 async def get_trainers(
-    db: mysql.connector.MySQLConnection = Depends(get_db),
+    db: AsyncConnection = Depends(get_read_db),
 ):
     """
     Get all trainers.
@@ -52,13 +68,8 @@ async def get_trainers(
     cursor = db.cursor(dictionary=True)
     try:
 
-        # Call the stored procedure
-        cursor.callproc("GetAllTrainersRowByRow")
-
-        # Fetch all results
-        trainers = []
-        for result in cursor.stored_results():
-            trainers.extend(result.fetchall())
+        # Call the stored procedure and fetch its single result set
+        trainers = await cursor.callproc_fetchall("GetAllTrainersRowByRow")
 
         return {"trainers": trainers}
 
@@ -66,15 +77,16 @@ async def get_trainers(
         raise HTTPException(status_code=500, detail=f"Failed to fetch trainers: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
 
 
 @router.post("/create-program")
 async def create_training_program(
     program_data: CreateTrainingProgram = Body(...),
-    db: mysql.connector.MySQLConnection = Depends(get_db),
+    admin: Principal = Depends(require_role("admin", detail="User is not authorized to create a training program")),
+    db: AsyncConnection = Depends(get_db),
 ):
     """
     Create a new training program using a stored procedure.
@@ -82,15 +94,11 @@ async def create_training_program(
     """
     cursor = db.cursor()
     try:
-        admin_id = program_data.admin_id
-        cursor.execute("SELECT 1 FROM Admin WHERE Admin_ID = %s", (admin_id,))
-        result = cursor.fetchone()
-        
-        if not result:
+        if not admin.owns(program_data.admin_id):
             raise HTTPException(status_code=403, detail="User is not authorized to create a training program")
 
         # Call the stored procedure
-        cursor.callproc("AddTrainingProgram", (
+        await cursor.callproc("AddTrainingProgram", (
             program_data.training_name,
             program_data.training_description,
             program_data.duration,
@@ -103,37 +111,57 @@ async def create_training_program(
         ))
 
         # Commit the changes
-        db.commit()
+        await db.commit()
+        if program_data.start_date <= datetime.date.today() <= program_data.end_date:
+            bump_admin_stat("active_training_programs")
 
         return {"message": "Training program created successfully"}
 
     except mysql.connector.Error as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create training program: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
+            await db.close()
 
 
 @router.get("/programs", response_model=list[TrainerProgram])
 async def get_training_programs(
-    db: mysql.connector.MySQLConnection = Depends(get_db),
+    response: Response,
+    page: PageParams = Depends(),
+    mode: Optional[str] = Query(None),
+    trainer_id: Optional[int] = Query(None),
+    start_from: Optional[datetime.date] = Query(None),
+    start_to: Optional[datetime.date] = Query(None),
+    db: AsyncConnection = Depends(get_read_db),
 ):
     """
-    Get all training programs.
+    Get one page of training programs.
+    The cursor for the next page is returned in the X-Next-Cursor header.
     """
+    # Same columns as GetAllTrainingProgramsRowByRow, with filters, ordering and LIMIT applied
+    page_query = program_paginator.build(
+        """
+        SELECT
+            tp.Training_Name,
+            tp.Training_Description,
+            tp.Duration,
+            tp.Start_Date,
+            tp.Mode,
+            tp.Certification_Provided,
+            tp.Training_Cost,
+            t.Name AS Trainer_Name
+        """,
+        "FROM Training_Program tp JOIN Trainer t ON tp.Trainer_ID = t.Trainer_ID",
+        page,
+        {"mode": mode, "trainer_id": trainer_id, "start_from": start_from, "start_to": start_to},
+    )
+    cursor = db.cursor(dictionary=True)
     try:
-        cursor = db.cursor(dictionary=True)
-
-        # Call the stored procedure
-        cursor.callproc("GetAllTrainingProgramsRowByRow")
-
-        # Fetch all results
-        programs = []
-        for result in cursor.stored_results():
-            programs.extend(result.fetchall())
+        await cursor.execute(page_query.sql, page_query.args)
+        programs, _ = page_query.paginate(await cursor.fetchall(), response)
 
         return programs
 
@@ -141,6 +169,6 @@ async def get_training_programs(
         raise HTTPException(status_code=500, detail=f"Failed to fetch training programs: {e}")
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
         if db:
-            db.close()
\ No newline at end of file
+            await db.close()
\ No newline at end of file
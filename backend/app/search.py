@@ -0,0 +1,325 @@
+# In-process full-text search over the active job catalog
+import asyncio
+import bisect
+import datetime
+import heapq
+import math
+import os
+import re
+import time
+from bulk import placeholders
+from catalog import ACTIVE_JOB_CONDITION, JOB_CATALOG_FROM, JOB_CATALOG_SELECT, build_job_catalog, fetch_job_catalog
+from db.connections import acquire_db
+
+# Seconds before a search triggers a background rebuild, which picks up jobs written
+# through other workers and any edits made outside the API
+JOB_SEARCH_REFRESH = float(os.getenv("JOB_SEARCH_REFRESH") or 300)
+
+# Searchable fields of a catalog record and their weight in the combined term frequency
+FIELD_WEIGHTS = {
+    "Title": 3.0,
+    "Company_Name": 2.0,
+    "Location_List": 1.5,
+    "Eligibility_Criteria_List": 1.0,
+    "Job_Description": 1.0,
+}
+
+# Query terms shorter than this only match whole words
+MIN_PREFIX_LENGTH = 2
+# A term reached through prefix expansion counts for this fraction of an exact match
+PREFIX_WEIGHT = 0.5
+MAX_PREFIX_EXPANSIONS = 50
+# Query tokens whose ranked matches are kept between index changes
+MAX_CACHED_TOKENS = 2048
+
+_TOKEN = re.compile(r"[0-9a-z]+[+#]*")
+
+
+def tokenize(text):
+    """
+    Lower-cased word tokens; keeps trailing + and # so "C++" and "C#" stay searchable.
+    """
+    return _TOKEN.findall(text.lower()) if text else []
+
+
+class JobSearchIndex:
+    """
+    Inverted index over the active jobs with BM25 ranking and prefix matching.
+
+    Each job's fields are tokenised into one weighted term-frequency vector (title and
+    company count more than the description). Postings map a term to {Job_ID: weighted
+    tf}; a sorted term list serves prefix lookups with bisect. Jobs are added when they
+    are created and dropped once their Application_Deadline has passed, so the index is
+    kept current without re-reading the catalog.
+
+    The scores a query token gives every job it matches are computed once and kept, sorted,
+    until the index next changes; a query then only merges the heads of its tokens' lists
+    (threshold algorithm) instead of scoring every posting.
+    """
+
+    def __init__(self, k1=1.2, b=0.75, refresh=300, clock=time.monotonic):
+        self.k1 = k1
+        self.b = b
+        self.refresh = refresh
+        self.clock = clock
+        self._clear()
+        self.loaded_at = None
+        self._lock = asyncio.Lock()
+        self._rebuild = None
+        # Jobs created while a (re)load is reading the catalog, which it may have missed
+        self._reloading = False
+        self._added_during_reload = []
+        self._searches = 0
+
+    def _clear(self):
+        self.jobs = {}  # Job_ID -> catalog record
+        self.lengths = {}  # Job_ID -> weighted document length
+        self.postings = {}  # term -> {Job_ID: weighted tf}
+        self.terms = []  # sorted keys of postings
+        self.total_length = 0.0
+        self.deadlines = []  # heap of (Application_Deadline, Job_ID)
+        self._token_scores = {}  # query token -> ({Job_ID: score}, [(-score, Job_ID)] sorted)
+
+    # Maintenance
+
+    def add(self, job):
+        """
+        Index one catalog record (see catalog.build_job_catalog), replacing any older version.
+        """
+        job_id = job["Job_ID"]
+        if job_id in self.jobs:
+            self.remove(job_id)
+
+        frequencies = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            value = job.get(field)
+            texts = value if isinstance(value, list) else [value]
+            for text in texts:
+                for term in tokenize(text):
+                    frequencies[term] = frequencies.get(term, 0.0) + weight
+
+        for term, frequency in frequencies.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                bisect.insort(self.terms, term)
+            postings[job_id] = frequency
+        length = sum(frequencies.values())
+        self._token_scores.clear()
+        self.jobs[job_id] = job
+        self.lengths[job_id] = length
+        self.total_length += length
+        if job.get("Application_Deadline") is not None:
+            heapq.heappush(self.deadlines, (job["Application_Deadline"], job_id))
+
+    def remove(self, job_id):
+        job = self.jobs.pop(job_id, None)
+        if job is None:
+            return False
+        self.total_length -= self.lengths.pop(job_id)
+        self._token_scores.clear()
+        for field in FIELD_WEIGHTS:
+            value = job.get(field)
+            for text in value if isinstance(value, list) else [value]:
+                for term in tokenize(text):
+                    postings = self.postings.get(term)
+                    if postings is None or postings.pop(job_id, None) is None or postings:
+                        continue
+                    del self.postings[term]
+                    del self.terms[bisect.bisect_left(self.terms, term)]
+        # Its deadline heap entry is skipped when it surfaces
+        return True
+
+    def expire(self, today=None):
+        """
+        Drop jobs whose Application_Deadline is before `today`. Returns how many were dropped.
+        """
+        today = today or datetime.date.today()
+        expired = 0
+        while self.deadlines and self.deadlines[0][0] < today:
+            deadline, job_id = heapq.heappop(self.deadlines)
+            job = self.jobs.get(job_id)
+            if job is not None and job.get("Application_Deadline") == deadline:
+                self.remove(job_id)
+                expired += 1
+        return expired
+
+    def load(self, jobs):
+        """
+        Replace the whole index with `jobs` (catalog records).
+        """
+        self._clear()
+        for job in jobs:
+            self.add(job)
+        self.loaded_at = self.clock()
+
+    def _build(self, jobs):
+        """
+        A new index loaded with `jobs`, built without touching this one.
+        """
+        index = JobSearchIndex(self.k1, self.b, self.refresh, self.clock)
+        index.load(jobs)
+        return index
+
+    def _swap(self, index):
+        """
+        Take over the contents of `index` (see _build). Runs on the event loop, so no
+        search sees a half-replaced index.
+        """
+        self.jobs, self.lengths, self.postings, self.terms = index.jobs, index.lengths, index.postings, index.terms
+        self.total_length, self.deadlines = index.total_length, index.deadlines
+        self._token_scores = {}
+        self.loaded_at = index.loaded_at
+
+    # Queries
+
+    def _expand(self, token):
+        """
+        (term, weight) pairs a query token matches: itself, and for tokens of at least
+        MIN_PREFIX_LENGTH characters the indexed terms it is a prefix of.
+        """
+        matches = [(token, 1.0)] if token in self.postings else []
+        if len(token) >= MIN_PREFIX_LENGTH:
+            i = bisect.bisect_left(self.terms, token)
+            expansions = 0
+            while i < len(self.terms) and self.terms[i].startswith(token) and expansions < MAX_PREFIX_EXPANSIONS:
+                if self.terms[i] != token:
+                    matches.append((self.terms[i], PREFIX_WEIGHT))
+                    expansions += 1
+                i += 1
+        return matches
+
+    def _scores(self, token):
+        """
+        BM25 score of `token` for every job it matches, as a dict and as a list ranked best
+        first. A token scores once per job, through its best matching term.
+        """
+        cached = self._token_scores.get(token)
+        if cached is not None:
+            return cached
+        count = len(self.jobs)
+        average_length = self.total_length / count
+        k1, b = self.k1, self.b
+        scores = {}
+        for term, weight in self._expand(token):
+            postings = self.postings[term]
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for job_id, tf in postings.items():
+                norm = k1 * (1 - b + b * self.lengths[job_id] / average_length)
+                score = weight * idf * tf * (k1 + 1) / (tf + norm)
+                if score > scores.get(job_id, 0.0):
+                    scores[job_id] = score
+        ranked = sorted((-score, job_id) for job_id, score in scores.items())
+        if len(self._token_scores) >= MAX_CACHED_TOKENS:
+            self._token_scores.clear()
+        cached = self._token_scores[token] = (scores, ranked)
+        return cached
+
+    def search(self, query, limit=20):
+        """
+        Jobs matching any query term, best BM25 score first, as (score, catalog record).
+        """
+        self._searches += 1
+        if not self.jobs:
+            return []
+        lists = [self._scores(token) for token in dict.fromkeys(tokenize(query))]
+        lists = [(scores, ranked) for scores, ranked in lists if ranked]
+        if len(lists) == 1:
+            return [(-score, self.jobs[job_id]) for score, job_id in lists[0][1][:limit]]
+
+        # Walk the ranked lists in step; a job's total is the sum of its scores in every
+        # list. No job below the current depth can beat the sum of the scores at that
+        # depth, so stop once the top `limit` totals all reach it.
+        top, totals = [], {}
+        depth = 0
+        while True:
+            threshold, progressed = 0.0, False
+            for _, ranked in lists:
+                if depth >= len(ranked):
+                    continue
+                score, job_id = ranked[depth]
+                threshold -= score
+                progressed = True
+                if job_id not in totals:
+                    total = totals[job_id] = sum(scores.get(job_id, 0.0) for scores, _ in lists)
+                    entry = (total, -job_id)
+                    if len(top) < limit:
+                        heapq.heappush(top, entry)
+                    elif entry > top[0]:
+                        heapq.heapreplace(top, entry)
+            depth += 1
+            if not progressed or (len(top) == limit and top[0][0] >= threshold):
+                break
+        return [(total, self.jobs[-neg_id]) for total, neg_id in sorted(top, reverse=True)]
+
+    # Loading
+
+    @property
+    def loaded(self):
+        return self.loaded_at is not None
+
+    async def _reload(self):
+        self._reloading = True
+        try:
+            db = await acquire_db()
+            try:
+                jobs = await fetch_job_catalog(db)
+            finally:
+                await db.close()
+            # Tokenising the catalog is CPU work: build a separate index off the event loop,
+            # then swap it in between two searches
+            self._swap(await asyncio.get_running_loop().run_in_executor(None, self._build, jobs))
+            for job in self._added_during_reload:
+                if job["Job_ID"] not in self.jobs:
+                    self.add(job)
+        finally:
+            self._reloading = False
+            self._added_during_reload = []
+
+    def _rebuild_done(self, task):
+        self._rebuild = None
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Job search index rebuild failed: {task.exception()}")
+
+    async def ensure_ready(self):
+        """
+        Load the index on first use; afterwards expire passed deadlines and, once it is
+        older than `refresh` seconds, rebuild it in the background while searches go on.
+        """
+        if not self.loaded:
+            async with self._lock:
+                if not self.loaded:
+                    await self._reload()
+        elif self.clock() - self.loaded_at > self.refresh and self._rebuild is None:
+            self._rebuild = asyncio.ensure_future(self._reload())
+            self._rebuild.add_done_callback(self._rebuild_done)
+        self.expire()
+
+    async def add_jobs(self, cursor, job_ids):
+        """
+        Index newly created jobs by reading their catalog records on `cursor`. Does nothing
+        before the index is first loaded, since loading will include them.
+        """
+        if not job_ids or not (self.loaded or self._reloading):
+            return
+        await cursor.execute(
+            f"{JOB_CATALOG_SELECT} {JOB_CATALOG_FROM} WHERE {ACTIVE_JOB_CONDITION} AND j.Job_ID IN ({placeholders(len(job_ids))})",
+            list(job_ids),
+        )
+        for job in build_job_catalog(await cursor.fetchall()):
+            if self._reloading:
+                self._added_during_reload.append(job)
+            if self.loaded:
+                self.add(job)
+
+    def stats(self):
+        return {
+            "name": "job_search",
+            "jobs": len(self.jobs),
+            "terms": len(self.terms),
+            "age_seconds": None if self.loaded_at is None else round(self.clock() - self.loaded_at, 1),
+            "searches_total": self._searches,
+        }
+
+
+job_index = JobSearchIndex(refresh=JOB_SEARCH_REFRESH)
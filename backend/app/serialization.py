@@ -0,0 +1,85 @@
+# Response fast path for large lists read straight from the database
+import datetime
+import decimal
+import functools
+import json
+from fastapi import Response
+from mysql.connector import FieldType
+
+try:
+    import orjson
+except ImportError:
+    # Optional: the stdlib encoder is used instead
+    orjson = None
+
+_DECIMAL_TYPES = {FieldType.DECIMAL, FieldType.NEWDECIMAL}
+
+
+def _default(value):
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8", "replace")
+    raise TypeError(f"Cannot serialise {type(value).__name__}")
+
+
+def dumps(content):
+    """
+    Encode `content` to compact JSON bytes, with orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+@functools.lru_cache(maxsize=256)
+def _compile(names, decimal_positions):
+    if not decimal_positions:
+        return lambda row: dict(zip(names, row))
+
+    def mapper(row):
+        record = dict(zip(names, row))
+        for i in decimal_positions:
+            if row[i] is not None:
+                record[names[i]] = float(row[i])
+        return record
+
+    return mapper
+
+
+def row_mapper(description):
+    """
+    Function turning a result row (tuple) into a dict keyed by column name, with DECIMAL
+    columns as floats the way the response models emit them. Compiled once per result
+    shape and cached.
+    """
+    names = tuple(column[0] for column in description)
+    decimal_positions = tuple(i for i, column in enumerate(description) if column[1] in _DECIMAL_TYPES)
+    return _compile(names, decimal_positions)
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response for trusted database output: the content is encoded as is.
+
+    Returning a Response from a route skips FastAPI's response_model validation and
+    jsonable_encoder pass, so the route keeps its response_model for the OpenAPI schema
+    but must build content of that shape itself.
+    """
+    media_type = "application/json"
+
+    def render(self, content):
+        return dumps(content)
+
+
+def fast_response(content, response=None):
+    """
+    FastJSONResponse for `content`, carrying the headers a route set on its injected
+    `response` (e.g. X-Next-Cursor), which FastAPI only applies to non-Response returns.
+    """
+    fast = FastJSONResponse(content)
+    if response is not None:
+        fast.headers.raw.extend(response.headers.raw)
+    return fast
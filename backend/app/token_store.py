@@ -0,0 +1,223 @@
+# Refresh token store
+import asyncio
+import hashlib
+import os
+import secrets
+import uuid
+import mysql.connector
+from fastapi import HTTPException
+from cache import TTLCache
+from db.connections import acquire_db
+
+REFRESH_TOKEN_TTL_DAYS = int(os.getenv("REFRESH_TOKEN_TTL_DAYS") or 30)
+REFRESH_TOKEN_PURGE_INTERVAL = float(os.getenv("REFRESH_TOKEN_PURGE_INTERVAL") or 3600)
+REFRESH_TOKEN_PURGE_BATCH = int(os.getenv("REFRESH_TOKEN_PURGE_BATCH") or 1000)
+REVOKED_TOKEN_CACHE_SIZE = int(os.getenv("REVOKED_TOKEN_CACHE_SIZE") or 10000)
+
+
+def hash_token(token):
+    """
+    Fixed-width key of a refresh token. Tokens are 256 random bits, so a plain SHA-256
+    is enough: the raw token is never stored.
+    """
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+class RefreshTokenStore:
+    """
+    Refresh tokens grouped into families: login starts a family, every refresh rotates the
+    token within it. Presenting a token that was already rotated means it leaked, so the
+    whole family is revoked.
+
+    Hashes of tokens revoked by logout or by a family revocation are remembered in memory, so
+    replays and double logouts are rejected without a database round trip. Rotated tokens are
+    not: a replayed one must reach the database so the reuse revokes its family. Expired rows
+    are deleted in batches by run_purger(); revoked rows are kept until they expire so reuse
+    can still be detected.
+    """
+
+    def __init__(self, ttl_days=30, purge_interval=3600, purge_batch=1000, revoked_cache_size=10000):
+        self.ttl_seconds = ttl_days * 86400
+        self.purge_interval = purge_interval
+        self.purge_batch = purge_batch
+        self.revoked = TTLCache(self.ttl_seconds, name="revoked_refresh_tokens", max_entries=revoked_cache_size)
+        self._purged = 0
+        self._reuse_detected = 0
+
+    async def issue(self, db, user_id, role=None, family_id=None):
+        """
+        Store a new refresh token for `user_id` and return it. Does not commit.
+        """
+        token = secrets.token_urlsafe(32)
+        cursor = db.cursor()
+        try:
+            await cursor.execute(
+                """
+                INSERT INTO refresh_tokens (token_hash, family_id, user_id, role, expiry_date)
+                VALUES (%s, %s, %s, %s, UTC_TIMESTAMP() + INTERVAL %s SECOND)
+                """,
+                (hash_token(token), family_id or uuid.uuid4().bytes, user_id, role, self.ttl_seconds),
+            )
+        finally:
+            await cursor.close()
+        return token
+
+    async def rotate(self, db, token):
+        """
+        Revoke `token` and issue its successor in the same family, in one transaction.
+        Returns (new_token, user_id, role); raises a 401 HTTPException if the token is
+        unknown, expired or revoked.
+        """
+        token_hash = hash_token(token)
+        if token_hash in self.revoked:
+            raise HTTPException(status_code=401, detail="Invalid refresh token")
+
+        cursor = db.cursor()
+        try:
+            await cursor.execute(
+                """
+                SELECT family_id, user_id, role, revoked, expiry_date > UTC_TIMESTAMP()
+                FROM refresh_tokens WHERE token_hash = %s FOR UPDATE
+                """,
+                (token_hash,),
+            )
+            row = await cursor.fetchone()
+            if not row or not row[4]:
+                await db.rollback()
+                raise HTTPException(status_code=401, detail="Invalid refresh token")
+
+            family_id, user_id, role, revoked, _ = row
+            if revoked:
+                # A rotated token came back: treat the whole family as compromised
+                self._reuse_detected += 1
+                await cursor.execute(
+                    "UPDATE refresh_tokens SET revoked = TRUE WHERE family_id = %s AND revoked = FALSE",
+                    (family_id,),
+                )
+                await db.commit()
+                self.revoked.set(token_hash, True)
+                raise HTTPException(status_code=401, detail="Invalid refresh token")
+
+            await cursor.execute("UPDATE refresh_tokens SET revoked = TRUE WHERE token_hash = %s", (token_hash,))
+        finally:
+            await cursor.close()
+
+        new_token = await self.issue(db, user_id, role, family_id)
+        await db.commit()
+        # Not cached as revoked: a replay of this token has to find its row and revoke the family
+        return new_token, user_id, role
+
+    async def revoke(self, db, token):
+        """
+        Revoke one token (logout). Returns False if it does not exist or was already revoked.
+        """
+        token_hash = hash_token(token)
+        if token_hash in self.revoked:
+            return False
+        cursor = db.cursor()
+        try:
+            await cursor.execute(
+                "UPDATE refresh_tokens SET revoked = TRUE WHERE token_hash = %s AND revoked = FALSE",
+                (token_hash,),
+            )
+            revoked = cursor.rowcount > 0
+        finally:
+            await cursor.close()
+        await db.commit()
+        # Unknown, rotated or already revoked tokens stay out of the cache: they would evict
+        # real entries, and a rotated one must still reach rotate()'s reuse check
+        if revoked:
+            self.revoked.set(token_hash, True)
+        return revoked
+
+    async def revoke_user(self, db, token):
+        """
+        Revoke every live token of the user that owns `token` (logout everywhere).
+        Returns the number of sessions revoked, or None if `token` is not a live token.
+        """
+        token_hash = hash_token(token)
+        if token_hash in self.revoked:
+            return None
+        cursor = db.cursor()
+        try:
+            await cursor.execute(
+                """
+                SELECT user_id, role FROM refresh_tokens
+                WHERE token_hash = %s AND revoked = FALSE AND expiry_date > UTC_TIMESTAMP()
+                """,
+                (token_hash,),
+            )
+            row = await cursor.fetchone()
+            if not row:
+                return None
+            user_id, role = row
+            await cursor.execute(
+                """
+                UPDATE refresh_tokens SET revoked = TRUE
+                WHERE user_id = %s AND role <=> %s AND revoked = FALSE AND expiry_date > UTC_TIMESTAMP()
+                """,
+                (user_id, role),
+            )
+            count = cursor.rowcount
+        finally:
+            await cursor.close()
+        await db.commit()
+        self.revoked.set(token_hash, True)
+        return count
+
+    async def purge_expired(self, db):
+        """
+        Delete expired rows in batches of `purge_batch`, committing after each batch so
+        no lock is held for long. Returns the number of rows deleted.
+        """
+        total = 0
+        cursor = db.cursor()
+        try:
+            while True:
+                await cursor.execute(
+                    "DELETE FROM refresh_tokens WHERE expiry_date < UTC_TIMESTAMP() LIMIT %s",
+                    (self.purge_batch,),
+                )
+                deleted = cursor.rowcount
+                await db.commit()
+                total += deleted
+                if deleted < self.purge_batch:
+                    break
+                # Let request handlers at the pool between batches
+                await asyncio.sleep(0)
+        finally:
+            await cursor.close()
+        self._purged += total
+        return total
+
+    async def run_purger(self):
+        """
+        Background task: purge expired tokens every `purge_interval` seconds until cancelled.
+        """
+        while True:
+            await asyncio.sleep(self.purge_interval)
+            try:
+                db = await acquire_db()
+                try:
+                    deleted = await self.purge_expired(db)
+                finally:
+                    await db.close()
+                if deleted:
+                    print(f"Purged {deleted} expired refresh tokens")
+            except (HTTPException, mysql.connector.Error) as e:
+                print(f"Refresh token purge failed: {e}")
+
+    def stats(self):
+        return {
+            "revoked_cached": self.revoked.stats()["entries"],
+            "reuse_detected_total": self._reuse_detected,
+            "purged_total": self._purged,
+        }
+
+
+token_store = RefreshTokenStore(
+    ttl_days=REFRESH_TOKEN_TTL_DAYS,
+    purge_interval=REFRESH_TOKEN_PURGE_INTERVAL,
+    purge_batch=REFRESH_TOKEN_PURGE_BATCH,
+    revoked_cache_size=REVOKED_TOKEN_CACHE_SIZE,
+)
@@ -0,0 +1,80 @@
+"""
+Concurrent-request throughput of a blocking `async def` handler versus one that
+awaits the database through `db.connections.get_db`.
+
+Both endpoints run `SELECT SLEEP(%s)` against the database configured in `.env`,
+so the numbers show how many requests a single worker can keep in flight.
+
+Usage (from backend/):
+    python benchmarks/bench_async_db.py --requests 50 --concurrency 10 --delay 0.05
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+import httpx
+import mysql.connector
+from fastapi import Depends, FastAPI
+
+from db.connections import AsyncConnection, dbconfig, get_db
+
+app = FastAPI()
+
+
+@app.get("/blocking")
+async def blocking(delay: float):
+    # The pre-asyncio pattern: a synchronous driver call inside an async handler
+    db = mysql.connector.connect(**dbconfig)
+    cursor = db.cursor()
+    try:
+        cursor.execute("SELECT SLEEP(%s)", (delay,))
+        cursor.fetchall()
+    finally:
+        cursor.close()
+        db.close()
+    return {"ok": True}
+
+
+@app.get("/offloaded")
+async def offloaded(delay: float, db: AsyncConnection = Depends(get_db)):
+    cursor = db.cursor()
+    try:
+        await cursor.execute("SELECT SLEEP(%s)", (delay,))
+        await cursor.fetchall()
+    finally:
+        await cursor.close()
+    return {"ok": True}
+
+
+async def drive(path, total, concurrency, delay):
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                response = await client.get(path, params={"delay": delay})
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        return time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--delay", type=float, default=0.05, help="server-side query time in seconds")
+    args = parser.parse_args()
+
+    for label, path in (("before (blocking)", "/blocking"), ("after (get_db)", "/offloaded")):
+        elapsed = await drive(path, args.requests, args.concurrency, args.delay)
+        print(f"{label:<20} {args.requests / elapsed:8.1f} req/s  ({elapsed:.2f}s for {args.requests} requests)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,123 @@
+"""
+Eligibility matching: every job against every student with the columnar engine in
+eligibility.py, checked against a plain Python loop over a sample of jobs.
+
+Runs without a database. Builds --students synthetic Student rows and --jobs jobs with
+free-text criteria ("CGPA > 7", "CSE/IT only", "2025 batch", "No backlogs", ...), then
+reports the snapshot build time, the time to size every job's eligible pool (the full
+students x jobs match), and the median latency of the two lookups the routes make.
+
+Usage (from backend/):
+    python benchmarks/bench_eligibility.py --students 100000 --jobs 5000
+"""
+import argparse
+import datetime
+import decimal
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from eligibility import EligibilityEngine
+
+DEPARTMENTS = ["Computer Science and Engineering", "Information Technology", "Electronics and Communication Engineering",
+               "Electrical Engineering", "Mechanical Engineering", "Civil Engineering", "Chemical Engineering",
+               "Biotechnology", "Mathematics", "Physics"]
+ACRONYMS = ["CSE", "IT", "ECE", "EE", "ME", "CE"]
+YEARS = [2023, 2024, 2025, 2026, 2027]
+
+
+def make_students(count, rng):
+    return [
+        (i, None if rng.random() < 0.01 else decimal.Decimal(f"{rng.uniform(5, 10):.2f}"),
+         rng.choice(YEARS), rng.choice(DEPARTMENTS))
+        for i in range(1, count + 1)
+    ]
+
+
+def make_job_rows(count, rng):
+    deadline = datetime.date.today() + datetime.timedelta(days=30)
+    rows = []
+    for job_id in range(1, count + 1):
+        criteria = []
+        if rng.random() < 0.8:
+            criteria.append(f"CGPA {rng.choice(['>', '>=', 'minimum'])} {rng.choice([6, 6.5, 7, 7.5, 8, 8.5])}")
+        if rng.random() < 0.6:
+            criteria.append("/".join(rng.sample(ACRONYMS, rng.randint(1, 3))) + " only")
+        if rng.random() < 0.5:
+            criteria.append(f"{rng.choice(YEARS[1:4])} batch")
+        if rng.random() < 0.3:
+            criteria.append("No backlogs")
+        rows.extend((job_id, job_id % 500, deadline, criterion) for criterion in criteria or [None])
+    return rows
+
+
+def naive_pool(requirements, students):
+    departments = None if requirements.departments is None else {d.lower() for d in requirements.departments}
+    return sorted(
+        student_id for student_id, cgpa, year, department in students
+        if (requirements.min_cgpa is None or (cgpa is not None and float(cgpa) >= requirements.min_cgpa))
+        and (departments is None or department.lower() in departments)
+        and (requirements.years is None or year in requirements.years)
+    )
+
+
+def median_time(call, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--check", type=int, default=20, help="jobs to verify against the Python loop")
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    student_rows = make_students(args.students, rng)
+    job_rows = make_job_rows(args.jobs, rng)
+
+    engine = EligibilityEngine()
+    started = time.perf_counter()
+    engine.students, engine.jobs = engine.build(student_rows, job_rows)
+    print(f"{args.students} students x {args.jobs} jobs, snapshot built in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    started = time.perf_counter()
+    sizes = engine.jobs.pool_sizes(engine.students)
+    elapsed = time.perf_counter() - started
+    print(f"  full match (pool size of every job)  {elapsed * 1000:8.2f} ms, "
+          f"{int(sizes.sum())} eligible pairs, {sizes.mean():.0f} students per job")
+
+    job_ids = [rng.randrange(1, args.jobs + 1) for _ in range(args.repeat)]
+    student_ids = [rng.randrange(1, args.students + 1) for _ in range(args.repeat)]
+    per_job = median_time(lambda: engine.eligible_students(job_ids.pop()), args.repeat)
+    per_student = median_time(lambda: engine.eligible_jobs(student_ids.pop()), args.repeat)
+    print(f"  eligible students of one job        {per_job * 1000:8.3f} ms")
+    print(f"  eligible jobs of one student        {per_student * 1000:8.3f} ms")
+
+    mismatches = 0
+    for job_id in rng.sample(range(1, args.jobs + 1), args.check):
+        requirements, pool = engine.eligible_students(job_id)
+        expected = naive_pool(requirements, student_rows)
+        position = engine.jobs.positions[job_id]
+        if sorted(pool) != expected or sizes[position] != len(expected):
+            mismatches += 1
+    started = time.perf_counter()
+    naive_pool(engine.jobs.requirements[1], student_rows)
+    naive = time.perf_counter() - started
+    print(f"  Python loop, one job                {naive * 1000:8.2f} ms "
+          f"(x{args.jobs} jobs ~ {naive * args.jobs:.0f} s)")
+    print(f"  {args.check} jobs checked against the loop, mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
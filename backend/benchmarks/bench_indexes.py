@@ -0,0 +1,176 @@
+"""
+EXPLAIN plans and timings of the hot lookup paths before and after their indexes.
+
+Creates scratch copies of the affected tables (bench_*), keeping the single-column
+indexes InnoDB adds for their foreign keys so "before" matches the real schema, seeds
+them with --rows rows, and runs each lookup --repeat times before and after creating
+the index defined for it in app/db/scripts/create_indexes.sql. The scratch tables are
+dropped afterwards.
+
+Usage (from backend/):
+    python benchmarks/bench_indexes.py --rows 200000 --repeat 200
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+import mysql.connector
+
+from db.connections import dbconfig
+
+INDEX_SCRIPT = os.path.join(os.path.dirname(__file__), "..", "app", "db", "scripts", "create_indexes.sql")
+
+# table -> (scratch DDL, row generator, [(index name, lookup query, argument generator)])
+CASES = {
+    "Application": (
+        """
+        CREATE TABLE bench_application (
+            Application_ID INT PRIMARY KEY AUTO_INCREMENT,
+            Student_ID INT, Job_ID INT, Application_Date DATE, Status VARCHAR(50),
+            KEY (Student_ID), KEY (Job_ID)
+        )
+        """,
+        ("INSERT INTO bench_application (Student_ID, Job_ID, Application_Date, Status) VALUES (%s, %s, CURDATE(), 'Pending')",
+         lambda i, n: (random.randrange(n // 20 + 1), random.randrange(2000))),
+        [("idx_application_student_job",
+          "SELECT 1 FROM bench_application WHERE Student_ID = %s AND Job_ID = %s",
+          lambda n: (random.randrange(n // 20 + 1), random.randrange(2000)))],
+    ),
+    "Training_Enrollment": (
+        """
+        CREATE TABLE bench_training_enrollment (
+            Enrollment_ID INT PRIMARY KEY AUTO_INCREMENT,
+            Training_ID INT, Student_ID INT, Performance_Grade VARCHAR(10), Completion_Status VARCHAR(20),
+            KEY (Training_ID), KEY (Student_ID)
+        )
+        """,
+        ("INSERT INTO bench_training_enrollment (Training_ID, Student_ID, Completion_Status) VALUES (%s, %s, 'Enrolled')",
+         lambda i, n: (random.randrange(500), random.randrange(n // 5 + 1))),
+        [("idx_enrollment_student_training",
+          "SELECT 1 FROM bench_training_enrollment WHERE Training_ID = %s AND Student_ID = %s",
+          lambda n: (random.randrange(500), random.randrange(n // 5 + 1)))],
+    ),
+    "Job": (
+        """
+        CREATE TABLE bench_job (
+            Job_ID INT PRIMARY KEY AUTO_INCREMENT,
+            Job_Title VARCHAR(100), Company_ID INT, Application_Deadline DATE,
+            KEY (Company_ID)
+        )
+        """,
+        ("INSERT INTO bench_job (Job_Title, Company_ID, Application_Deadline) VALUES (%s, %s, CURDATE() + INTERVAL %s DAY)",
+         lambda i, n: (f"job-{i}", random.randrange(1000), random.randrange(-365, 365))),
+        [("idx_job_company_deadline",
+          "SELECT Job_ID FROM bench_job WHERE Company_ID = %s AND Application_Deadline >= CURDATE()",
+          lambda n: (random.randrange(1000),))],
+    ),
+    "refresh_tokens": (
+        """
+        CREATE TABLE bench_refresh_tokens (
+            token_hash BINARY(32) PRIMARY KEY, family_id BINARY(16) NOT NULL,
+            user_id INT NOT NULL, expiry_date DATETIME NOT NULL, revoked BOOLEAN NOT NULL DEFAULT FALSE
+        )
+        """,
+        ("INSERT INTO bench_refresh_tokens (token_hash, family_id, user_id, expiry_date) "
+         "VALUES (UNHEX(SHA2(%s, 256)), UNHEX(MD5(%s)), %s, UTC_TIMESTAMP() + INTERVAL %s HOUR)",
+         lambda i, n: (f"token-{i}", f"family-{i // 4}", random.randrange(n // 10 + 1), random.randrange(-500, 500))),
+        [("idx_refresh_tokens_user_expiry",
+          "SELECT token_hash FROM bench_refresh_tokens WHERE user_id = %s AND revoked = FALSE AND expiry_date > UTC_TIMESTAMP()",
+          lambda n: (random.randrange(n // 10 + 1),))],
+    ),
+    "Student_Phone": (
+        """
+        CREATE TABLE bench_student_phone (
+            Phone_No VARCHAR(15), Student_ID INT,
+            KEY (Student_ID)
+        )
+        """,
+        ("INSERT INTO bench_student_phone (Phone_No, Student_ID) VALUES (%s, %s)",
+         lambda i, n: (f"9{i:09d}", i // 2)),
+        [("idx_student_phone_student",
+          "SELECT MIN(Phone_No) FROM bench_student_phone WHERE Student_ID = %s",
+          lambda n: (random.randrange(n // 2),))],
+    ),
+}
+
+
+def load_index_columns():
+    """
+    Index name -> column list, as created at setup.
+    """
+    with open(INDEX_SCRIPT) as f:
+        script = f.read()
+    return {
+        name: columns
+        for _, name, columns in re.findall(r"CALL CreateIndexIfNotExists\('(\w+)', '(\w+)', '([^']+)'\)", script)
+    }
+
+
+def explain(cursor, query, args):
+    cursor.execute("EXPLAIN " + query, args)
+    columns = [column[0] for column in cursor.description]
+    row = dict(zip(columns, cursor.fetchone()))
+    cursor.fetchall()
+    return f"type={row['type']} key={row['key']} rows={row['rows']} extra={row['Extra']}"
+
+
+def timed(cursor, query, make_args, rows, repeat):
+    arguments = [make_args(rows) for _ in range(repeat)]
+    start = time.perf_counter()
+    for args in arguments:
+        cursor.execute(query, args)
+        cursor.fetchall()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=5000)
+    args = parser.parse_args()
+
+    random.seed(42)
+    index_columns = load_index_columns()
+    config = dict(dbconfig, raise_on_warnings=False)
+    connection = mysql.connector.connect(**config)
+    cursor = connection.cursor()
+    scratch_tables = []
+    try:
+        for table, (ddl, (insert, make_row), lookups) in CASES.items():
+            scratch = "bench_" + table.lower()
+            cursor.execute(f"DROP TABLE IF EXISTS {scratch}")
+            cursor.execute(ddl)
+            scratch_tables.append(scratch)
+            for offset in range(0, args.rows, args.batch):
+                batch = range(offset, min(offset + args.batch, args.rows))
+                cursor.executemany(insert, [make_row(i, args.rows) for i in batch])
+            connection.commit()
+            cursor.execute(f"ANALYZE TABLE {scratch}")
+            cursor.fetchall()
+
+            for index, query, make_args in lookups:
+                sample = make_args(args.rows)
+                print(f"{table}: {index} ({index_columns[index]})")
+                print(f"  before  {explain(cursor, query, sample)}")
+                before = timed(cursor, query, make_args, args.rows, args.repeat)
+                cursor.execute(f"CREATE INDEX {index} ON {scratch} ({index_columns[index]})")
+                cursor.execute(f"ANALYZE TABLE {scratch}")
+                cursor.fetchall()
+                print(f"  after   {explain(cursor, query, sample)}")
+                after = timed(cursor, query, make_args, args.rows, args.repeat)
+                print(f"  {before * 1000:8.3f} ms -> {after * 1000:8.3f} ms per lookup ({before / after:.1f}x)")
+    finally:
+        for scratch in scratch_tables:
+            cursor.execute(f"DROP TABLE IF EXISTS {scratch}")
+        cursor.close()
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
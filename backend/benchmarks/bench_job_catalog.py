@@ -0,0 +1,85 @@
+"""
+Job catalog build: exploded Location x Eligibility rows versus one record per job.
+
+Runs without a database. It synthesises --jobs active jobs, each with --locations
+locations and --criteria eligibility criteria, and compares:
+  before: one JobResponse per joined row (what GET /job/ used to return)
+  after:  the aggregated rows grouped by catalog.build_job_catalog
+reporting rows transferred, build time and JSON payload size.
+
+Usage (from backend/):
+    python benchmarks/bench_job_catalog.py --jobs 2000 --locations 5 --criteria 4
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from catalog import build_job_catalog
+from models.jobs import JobListResponse, JobResponse
+
+
+def base_row(job_id):
+    return (
+        job_id, f"Engineer {job_id}", 950000.0, f"Company {job_id % 97}", "Full-Time",
+        datetime.date.today() + datetime.timedelta(days=30), "Build and run things.", 3,
+    )
+
+
+def exploded_rows(jobs, locations, criteria):
+    for job_id in range(1, jobs + 1):
+        for l in range(locations):
+            for e in range(criteria):
+                yield base_row(job_id) + (f"City {l}", f"Criterion {e}")
+
+
+def aggregated_rows(jobs, locations, criteria):
+    location_list = json.dumps([f"City {l}" for l in range(locations)])
+    criteria_list = json.dumps([f"Criterion {e}" for e in range(criteria)])
+    for job_id in range(1, jobs + 1):
+        yield base_row(job_id) + (location_list, criteria_list)
+
+
+def before(rows):
+    return JobListResponse(jobs=[
+        JobResponse(
+            Job_ID=row[0], Title=row[1], Salary=row[2], Company_Name=row[3], Job_Type=row[4],
+            Application_Deadline=row[5], Job_Description=row[6], Vacancies=row[7],
+            Location_List=row[8].split(",") if row[8] else [],
+            Eligibility_Criteria_List=row[9].split(",") if row[9] else [],
+        )
+        for row in rows
+    ])
+
+
+def after(rows):
+    return JobListResponse(jobs=[JobResponse(**job) for job in build_job_catalog(rows)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--locations", type=int, default=5)
+    parser.add_argument("--criteria", type=int, default=4)
+    args = parser.parse_args()
+
+    for label, build, rows in (
+        ("before (exploded)", before, list(exploded_rows(args.jobs, args.locations, args.criteria))),
+        ("after (catalog)", after, list(aggregated_rows(args.jobs, args.locations, args.criteria))),
+    ):
+        start = time.perf_counter()
+        response = build(rows)
+        payload = response.model_dump_json()
+        elapsed = time.perf_counter() - start
+        print(
+            f"{label:<18} rows={len(rows):8d}  records={len(response.jobs):8d}  "
+            f"{elapsed * 1000:8.1f} ms  payload={len(payload) / 1024:9.1f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Job search: the in-process BM25 index behind GET /job/search versus scanning the job
+catalog with substring matches (what a LIKE '%term%' query over the same fields does).
+
+Runs without a database. Builds --jobs synthetic catalog records, indexes them and runs a
+fixed set of queries --repeat times each, reporting the median latency per query and the
+index build time.
+
+Usage (from backend/):
+    python benchmarks/bench_job_search.py --jobs 20000 --repeat 200
+"""
+import argparse
+import datetime
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from search import FIELD_WEIGHTS, JobSearchIndex
+
+TITLES = ["Software Engineer", "Data Analyst", "Python Developer", "C++ Engineer", "Product Manager",
+          "DevOps Engineer", "Frontend Developer", "Machine Learning Engineer", "QA Analyst", "Business Analyst"]
+SKILLS = ["python", "java", "sql", "react", "kubernetes", "aws", "spark", "tableau", "rust", "golang",
+          "excel", "tensorflow", "docker", "linux", "typescript", "django", "fastapi", "hadoop"]
+CITIES = ["Pune", "Bangalore", "Delhi", "Hyderabad", "Chennai", "Mumbai", "Kolkata", "Noida", "Remote"]
+CRITERIA = ["CGPA > 7", "CGPA > 8", "B.Tech", "M.Tech", "No backlogs", "MBA", "B.Sc"]
+QUERIES = ["python", "pyth pune", "data analyst bangalore", "c++", "machine learning tensorflow",
+           "kube", "frontend react remote", "cgpa"]
+
+
+def make_jobs(count, seed=7):
+    rng = random.Random(seed)
+    deadline = datetime.date.today() + datetime.timedelta(days=30)
+    return [
+        {
+            "Job_ID": i,
+            "Title": rng.choice(TITLES),
+            "Salary": rng.randrange(300000, 3000000, 10000),
+            "Company_Name": f"Company {i % 500}",
+            "Job_Type": rng.choice(["Full-time", "Intern"]),
+            "Application_Deadline": deadline,
+            "Job_Description": " ".join(rng.choices(SKILLS, k=12)) + " and related work",
+            "Vacancies": rng.randint(1, 10),
+            "Location_List": rng.sample(CITIES, 2),
+            "Eligibility_Criteria_List": rng.sample(CRITERIA, 2),
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def scan(jobs, query, limit):
+    terms = query.lower().split()
+    matches = []
+    for job in jobs:
+        text = " ".join(
+            " ".join(value) if isinstance(value, list) else str(value)
+            for value in (job[field] for field in FIELD_WEIGHTS)
+        ).lower()
+        hits = sum(1 for term in terms if term in text)
+        if hits:
+            matches.append((hits, job))
+    matches.sort(key=lambda item: -item[0])
+    return matches[:limit]
+
+
+def measure(search, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        search()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    jobs = make_jobs(args.jobs)
+    index = JobSearchIndex()
+    started = time.perf_counter()
+    index.load(jobs)
+    print(f"{args.jobs} jobs, {len(index.terms)} terms, built in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    scan_repeat = max(1, args.repeat // 20)
+    for query in QUERIES:
+        indexed = measure(lambda: index.search(query, 20), args.repeat)
+        scanned = measure(lambda: scan(jobs, query, 20), scan_repeat)
+        print(f"  {query!r:32} index {indexed * 1000:7.3f} ms   scan {scanned * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+"""
+End-to-end HTTP load test: scenario mixes of real API calls against the app and a MySQL
+database, with throughput and p50/p95/p99 latency per route, saved as JSON.
+
+Targets either a running server (--url, e.g. `uvicorn main:app --workers 4`) or the app
+in-process through httpx's ASGI transport (--in-process, lifespan included). Either way the
+database is the one configured in `.env`: point it at a local MySQL seeded with
+bench_seed_data.py, whose students all share --password.
+
+Workload models:
+  closed  --users virtual users, each sending its next request when the previous one
+          finished (plus --think seconds)
+  open    requests arrive at --rate per second (Poisson) whether or not earlier ones
+          finished; latency counts from the scheduled arrival, so a stalled server shows
+          up as queueing instead of a lower request rate
+Scenarios (--scenario, weights in SCENARIOS):
+  login_storm    mostly POST /login
+  job_browse     job listing and search, dashboards, eligible jobs
+  deadline_rush  students applying to jobs whose deadline is within --rush-days
+  mixed          a bit of everything
+
+Usage (from backend/):
+    python benchmarks/bench_load.py --scenario job_browse --model closed --users 50 --duration 30 \\
+        --output results/job_browse.json
+    python benchmarks/bench_load.py --scenario deadline_rush --model open --rate 200 --in-process
+    python benchmarks/bench_load.py --compare results/before.json results/after.json
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+import httpx
+
+SEARCH_TERMS = ["python", "data", "engineer", "analyst", "java", "cloud", "intern", "sales", "design", "mech"]
+
+# action -> weight, per scenario
+SCENARIOS = {
+    "login_storm": {"login": 85, "admin_stats": 5, "jobs": 10},
+    "job_browse": {
+        "jobs": 35, "jobs_filtered": 10, "job_search": 15, "eligible_jobs": 10,
+        "all_records": 10, "admin_stats": 10, "applications": 5, "login": 5,
+    },
+    "deadline_rush": {"apply": 55, "jobs_rush": 30, "applications": 5, "login": 10},
+    "mixed": {
+        "login": 10, "jobs": 25, "job_search": 10, "eligible_jobs": 10, "apply": 15,
+        "all_records": 10, "admin_stats": 10, "applications": 10,
+    },
+}
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+class Recorder:
+    """
+    Latencies and status codes per route. Only requests started after the warm-up count.
+    """
+
+    def __init__(self):
+        self.recording = False
+        self.started = None
+        self.stopped = None
+        self.latencies = {}
+        self.statuses = {}
+        self.dropped = 0
+
+    def start(self):
+        self.recording = True
+        self.started = time.perf_counter()
+
+    def stop(self):
+        self.recording = False
+        self.stopped = time.perf_counter()
+
+    def record(self, route, status, seconds):
+        if not self.recording:
+            return
+        self.latencies.setdefault(route, []).append(seconds)
+        statuses = self.statuses.setdefault(route, {})
+        statuses[status] = statuses.get(status, 0) + 1
+
+    def summary(self):
+        elapsed = (self.stopped or time.perf_counter()) - self.started
+        routes = {}
+        for route in sorted(self.latencies):
+            latencies = self.latencies[route]
+            statuses = self.statuses[route]
+            errors = sum(count for status, count in statuses.items() if not 200 <= status < 400)
+            routes[route] = {
+                "requests": len(latencies),
+                "errors": errors,
+                "throughput_rps": round(len(latencies) / elapsed, 2),
+                "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+                "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+                "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+                "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2),
+                "max_ms": round(max(latencies) * 1000, 2),
+                "statuses": {str(status): count for status, count in sorted(statuses.items())},
+            }
+        everything = [value for latencies in self.latencies.values() for value in latencies]
+        total = {
+            "requests": len(everything),
+            "errors": sum(route["errors"] for route in routes.values()),
+            "throughput_rps": round(len(everything) / elapsed, 2),
+            "dropped": self.dropped,
+            "seconds": round(elapsed, 3),
+        }
+        if everything:
+            total.update(
+                p50_ms=round(percentile(everything, 50) * 1000, 2),
+                p95_ms=round(percentile(everything, 95) * 1000, 2),
+                p99_ms=round(percentile(everything, 99) * 1000, 2),
+            )
+        return {"total": total, "routes": routes}
+
+
+class LoadRun:
+    """
+    Shared state of one run: the client, known jobs, student sessions and the actions.
+    """
+
+    def __init__(self, client, recorder, args):
+        self.client = client
+        self.recorder = recorder
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.student_ids = range(args.first_student, args.first_student + args.students)
+        self.tokens = {}
+        self.applied = set()
+        self.jobs = []
+        self.rush_jobs = []
+
+    async def request(self, route, method, url, scheduled=None, **kwargs):
+        started = time.perf_counter() if scheduled is None else scheduled
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            status = response.status_code
+        except httpx.HTTPError:
+            response, status = None, 599
+        self.recorder.record(route, status, time.perf_counter() - started)
+        return response
+
+    async def discover_jobs(self):
+        """
+        Active job IDs and their deadlines, from GET /job/ (not recorded).
+        """
+        cursor = None
+        while len(self.jobs) < self.args.max_jobs:
+            params = {"limit": 1000, **({"cursor": cursor} if cursor else {})}
+            response = await self.client.get("/job/", params=params)
+            if response.status_code != 200:
+                break
+            for job in response.json()["jobs"]:
+                self.jobs.append((job["Job_ID"], datetime.date.fromisoformat(job["Application_Deadline"])))
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        rush_until = datetime.date.today() + datetime.timedelta(days=self.args.rush_days)
+        self.rush_jobs = [job_id for job_id, deadline in self.jobs if deadline <= rush_until] or [
+            job_id for job_id, _ in self.jobs
+        ]
+
+    def student(self):
+        return self.rng.choice(self.student_ids)
+
+    async def session(self, scheduled=None):
+        """
+        A logged-in student: (student_id, headers), logging one in if needed.
+        """
+        if self.tokens and len(self.tokens) >= min(len(self.student_ids), self.args.sessions):
+            student_id = self.rng.choice(list(self.tokens))
+            return student_id, self.tokens[student_id]
+        student_id = self.student()
+        await self.login(student_id, scheduled)
+        return student_id, self.tokens.get(student_id)
+
+    async def login(self, student_id=None, scheduled=None):
+        student_id = student_id or self.student()
+        response = await self.request(
+            "POST /login", "POST", "/login", scheduled,
+            json={"role": "student", "user_id": student_id, "password": self.args.password},
+        )
+        if response is not None and response.status_code == 200:
+            self.tokens[student_id] = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def action_login(self, scheduled):
+        await self.login(scheduled=scheduled)
+
+    async def action_jobs(self, scheduled):
+        await self.request("GET /job/", "GET", "/job/", scheduled, params={"limit": 100})
+
+    async def action_jobs_filtered(self, scheduled):
+        params = {"limit": 50, "sort": "salary", "order": "desc", "min_salary": self.rng.choice([300000, 600000, 1000000])}
+        await self.request("GET /job/", "GET", "/job/", scheduled, params=params)
+
+    async def action_jobs_rush(self, scheduled):
+        today = datetime.date.today()
+        params = {
+            "limit": 100, "sort": "deadline",
+            "deadline_from": today.isoformat(),
+            "deadline_to": (today + datetime.timedelta(days=self.args.rush_days)).isoformat(),
+        }
+        await self.request("GET /job/", "GET", "/job/", scheduled, params=params)
+
+    async def action_job_search(self, scheduled):
+        query = " ".join(self.rng.sample(SEARCH_TERMS, self.rng.choice([1, 1, 2])))
+        await self.request("GET /job/search", "GET", "/job/search", scheduled, params={"q": query})
+
+    async def action_eligible_jobs(self, scheduled):
+        student_id = self.student()
+        await self.request(
+            "GET /students/{student_id}/eligible_jobs", "GET", f"/students/{student_id}/eligible_jobs", scheduled
+        )
+
+    async def action_applications(self, scheduled):
+        student_id = self.student()
+        await self.request(
+            "GET /students/applications/{student_id}", "GET", f"/students/applications/{student_id}", scheduled
+        )
+
+    async def action_all_records(self, scheduled):
+        await self.request("GET /record/all_records", "GET", "/record/all_records", scheduled)
+
+    async def action_admin_stats(self, scheduled):
+        await self.request("GET /admin/stats", "GET", "/admin/stats", scheduled)
+
+    async def action_apply(self, scheduled):
+        student_id, headers = await self.session(scheduled)
+        if headers is None or not self.rush_jobs:
+            return
+        # Skip pairs this run already sent: ApplyToJob rejects duplicates
+        for _ in range(5):
+            job_id = self.rng.choice(self.rush_jobs)
+            if (student_id, job_id) not in self.applied:
+                break
+        self.applied.add((student_id, job_id))
+        await self.request(
+            "POST /students/apply", "POST", "/students/apply", scheduled,
+            json={"jobId": job_id}, headers=headers,
+        )
+
+    def picker(self, scenario):
+        actions = [getattr(self, f"action_{name}") for name in scenario]
+        weights = list(scenario.values())
+        return lambda: self.rng.choices(actions, weights)[0]
+
+
+async def run_closed(run, pick, users, deadline, think):
+    async def user():
+        while time.perf_counter() < deadline:
+            await pick()(None)
+            if think:
+                await asyncio.sleep(run.rng.expovariate(1 / think))
+
+    await asyncio.gather(*(user() for _ in range(users)))
+
+
+async def run_open(run, pick, rate, deadline, max_in_flight):
+    in_flight = set()
+    scheduled = time.perf_counter()
+    while scheduled < deadline:
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        if len(in_flight) >= max_in_flight:
+            if run.recorder.recording:
+                run.recorder.dropped += 1
+        else:
+            task = asyncio.create_task(pick()(scheduled))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        scheduled += run.rng.expovariate(rate)
+    await asyncio.gather(*in_flight)
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_summary(summary):
+    print(f"{'route':<42} {'req':>7} {'err':>5} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for route, stats in summary["routes"].items():
+        print(
+            f"{route:<42} {stats['requests']:>7} {stats['errors']:>5} {stats['throughput_rps']:>8.1f} "
+            f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}"
+        )
+    total = summary["total"]
+    print(
+        f"{'total':<42} {total['requests']:>7} {total['errors']:>5} {total['throughput_rps']:>8.1f} "
+        f"{total.get('p50_ms', 0):>8.1f} {total.get('p95_ms', 0):>8.1f} {total.get('p99_ms', 0):>8.1f}"
+        + (f"  dropped {total['dropped']}" if total["dropped"] else "")
+    )
+
+
+def compare(before_path, after_path):
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    print(f"{before_path} ({before['revision']}) -> {after_path} ({after['revision']})")
+    print(f"{'route':<42} {'rps':>16} {'p50 ms':>16} {'p95 ms':>16} {'p99 ms':>16}")
+    routes = dict(after["results"]["routes"], total=after["results"]["total"])
+    old_routes = dict(before["results"]["routes"], total=before["results"]["total"])
+    for route, new in routes.items():
+        old = old_routes.get(route)
+        if old is None:
+            continue
+        cells = []
+        for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            change = (new[key] / old[key] - 1) * 100 if old.get(key) else 0.0
+            cells.append(f"{new.get(key, 0):>8.1f} {change:>+6.0f}%")
+        print(f"{route:<42} " + " ".join(cells))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="mixed")
+    parser.add_argument("--model", choices=["closed", "open"], default="closed")
+    parser.add_argument("--users", type=int, default=50, help="closed model: concurrent virtual users")
+    parser.add_argument("--think", type=float, default=0.0, help="closed model: mean think time in seconds")
+    parser.add_argument("--rate", type=float, default=100.0, help="open model: requests per second")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="open model: arrivals beyond this are dropped")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds measured")
+    parser.add_argument("--warmup", type=float, default=5.0, help="seconds run before measuring")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--in-process", action="store_true", help="drive main.app through httpx.ASGITransport")
+    parser.add_argument("--first-student", type=int, default=1)
+    parser.add_argument("--students", type=int, default=1000, help="student IDs used for logins and lookups")
+    parser.add_argument("--sessions", type=int, default=200, help="student tokens kept for applying")
+    parser.add_argument("--password", default="Password@123", help="password of every benchmark student")
+    parser.add_argument("--metrics-token", default=os.getenv("METRICS_TOKEN"), help="bearer token for /health/details")
+    parser.add_argument("--rush-days", type=int, default=3, help="deadline_rush: jobs closing within this many days")
+    parser.add_argument("--max-jobs", type=int, default=20000, help="active jobs fetched up front")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="diff two saved results and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    lifespan = None
+    if args.in_process:
+        import main as app_main
+        lifespan = app_main.lifespan(app_main.app)
+        await lifespan.__aenter__()
+        transport = httpx.ASGITransport(app=app_main.app, raise_app_exceptions=False)
+        client = httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60)
+    else:
+        limits = httpx.Limits(max_connections=max(args.users, args.max_in_flight))
+        client = httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60)
+
+    recorder = Recorder()
+    try:
+        run = LoadRun(client, recorder, args)
+        await run.discover_jobs()
+        print(f"{len(run.jobs)} active jobs, {len(run.rush_jobs)} closing within {args.rush_days} days")
+        pick = run.picker(SCENARIOS[args.scenario])
+
+        async def measure():
+            await asyncio.sleep(args.warmup)
+            recorder.start()
+            await asyncio.sleep(args.duration)
+            recorder.stop()
+
+        deadline = time.perf_counter() + args.warmup + args.duration
+        measuring = asyncio.create_task(measure())
+        if args.model == "closed":
+            await run_closed(run, pick, args.users, deadline, args.think)
+        else:
+            await run_open(run, pick, args.rate, deadline, args.max_in_flight)
+        await measuring
+        health = await client.get(
+            "/health/details",
+            headers={"Authorization": f"Bearer {args.metrics_token}"} if args.metrics_token else None,
+        )
+    finally:
+        await client.aclose()
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+
+    summary = recorder.summary()
+    print_summary(summary)
+    if args.output:
+        result = {
+            "revision": git_revision(),
+            "started_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "config": {key: value for key, value in vars(args).items() if key not in ("password", "metrics_token", "output", "compare")},
+            "results": summary,
+            # Pool, cache and replica counters after the run
+            "health": health.json() if health.status_code == 200 else None,
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Saved {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,113 @@
+"""
+Login storm: many concurrent password checks against one worker, with bcrypt run
+inline in the handler versus through the `hashing.hasher` process pool.
+
+Alongside the storm a probe sleeps in 10 ms steps on the same event loop; how late it
+wakes up shows how long the loop is blocked. No database is needed, the stored hash is precomputed.
+
+Usage (from backend/):
+    python benchmarks/bench_login_storm.py --logins 64 --concurrency 32 --rounds 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+import bcrypt
+import httpx
+from fastapi import Body, FastAPI, HTTPException
+
+from hashing import PasswordHasher
+
+PASSWORD = "correct horse battery staple"
+
+app = FastAPI()
+state = {}
+
+
+@app.post("/inline")
+async def inline(password: str = Body(..., embed=True)):
+    # The pre-change pattern: checkpw on the event loop thread
+    if not bcrypt.checkpw(password.encode("utf-8"), state["hash"]):
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    return {"ok": True}
+
+
+@app.post("/pooled")
+async def pooled(password: str = Body(..., embed=True)):
+    valid, _ = await state["hasher"].verify_and_update(password, state["hash"])
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    return {"ok": True}
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+async def storm(path, total, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        latencies, probes, rejected = [], [], 0
+        done = asyncio.Event()
+
+        async def one():
+            nonlocal rejected
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post(path, json={"password": PASSWORD})
+                if response.status_code == 503:
+                    rejected += 1
+                    return
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        async def probe():
+            while not done.is_set():
+                started = time.perf_counter()
+                await asyncio.sleep(0.01)
+                probes.append(time.perf_counter() - started - 0.01)
+
+        prober = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await prober
+        return elapsed, latencies, probes, rejected
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=10, help="bcrypt cost factor")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    state["hash"] = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(args.rounds))
+    state["hasher"] = PasswordHasher(rounds=args.rounds, workers=args.workers, max_queue=args.logins)
+    # Start the worker processes outside the measurement
+    await state["hasher"].verify(PASSWORD, state["hash"])
+
+    try:
+        for label, path in (("before (inline)", "/inline"), ("after (pool)", "/pooled")):
+            elapsed, latencies, probes, rejected = await storm(path, args.logins, args.concurrency)
+            print(
+                f"{label:<16} {len(latencies) / elapsed:7.1f} logins/s  "
+                f"p50 {statistics.median(latencies) * 1000:7.1f} ms  "
+                f"p99 {percentile(latencies, 99) * 1000:7.1f} ms  "
+                f"loop lag max {max(probes) * 1000:7.1f} ms  rejected {rejected}"
+            )
+    finally:
+        state["hasher"].shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
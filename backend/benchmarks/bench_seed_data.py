@@ -0,0 +1,607 @@
+"""
+Synthetic placement data at production scale, bulk-loaded into the database from `.env`.
+
+Every table of app/db/scripts/create_tables.sql gets rows, with IDs and references that
+line up, generated from --seed so two runs produce the same data:
+  - companies follow a Zipf-like popularity: a few post many jobs and attract most
+    applications, most post a handful
+  - each placement season (July to April, named by the graduation year) has its
+    students, and jobs whose deadlines cluster on campus drive dates; the current season
+    has drives in the next few days, so there is always a deadline rush to apply to
+  - students apply to jobs of their own season open to their branch, preferring popular
+    companies and jobs whose CGPA criterion they meet; earlier seasons are decided (placements, interviews,
+    company hiring history), the current one is mostly pending
+  - training programs, enrollments and feedback, and a few admins
+Every student, company and admin shares --password (hashed once), so bench_load.py can log in
+as anyone.
+
+Rows are written to tab-separated files and loaded with LOAD DATA LOCAL INFILE (the
+server needs local_infile=ON), or sent as multi-row INSERTs with --method insert. Foreign
+key and unique checks are off during the load, which is why it takes minutes: inserting
+500k students one AddStudentWithContact call at a time takes hours. The placement rollups
+are rebuilt from Placement_Record at the end.
+
+Usage (from backend/):
+    python benchmarks/bench_seed_data.py --scale 0.01 --reset          # 5k students, quick
+    python benchmarks/bench_seed_data.py --reset                        # 500k students, 10k companies, 100k jobs
+    python benchmarks/bench_seed_data.py --generate-only --out-dir /tmp/seed
+"""
+import argparse
+import datetime
+import itertools
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+import bcrypt
+import mysql.connector
+
+from db.connections import dbconfig
+from db.migrations import apply_migrations
+from db.rollup import rebuild_rollup
+from hashing import PASSWORD_HASH_ROUNDS
+
+# Loaded in this order; all of them are emptied by --reset
+TABLES = {
+    "Admin": ("Admin_ID", "Name", "Role", "Password"),
+    "Email": ("Email_ID", "Admin_ID"),
+    "Phone": ("Phone_No", "Admin_ID"),
+    "Student": ("Student_ID", "Name", "CGPA", "Graduation_Year", "Department", "Password"),
+    "Student_Email": ("Email_ID", "Student_ID"),
+    "Student_Phone": ("Phone_No", "Student_ID"),
+    "Company": ("Company_ID", "Name", "Industry_Type", "Contact_Person", "Website", "Password"),
+    "Company_Email": ("Email_ID", "Company_ID"),
+    "Company_Phone": ("Phone_No", "Company_ID"),
+    "Company_Location": ("Company_ID", "Location"),
+    "Company_Hiring_History": ("Company_ID", "Hiring_Period", "Job_Roles"),
+    "Job": ("Job_ID", "Job_Title", "Job_Description", "Salary", "Company_ID", "Job_Type", "Vacancies", "Application_Deadline"),
+    "Job_Eligibility": ("Job_ID", "Eligibility_Criterion"),
+    "Job_Location": ("Job_ID", "Location"),
+    "Trainer": ("Trainer_ID", "Expertise", "Name", "Organisation"),
+    "Trainer_Email": ("Email", "Trainer_ID"),
+    "Trainer_Phone": ("Phone_No", "Trainer_ID"),
+    "Training_Program": (
+        "Training_ID", "Training_Name", "Training_Description", "Duration", "Trainer_ID",
+        "Start_Date", "End_Date", "Mode", "Certification_Provided", "Training_Cost",
+    ),
+    "Training_Enrollment": ("Enrollment_ID", "Training_ID", "Student_ID", "Performance_Grade", "Completion_Status"),
+    "Feedback": ("Feedback_ID", "Student_ID", "Rating", "Comments", "Trainer_ID", "Training_ID"),
+    "Application": ("Application_ID", "Student_ID", "Job_ID", "Application_Date", "Status"),
+    "Interview_Schedule": ("Interview_ID", "Application_ID", "Date", "Time", "Mode", "Interviewer_Name"),
+    "Placement_Record": (
+        "Placement_ID", "Student_ID", "Job_ID", "Company_ID", "Package", "Placement_Date", "Placement_Location",
+    ),
+}
+RUNTIME_TABLES = ["refresh_tokens", "Placement_Daily_Rollup", "Placement_Student_Year", "Student_Total"]
+
+FIRST_NAMES = [
+    "Aarav", "Vivaan", "Aditya", "Vihaan", "Arjun", "Sai", "Reyansh", "Ayaan", "Krishna", "Ishaan",
+    "Rohan", "Karan", "Rahul", "Siddharth", "Nikhil", "Pranav", "Aman", "Dev", "Kabir", "Yash",
+    "Ananya", "Diya", "Aadhya", "Saanvi", "Ira", "Myra", "Kavya", "Priya", "Sneha", "Pooja",
+    "Riya", "Neha", "Aditi", "Meera", "Tanvi", "Shreya", "Nisha", "Isha", "Anjali", "Zara",
+]
+LAST_NAMES = [
+    "Sharma", "Verma", "Gupta", "Singh", "Kumar", "Patel", "Shah", "Mehta", "Reddy", "Rao",
+    "Nair", "Iyer", "Menon", "Das", "Bose", "Chatterjee", "Banerjee", "Mukherjee", "Joshi", "Kulkarni",
+    "Deshpande", "Pillai", "Agarwal", "Jain", "Malhotra", "Kapoor", "Khanna", "Chopra", "Saxena", "Mishra",
+]
+# (name, acronym, share of students)
+DEPARTMENTS = [
+    ("Computer Science and Engineering", "CSE", 0.26), ("Information Technology", "IT", 0.12),
+    ("Electronics and Communication Engineering", "ECE", 0.16), ("Electrical Engineering", "EE", 0.10),
+    ("Mechanical Engineering", "ME", 0.13), ("Civil Engineering", "CE", 0.09),
+    ("Chemical Engineering", "CHE", 0.05), ("Biotechnology", "BT", 0.04),
+    ("Mathematics and Computing", "MNC", 0.05),
+]
+# industry -> (share of companies, roles, departments hired from)
+INDUSTRIES = {
+    "Information Technology": (0.30, ["Software Engineer", "Backend Developer", "Frontend Developer", "DevOps Engineer", "QA Engineer"], ["CSE", "IT", "MNC", "ECE"]),
+    "Data and Analytics": (0.10, ["Data Analyst", "Data Scientist", "Business Analyst", "ML Engineer"], ["CSE", "IT", "MNC"]),
+    "Finance": (0.10, ["Quantitative Analyst", "Risk Analyst", "Financial Analyst"], ["MNC", "CSE", "EE"]),
+    "Consulting": (0.08, ["Associate Consultant", "Business Analyst", "Strategy Analyst"], []),
+    "Semiconductors": (0.07, ["VLSI Design Engineer", "Embedded Engineer", "Verification Engineer"], ["ECE", "EE"]),
+    "Manufacturing": (0.10, ["Production Engineer", "Design Engineer", "Quality Engineer"], ["ME", "CHE"]),
+    "Automotive": (0.06, ["Design Engineer", "Embedded Engineer", "Vehicle Dynamics Engineer"], ["ME", "EE", "ECE"]),
+    "Construction": (0.06, ["Site Engineer", "Structural Engineer", "Project Engineer"], ["CE"]),
+    "Energy": (0.05, ["Process Engineer", "Electrical Engineer", "Field Engineer"], ["EE", "CHE", "ME"]),
+    "Healthcare": (0.04, ["Research Associate", "Bioinformatics Analyst", "Clinical Data Analyst"], ["BT", "CHE"]),
+    "E-commerce": (0.04, ["Software Engineer", "Product Analyst", "Operations Analyst"], []),
+}
+SKILLS = [
+    "Python", "Java", "C++", "SQL", "JavaScript", "React", "AWS", "Docker", "Kubernetes", "Machine Learning",
+    "Statistics", "Excel", "Power BI", "AutoCAD", "SolidWorks", "MATLAB", "Verilog", "Embedded C", "Linux",
+    "Communication", "Problem Solving", "Data Structures", "Networking", "Cloud", "Tableau",
+]
+# (city, weight)
+CITIES = [
+    ("Bengaluru", 24), ("Hyderabad", 14), ("Pune", 11), ("Mumbai", 10), ("Chennai", 10), ("Gurugram", 8),
+    ("Noida", 7), ("Delhi", 5), ("Kolkata", 3), ("Ahmedabad", 3), ("Kochi", 2), ("Remote", 3),
+]
+JOB_TYPES = [("Full-Time", 60), ("Internship", 30), ("Part-Time", 4), ("Contract", 6)]
+TRAINING_TOPICS = [
+    "Aptitude", "Interview Preparation", "Data Structures", "System Design", "Cloud Computing", "Machine Learning",
+    "Communication Skills", "Resume Building", "Web Development", "Embedded Systems", "CAD Design", "Data Analytics",
+]
+
+
+def zipf_weights(n, exponent):
+    return [1 / (rank ** exponent) for rank in range(1, n + 1)]
+
+
+def cumulative(weights):
+    return list(itertools.accumulate(weights))
+
+
+def academic_season(day):
+    """
+    The graduation year of the placement season `day` falls in (July to June).
+    """
+    return day.year + 1 if day.month >= 7 else day.year
+
+
+def tsv_value(value):
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, bytes):
+        value = value.decode("ascii")
+    elif isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+class TableFile:
+    """
+    Rows of one table, written to a tab-separated file for LOAD DATA.
+    """
+
+    def __init__(self, directory, table):
+        self.table = table
+        self.path = os.path.join(directory, f"{table}.tsv")
+        self.rows = 0
+        self._file = open(self.path, "w", encoding="utf-8", newline="\n")
+
+    def add(self, *row):
+        self._file.write("\t".join(map(tsv_value, row)) + "\n")
+        self.rows += 1
+
+    def close(self):
+        self._file.close()
+
+    def load(self, cursor):
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE {self.table} CHARACTER SET utf8mb4 "
+            "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' "
+            f"({', '.join(TABLES[self.table])})",
+            (os.path.abspath(self.path),),
+        )
+
+
+class TableInserts:
+    """
+    Rows of one table, sent as multi-row INSERTs of `batch` rows while they are generated.
+    """
+
+    def __init__(self, cursor, table, batch):
+        self.table = table
+        self.cursor = cursor
+        self.batch = batch
+        self.rows = 0
+        self.seconds = 0.0
+        self._pending = []
+        columns = TABLES[table]
+        self._query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+
+    def add(self, *row):
+        self._pending.append(row)
+        self.rows += 1
+        if len(self._pending) >= self.batch:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            started = time.perf_counter()
+            # mysql.connector rewrites executemany on INSERT ... VALUES into one multi-row INSERT
+            self.cursor.executemany(self._query, self._pending)
+            self.seconds += time.perf_counter() - started
+            self._pending = []
+
+    def close(self):
+        self.flush()
+
+
+class Generator:
+    def __init__(self, args, out):
+        self.args = args
+        self.out = out
+        self.rng = random.Random(args.seed)
+        self.today = datetime.date.today()
+        self.current_season = academic_season(self.today)
+        # Oldest to newest; students of the newest batch graduate next year and are not placed yet
+        self.seasons = list(range(self.current_season - args.years + 1, self.current_season + 2))
+        self.password = bcrypt.hashpw(args.password.encode("utf-8"), bcrypt.gensalt(args.rounds))
+        self.city_names = [city for city, _ in CITIES]
+        self.city_weights = cumulative([weight for _, weight in CITIES])
+
+    def name(self):
+        return f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+
+    def phone(self):
+        return str(self.rng.randrange(6000000000, 9999999999))
+
+    def cities(self, most):
+        count = self.rng.choices(range(1, most + 1), [2 ** (most - k) for k in range(1, most + 1)])[0]
+        return sorted(set(self.rng.choices(self.city_names, cum_weights=self.city_weights, k=count)))
+
+    def admins(self):
+        for admin_id in range(1, self.args.admins + 1):
+            self.out["Admin"].add(admin_id, self.name(), self.rng.choice(["Placement Officer", "Coordinator", "Dean"]), self.password)
+            self.out["Email"].add(f"admin{admin_id}@college.edu", admin_id)
+            self.out["Phone"].add(self.phone(), admin_id)
+
+    def students(self):
+        """
+        Students by graduation year, each batch ~4% larger than the one before.
+        """
+        growth = [1.04 ** i for i in range(len(self.seasons))]
+        per_season = [round(self.args.students * g / sum(growth)) for g in growth]
+        per_season[-1] += self.args.students - sum(per_season)
+        departments = [acronym for _, acronym, _ in DEPARTMENTS]
+        department_names = {acronym: name for name, acronym, _ in DEPARTMENTS}
+        department_weights = cumulative([share for _, _, share in DEPARTMENTS])
+
+        self.student_season = []  # index Student_ID - 1
+        self.student_cgpa = []
+        self.student_department = []
+        self.batches = {}  # graduation year -> (first Student_ID, last Student_ID)
+        student_id = 0
+        for season, count in zip(self.seasons, per_season):
+            self.batches[season] = (student_id + 1, student_id + count)
+            for _ in range(count):
+                student_id += 1
+                department = self.rng.choices(departments, cum_weights=department_weights)[0]
+                cgpa = round(min(10.0, max(5.0, self.rng.gauss(7.4, 0.95))), 2)
+                self.student_season.append(season)
+                self.student_cgpa.append(cgpa)
+                self.student_department.append(department)
+                self.out["Student"].add(
+                    student_id, self.name(), cgpa, season, department_names[department], self.password
+                )
+                self.out["Student_Email"].add(f"student{student_id}@college.edu", student_id)
+                self.out["Student_Phone"].add(self.phone(), student_id)
+
+    def companies(self):
+        industries = list(INDUSTRIES)
+        industry_weights = cumulative([INDUSTRIES[name][0] for name in industries])
+        suffixes = ["Technologies", "Systems", "Labs", "Solutions", "Industries", "Analytics", "Global", "Works"]
+        self.company_industry = []
+        for company_id in range(1, self.args.companies + 1):
+            industry = self.rng.choices(industries, cum_weights=industry_weights)[0]
+            self.company_industry.append(industry)
+            name = f"{self.rng.choice(LAST_NAMES)} {self.rng.choice(suffixes)} {company_id}"
+            slug = name.lower().replace(" ", "")
+            self.out["Company"].add(company_id, name, industry, self.name(), f"https://www.{slug}.com", self.password)
+            self.out["Company_Email"].add(f"careers@{slug}.com", company_id)
+            self.out["Company_Phone"].add(self.phone(), company_id)
+            for city in self.cities(4):
+                self.out["Company_Location"].add(company_id, city)
+        # Company IDs are shuffled against their popularity rank
+        ranks = list(range(1, self.args.companies + 1))
+        self.rng.shuffle(ranks)
+        self.company_popularity = [1 / (rank ** 0.8) for rank in ranks]
+
+    def drive_dates(self, season):
+        """
+        (dates, cumulative weights) of the campus drives of `season`: most in August to
+        December, fewer in January to March. The current season's drives are spread around
+        today, three of them in the next three days.
+        """
+        if season == self.current_season:
+            dates = [self.today + datetime.timedelta(days=self.rng.randrange(-120, 60)) for _ in range(30)]
+            dates += [self.today + datetime.timedelta(days=d) for d in (1, 2, 3)]
+            weights = [1.0] * 30 + [4.0, 3.0, 3.0]
+        else:
+            dates = [
+                datetime.date(season - 1, 8, 1) + datetime.timedelta(days=self.rng.randrange(150)) for _ in range(30)
+            ] + [datetime.date(season, 1, 5) + datetime.timedelta(days=self.rng.randrange(85)) for _ in range(10)]
+            weights = [self.rng.uniform(0.5, 2.0) for _ in dates]
+        return dates, cumulative(weights)
+
+    def jobs(self):
+        placed_seasons = self.seasons[:-1]
+        per_season = {season: self.args.jobs // len(placed_seasons) for season in placed_seasons}
+        per_season[self.current_season] += self.args.jobs - sum(per_season.values())
+        company_weights = cumulative(self.company_popularity)
+        companies = range(1, self.args.companies + 1)
+        job_types = [name for name, _ in JOB_TYPES]
+        job_type_weights = cumulative([weight for _, weight in JOB_TYPES])
+
+        self.job_company = [None]  # index Job_ID
+        self.job_deadline = [None]
+        self.job_salary = [None]
+        self.job_min_cgpa = [None]
+        self.job_locations = [None]
+        # (season, department) -> ([Job_ID] open to the department, cumulative popularity)
+        self.season_jobs = {}
+        departments = [acronym for _, acronym, _ in DEPARTMENTS]
+        roles_by_company_season = {}
+        job_id = 0
+        for season, count in per_season.items():
+            dates, date_weights = self.drive_dates(season)
+            ids = {department: [] for department in departments}
+            weights = {department: [] for department in departments}
+            for company_id in self.rng.choices(companies, cum_weights=company_weights, k=count):
+                job_id += 1
+                industry = self.company_industry[company_id - 1]
+                _, roles, hires_from = INDUSTRIES[industry]
+                title = self.rng.choice(roles)
+                job_type = self.rng.choices(job_types, cum_weights=job_type_weights)[0]
+                deadline = self.rng.choices(dates, cum_weights=date_weights)[0] + datetime.timedelta(
+                    days=self.rng.choice([0, 0, 0, -1, 1])
+                )
+                popularity = self.company_popularity[company_id - 1]
+                # Popular companies pay more; internships are quoted as a stipend
+                salary = self.rng.lognormvariate(math.log(600000) + 0.15 * math.log(popularity * 1000 + 1), 0.35)
+                if job_type == "Internship":
+                    salary /= 12
+                salary = round(salary, -3) if salary > 10000 else round(salary, -2)
+                min_cgpa = self.rng.choice([None, 6.0, 6.5, 7.0, 7.0, 7.5, 8.0])
+                if popularity > 0.05 and min_cgpa is not None:
+                    min_cgpa = max(min_cgpa, 7.5)
+                branches = hires_from if hires_from and self.rng.random() < 0.8 else []
+                locations = self.cities(3)
+                skills = self.rng.sample(SKILLS, 4)
+                description = (
+                    f"{title} role at a {industry.lower()} company. Work with {', '.join(skills[:3])} "
+                    f"and {skills[3]} on production systems, alongside experienced engineers."
+                )
+                self.out["Job"].add(
+                    job_id, title, description, salary, company_id, job_type,
+                    self.rng.choice([1, 2, 2, 3, 5, 5, 10, 20]), deadline,
+                )
+                criteria = [f"Batch {season}"]
+                if min_cgpa is not None:
+                    criteria.append(f"CGPA >= {min_cgpa}")
+                if branches:
+                    criteria.append(f"Branches: {', '.join(branches)}")
+                if self.rng.random() < 0.3:
+                    criteria.append("No active backlogs")
+                for criterion in criteria:
+                    self.out["Job_Eligibility"].add(job_id, criterion)
+                for city in locations:
+                    self.out["Job_Location"].add(job_id, city)
+
+                self.job_company.append(company_id)
+                self.job_deadline.append(deadline)
+                self.job_salary.append(salary)
+                self.job_min_cgpa.append(min_cgpa or 0.0)
+                self.job_locations.append(locations)
+                # Popular companies already post more jobs; each of them also draws more applicants
+                weight = math.sqrt(popularity) * self.rng.uniform(0.5, 1.5)
+                for department in branches or departments:
+                    ids[department].append(job_id)
+                    weights[department].append(weight)
+                roles_by_company_season.setdefault((company_id, season), set()).add(title)
+            for department in departments:
+                self.season_jobs[season, department] = (ids[department], cumulative(weights[department]))
+
+        for (company_id, season), roles in sorted(roles_by_company_season.items()):
+            if season < self.current_season:
+                self.out["Company_Hiring_History"].add(company_id, f"{season - 1}-{season % 100:02d}", ", ".join(sorted(roles)))
+
+    def applications(self):
+        """
+        Applications of every student to jobs of their season open to their department,
+        with the interviews and the placement that followed.
+        """
+        placed_seasons = set(self.seasons[:-1])
+        applicants = sum(1 for season in self.student_season if season in placed_seasons)
+        mean = self.args.applications / max(1, applicants)
+        application_id = interview_id = placement_id = 0
+        for student_id, (season, cgpa, department) in enumerate(
+            zip(self.student_season, self.student_cgpa, self.student_department), start=1
+        ):
+            if season not in placed_seasons:
+                continue
+            ids, weights = self.season_jobs[season, department]
+            if not ids:
+                continue
+            # Heavy-tailed: most students apply to a few jobs, some to dozens
+            wanted = min(len(ids), max(1, round(self.rng.lognormvariate(math.log(mean) - 0.32, 0.8))))
+            chosen = {}
+            for job_id in self.rng.choices(ids, cum_weights=weights, k=wanted * 6):
+                if job_id in chosen or cgpa < self.job_min_cgpa[job_id]:
+                    continue
+                chosen[job_id] = None
+                if len(chosen) >= wanted:
+                    break
+            if not chosen:
+                continue
+
+            decided = season < self.current_season
+            closed = [job_id for job_id in chosen if self.job_deadline[job_id] < self.today]
+            placed_job = None
+            if closed and self.rng.random() < (0.45 + 0.12 * (cgpa - 7)) * (1.0 if decided else 0.5):
+                placed_job = max(closed, key=lambda job_id: self.job_salary[job_id] * self.rng.uniform(0.7, 1.0))
+
+            for job_id in chosen:
+                deadline = self.job_deadline[job_id]
+                applied = min(self.today, deadline - datetime.timedelta(days=min(30, int(self.rng.expovariate(1 / 5)))))
+                if job_id == placed_job:
+                    status = "Selected"
+                elif deadline >= self.today:
+                    status = "Pending"
+                elif decided:
+                    status = self.rng.choices(["Rejected", "Shortlisted", "Withdrawn"], [70, 18, 12])[0]
+                else:
+                    status = self.rng.choices(["Pending", "Shortlisted", "Rejected"], [55, 25, 20])[0]
+                application_id += 1
+                self.out["Application"].add(application_id, student_id, job_id, applied, status)
+
+                if status in ("Selected", "Shortlisted"):
+                    interview_id += 1
+                    self.out["Interview_Schedule"].add(
+                        interview_id, application_id, deadline + datetime.timedelta(days=self.rng.randrange(3, 11)),
+                        datetime.time(self.rng.randrange(9, 18), self.rng.choice([0, 30])),
+                        self.rng.choice(["Online", "Online", "Onsite"]), self.name(),
+                    )
+                if status == "Selected":
+                    placed_on = deadline + datetime.timedelta(days=self.rng.randrange(15, 46))
+                    if placed_on <= self.today:
+                        placement_id += 1
+                        self.out["Placement_Record"].add(
+                            placement_id, student_id, job_id, self.job_company[job_id], self.job_salary[job_id],
+                            placed_on, self.rng.choice(self.job_locations[job_id]),
+                        )
+
+    def training(self):
+        trainers = max(10, self.args.students // 1000)
+        programs = trainers * 4
+        organisations = ["SkillUp Academy", "CareerBridge", "CodeCamp India", "Placement Pro", "In-house"]
+        for trainer_id in range(1, trainers + 1):
+            self.out["Trainer"].add(trainer_id, self.rng.choice(TRAINING_TOPICS), self.name(), self.rng.choice(organisations))
+            self.out["Trainer_Email"].add(f"trainer{trainer_id}@training.org", trainer_id)
+            self.out["Trainer_Phone"].add(self.phone(), trainer_id)
+
+        first_day = datetime.date(self.seasons[0] - 1, 7, 1)
+        span = (self.today + datetime.timedelta(days=90) - first_day).days
+        program_trainer, program_start = [None], [None]
+        for training_id in range(1, programs + 1):
+            trainer_id = self.rng.randrange(1, trainers + 1)
+            topic = self.rng.choice(TRAINING_TOPICS)
+            weeks = self.rng.choice([1, 2, 4, 6, 8])
+            start = first_day + datetime.timedelta(days=self.rng.randrange(span))
+            self.out["Training_Program"].add(
+                training_id, f"{topic} Bootcamp {training_id}", f"{weeks}-week {topic.lower()} programme for final-year students.",
+                weeks * 7, trainer_id, start, start + datetime.timedelta(weeks=weeks),
+                self.rng.choice(["Online", "Offline", "Hybrid"]), self.rng.random() < 0.6,
+                self.rng.choice([0, 0, 499, 999, 1999, 4999]),
+            )
+            program_trainer.append(trainer_id)
+            program_start.append(start)
+
+        program_weights = cumulative(zipf_weights(programs, 0.8))
+        program_ids = range(1, programs + 1)
+        enrollment_id = feedback_id = 0
+        for student_id in range(1, self.args.students + 1):
+            if self.rng.random() >= 0.4:
+                continue
+            for training_id in set(self.rng.choices(program_ids, cum_weights=program_weights, k=self.rng.choice([1, 1, 2, 3]))):
+                finished = program_start[training_id] + datetime.timedelta(days=30) < self.today
+                status = self.rng.choices(["Completed", "Dropped"], [85, 15])[0] if finished else "Enrolled"
+                grade = self.rng.choice(["A", "A", "B", "B", "C"]) if status == "Completed" else None
+                enrollment_id += 1
+                self.out["Training_Enrollment"].add(enrollment_id, training_id, student_id, grade, status)
+                if status == "Completed" and self.rng.random() < 0.35:
+                    rating = self.rng.choices([1, 2, 3, 4, 5], [3, 7, 20, 40, 30])[0]
+                    feedback_id += 1
+                    self.out["Feedback"].add(
+                        feedback_id, student_id, rating, self.rng.choice(["Very useful", "Good pace", "Too fast", "Needs more practice", None]),
+                        program_trainer[training_id], training_id,
+                    )
+
+    def run(self):
+        steps = [
+            ("admins", self.admins), ("students", self.students), ("companies", self.companies),
+            ("jobs", self.jobs), ("applications", self.applications), ("training", self.training),
+        ]
+        for label, step in steps:
+            started = time.perf_counter()
+            step()
+            print(f"generated {label:<13} {time.perf_counter() - started:7.1f}s")
+        for season, (first, last) in self.batches.items():
+            current = " (current season)" if season == self.current_season else ""
+            print(f"batch {season}: Student_ID {first}-{last}{current}")
+
+
+def reset(cursor):
+    cursor.execute("SET SESSION foreign_key_checks = 0")
+    for table in list(TABLES) + RUNTIME_TABLES:
+        cursor.execute(f"TRUNCATE TABLE {table}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplies every row count")
+    parser.add_argument("--students", type=int, default=500000)
+    parser.add_argument("--companies", type=int, default=10000)
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--applications", type=int, default=3000000, help="approximate")
+    parser.add_argument("--years", type=int, default=5, help="placement seasons of history, the current one included")
+    parser.add_argument("--admins", type=int, default=5)
+    parser.add_argument("--password", default="Password@123", help="password of every generated user")
+    parser.add_argument("--rounds", type=int, default=PASSWORD_HASH_ROUNDS, help="bcrypt cost of the shared hash")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--method", choices=["infile", "insert"], default="infile")
+    parser.add_argument("--batch", type=int, default=5000, help="rows per INSERT with --method insert")
+    parser.add_argument("--out-dir", help="where the .tsv files go (default: a temporary directory)")
+    parser.add_argument("--generate-only", action="store_true", help="write the .tsv files without loading them")
+    parser.add_argument("--reset", action="store_true", help="empty every table first")
+    args = parser.parse_args()
+    for name in ("students", "companies", "jobs", "applications"):
+        setattr(args, name, max(1, round(getattr(args, name) * args.scale)))
+    args.years = max(2, args.years)
+
+    connection = cursor = None
+    if not args.generate_only:
+        connection = mysql.connector.connect(**dict(dbconfig, raise_on_warnings=False), allow_local_infile=True)
+        apply_migrations(connection)
+        cursor = connection.cursor()
+        if args.reset:
+            reset(cursor)
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM Student)")
+        if cursor.fetchone()[0]:
+            sys.exit("The database already has students; run with --reset to replace them")
+        cursor.execute("SET SESSION foreign_key_checks = 0")
+        cursor.execute("SET SESSION unique_checks = 0")
+
+    out_dir = args.out_dir or tempfile.mkdtemp(prefix="seed-")
+    os.makedirs(out_dir, exist_ok=True)
+    if args.method == "insert" and not args.generate_only:
+        out = {table: TableInserts(cursor, table, args.batch) for table in TABLES}
+    else:
+        out = {table: TableFile(out_dir, table) for table in TABLES}
+
+    started = time.perf_counter()
+    try:
+        Generator(args, out).run()
+    finally:
+        for table in out.values():
+            table.close()
+
+    if args.generate_only:
+        print(f"Wrote {sum(table.rows for table in out.values())} rows to {out_dir}")
+        return
+
+    try:
+        print(f"{'table':<24} {'rows':>10} {'seconds':>8} {'rows/s':>10}")
+        for table in out.values():
+            if isinstance(table, TableFile):
+                load_started = time.perf_counter()
+                table.load(cursor)
+                seconds = time.perf_counter() - load_started
+            else:
+                seconds = table.seconds
+            connection.commit()
+            print(f"{table.table:<24} {table.rows:>10} {seconds:>8.1f} {table.rows / max(seconds, 1e-9):>10.0f}")
+
+        rollup_started = time.perf_counter()
+        rebuild_rollup(cursor)
+        connection.commit()
+        print(f"{'placement rollups':<24} {'':>10} {time.perf_counter() - rollup_started:>8.1f}")
+        cursor.execute("ANALYZE TABLE " + ", ".join(TABLES))
+        cursor.fetchall()
+    finally:
+        cursor.close()
+        connection.close()
+    print(f"Done in {time.perf_counter() - started:.0f}s. Log in as any student, company or admin with --password.")
+
+
+if __name__ == "__main__":
+    main()
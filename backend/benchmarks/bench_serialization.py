@@ -0,0 +1,125 @@
+"""
+Response serialisation for large lists: a model per row and response_model validation
+versus the serialization fast path (compiled row mapper + direct JSON bytes).
+
+Runs without a database. Two routes of an in-process app return the same --rows synthetic
+placement rows (shaped like GET /record/, helper columns included):
+  before: dict by position -> PlacementRecord per row -> response_model validation and
+          jsonable_encoder -> JSONResponse
+  after:  serialization.row_mapper -> fast_response
+Each is requested --repeat times through httpx's ASGI transport; the bodies are checked to
+be identical JSON and the per-row cost is reported.
+
+Usage (from backend/):
+    python benchmarks/bench_serialization.py --rows 50000 --repeat 5
+"""
+import argparse
+import asyncio
+import datetime
+import decimal
+import json
+import os
+import statistics
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+import httpx
+from fastapi import FastAPI
+from mysql.connector import FieldType
+
+from models.records import PlacementRecord
+from serialization import dumps, fast_response, orjson, row_mapper
+
+DESCRIPTION = [
+    ("Placement_ID", FieldType.LONG), ("Student_Name", FieldType.VAR_STRING),
+    ("Company_Name", FieldType.VAR_STRING), ("Job_Title", FieldType.VAR_STRING),
+    ("Package", FieldType.NEWDECIMAL), ("Placement_Date", FieldType.DATE),
+    ("Placement_Location", FieldType.VAR_STRING), ("_sort_key", FieldType.LONG), ("_tiebreak", FieldType.LONG),
+]
+
+app = FastAPI()
+state = {}
+
+
+@app.get("/before", response_model=List[PlacementRecord])
+async def before():
+    placement_list = []
+    for record in state["rows"]:
+        record = record[:-2]
+        record_data = {
+            "Placement_ID": record[0],
+            "Student_Name": record[1],
+            "Company_Name": record[2],
+            "Job_Title": record[3],
+            "Package": record[4],
+            "Placement_Location": record[6],
+            "Placement_Date": record[5],
+        }
+        placement_list.append(PlacementRecord(**record_data))
+    return placement_list
+
+
+@app.get("/after", response_model=List[PlacementRecord])
+async def after():
+    to_record = row_mapper(DESCRIPTION)
+    return fast_response([to_record(record[:-2]) for record in state["rows"]])
+
+
+def make_rows(count):
+    start = datetime.date(2025, 1, 1)
+    return [
+        (i, f"Student {i}", f"Company {i % 300}", f"Role {i % 40}", decimal.Decimal(f"{400000 + i % 900000}.50"),
+         start + datetime.timedelta(days=i % 365), f"City {i % 50}", i, i)
+        for i in range(1, count + 1)
+    ]
+
+
+async def measure(client, path, repeat):
+    timings, body = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = await client.get(path)
+        timings.append(time.perf_counter() - started)
+        response.raise_for_status()
+        body = response.content
+    return statistics.median(timings), body
+
+
+async def run(rows, repeat):
+    state["rows"] = make_rows(rows)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/before")  # warm up route and model caches
+        await client.get("/after")
+        results = {}
+        for path in ("/before", "/after"):
+            results[path] = await measure(client, path, repeat)
+
+    (before_time, before_body), (after_time, after_body) = results["/before"], results["/after"]
+    same = json.loads(before_body) == json.loads(after_body)
+    print(f"{rows} rows, median of {repeat} requests, encoder: {'orjson' if orjson else 'json'}")
+    print(f"  before  {before_time * 1000:9.1f} ms  {before_time / rows * 1e6:6.2f} us/row  {len(before_body) / 1e6:.2f} MB")
+    print(f"  after   {after_time * 1000:9.1f} ms  {after_time / rows * 1e6:6.2f} us/row  {len(after_body) / 1e6:.2f} MB")
+    print(f"  {before_time / after_time:.1f}x faster, identical JSON: {same}")
+
+    # The encoder alone, on the already-mapped rows
+    to_record = row_mapper(DESCRIPTION)
+    mapped = [to_record(record[:-2]) for record in state["rows"]]
+    started = time.perf_counter()
+    dumps(mapped)
+    print(f"  encoding alone {(time.perf_counter() - started) / rows * 1e6:.2f} us/row")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
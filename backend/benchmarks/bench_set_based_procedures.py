@@ -0,0 +1,110 @@
+"""
+Row-by-row cursor procedure versus a set-based single-result-set procedure.
+
+Creates a scratch table with --rows rows and two procedures that return it, one using
+the old DECLARE CURSOR / SELECT-per-row loop and one using a single SELECT, then times
+`callproc` + `stored_results()` for each against the database configured in `.env`.
+The scratch objects are dropped afterwards.
+
+Usage (from backend/):
+    python benchmarks/bench_set_based_procedures.py --rows 10000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+import mysql.connector
+
+from db.connections import dbconfig
+
+SETUP = [
+    "DROP TABLE IF EXISTS bench_rows",
+    """
+    CREATE TABLE bench_rows (
+        Row_ID INT PRIMARY KEY,
+        Name VARCHAR(100),
+        Amount DECIMAL(10,2),
+        Created DATE
+    )
+    """,
+    "DROP PROCEDURE IF EXISTS BenchRowByRow",
+    """
+    CREATE PROCEDURE BenchRowByRow()
+    BEGIN
+        DECLARE done INT DEFAULT FALSE;
+        DECLARE v_ID INT;
+        DECLARE v_Name VARCHAR(100);
+        DECLARE v_Amount DECIMAL(10,2);
+        DECLARE v_Created DATE;
+        DECLARE row_cursor CURSOR FOR SELECT Row_ID, Name, Amount, Created FROM bench_rows;
+        DECLARE CONTINUE HANDLER FOR NOT FOUND SET done = TRUE;
+        OPEN row_cursor;
+        read_loop: LOOP
+            FETCH row_cursor INTO v_ID, v_Name, v_Amount, v_Created;
+            IF done THEN
+                LEAVE read_loop;
+            END IF;
+            SELECT v_ID AS Row_ID, v_Name AS Name, v_Amount AS Amount, v_Created AS Created;
+        END LOOP;
+        CLOSE row_cursor;
+    END
+    """,
+    "DROP PROCEDURE IF EXISTS BenchSetBased",
+    """
+    CREATE PROCEDURE BenchSetBased()
+    BEGIN
+        SELECT Row_ID, Name, Amount, Created FROM bench_rows ORDER BY Row_ID;
+    END
+    """,
+]
+
+TEARDOWN = [
+    "DROP PROCEDURE IF EXISTS BenchRowByRow",
+    "DROP PROCEDURE IF EXISTS BenchSetBased",
+    "DROP TABLE IF EXISTS bench_rows",
+]
+
+
+def run(cursor, procname):
+    start = time.perf_counter()
+    cursor.callproc(procname)
+    result_sets = 0
+    rows = 0
+    for result in cursor.stored_results():
+        result_sets += 1
+        rows += len(result.fetchall())
+    return time.perf_counter() - start, result_sets, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    args = parser.parse_args()
+
+    config = dict(dbconfig, raise_on_warnings=False)
+    connection = mysql.connector.connect(**config)
+    cursor = connection.cursor()
+    try:
+        for statement in SETUP:
+            cursor.execute(statement)
+        cursor.executemany(
+            "INSERT INTO bench_rows (Row_ID, Name, Amount, Created) VALUES (%s, %s, %s, CURDATE())",
+            [(i, f"row-{i}", i % 1000 + 0.5) for i in range(args.rows)],
+        )
+        connection.commit()
+
+        for label, procname in (("row-by-row cursor", "BenchRowByRow"), ("set-based select", "BenchSetBased")):
+            elapsed, result_sets, rows = run(cursor, procname)
+            print(f"{label:<18} {elapsed * 1000:9.1f} ms  {result_sets:7d} result sets  {rows} rows")
+    finally:
+        for statement in TEARDOWN:
+            cursor.execute(statement)
+        cursor.close()
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
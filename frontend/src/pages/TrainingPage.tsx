@@ -199,7 +199,9 @@ export default function TrainingPage() {
         paymentMethod: data.paymentMethod
       };
 
-      await axios.post(`${API_BASE_URL}/students/enroll`, enrollmentData);
+      await axios.post(`${API_BASE_URL}/students/enroll`, enrollmentData, {
+        headers: { Authorization: `Bearer ${localStorage.getItem('token')}` },
+      });
       toast.success(`Successfully enrolled in ${selectedProgram.name}!`);
       setSelectedProgram(null);
       enrollForm.reset();
@@ -305,7 +305,9 @@ export default function AdminDashboard() {
     };
 
     try {
-      await axios.post(`http://127.0.0.1:8000/training/create-program`, newTraining);
+      await axios.post(`http://127.0.0.1:8000/training/create-program`, newTraining, {
+        headers: { Authorization: `Bearer ${localStorage.getItem('token')}` },
+      });
       fetchTrainingPrograms();
       setIsAddTrainingDialogOpen(false);
       form.reset();
@@ -244,6 +244,7 @@ export default function CompanyDashboard() {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
+          Authorization: `Bearer ${localStorage.getItem('token')}`,
         },
         body: JSON.stringify(newJob),
       });